@@ -22,6 +22,9 @@ from cloudshell.cp.aws.domain.ami_management.operations.deploy_operation import
 from cloudshell.cp.aws.domain.ami_management.operations.power_operation import (
     PowerOperation,
 )
+from cloudshell.cp.aws.domain.ami_management.operations.refresh_credentials_operation import (  # noqa
+    RefreshCredentialsOperation,
+)
 from cloudshell.cp.aws.domain.ami_management.operations.refresh_ip_operation import (
     RefreshIpOperation,
 )
@@ -73,6 +76,7 @@ from cloudshell.cp.aws.domain.services.ec2.network_interface import (
 from cloudshell.cp.aws.domain.services.ec2.security_group import SecurityGroupService
 from cloudshell.cp.aws.domain.services.ec2.subnet import SubnetService
 from cloudshell.cp.aws.domain.services.ec2.vpc import VPCService
+from cloudshell.cp.aws.domain.services.ec2.warm_pool import WarmPoolService
 from cloudshell.cp.aws.domain.services.parsers.aws_model_parser import AWSModelsParser
 from cloudshell.cp.aws.domain.services.parsers.command_results_parser import (
     CommandResultsParser,
@@ -134,6 +138,7 @@ class AWSShell:
             self.ec2_instance_waiter, self.network_interface_service
         )
         self.elastic_ip_service = ElasticIpService()
+        self.warm_pool_service = WarmPoolService(self.instance_service)
         self.vm_details_provider = VmDetailsProvider()
         self.session_number_service = SessionNumberService()
         self.traffic_mirror_service = TrafficMirrorService()
@@ -165,12 +170,19 @@ class AWSShell:
             network_interface_service=self.network_interface_service,
             device_index_strategy=AllocateMissingValuesDeviceIndexStrategy(),
             vm_details_provider=self.vm_details_provider,
+            warm_pool_service=self.warm_pool_service,
         )
 
         self.refresh_ip_operation = RefreshIpOperation(
             instance_service=self.instance_service
         )
 
+        self.refresh_credentials_operation = RefreshCredentialsOperation(
+            instance_service=self.instance_service,
+            credentials_service=self.ami_credentials_service,
+            key_pair_service=self.key_pair_service,
+        )
+
         self.power_management_operation = PowerOperation(
             instance_service=self.instance_service,
             instance_waiter=self.ec2_instance_waiter,
@@ -186,6 +198,7 @@ class AWSShell:
         self.clean_up_operation = CleanupSandboxInfraOperation(
             vpc_service=self.vpc_service,
             key_pair_service=self.key_pair_service,
+            warm_pool_service=self.warm_pool_service,
         )
 
         self.deployed_app_ports_operation = DeployedAppPortsOperation(
@@ -206,6 +219,7 @@ class AWSShell:
         self.vm_details_operation = VmDetailsOperation(
             instance_service=self.instance_service,
             vm_details_provider=self.vm_details_provider,
+            ec2_storage_service=self.ec2_storage_service,
         )
 
         self.autoload_operation = AutoloadOperation()
@@ -432,10 +446,50 @@ class AWSShell:
                 ec2_client=shell_context.aws_api.ec2_client,
                 cancellation_context=cancellation_context,
                 logger=shell_context.logger,
+                ec2_session_key=shell_context.aws_api.ec2_session_key,
             )
 
             return deploy_data
 
+    def deploy_ami_batch(self, command_context, actions_by_app, cancellation_context):
+        """# noqa
+        Will deploy many Amazon Images on the cloud provider at once
+        :param ResourceCommandContext command_context:
+        :param list[list[RequestActionBase]] actions_by_app: deploy actions of each app
+        :param CancellationContext cancellation_context:
+        :return: results of all apps in the order of the apps
+        :rtype: list[RequestActionBase]
+        """
+        with AwsShellContext(
+            context=command_context, aws_session_manager=self.aws_session_manager
+        ) as shell_context:
+            shell_context.logger.info(f"Deploying {len(actions_by_app)} AMIs")
+
+            deploy_requests = []
+            for actions in actions_by_app:
+                deploy_action = single(actions, lambda x: isinstance(x, DeployApp))
+                network_actions = [a for a in actions if isinstance(a, ConnectSubnet)]
+                deploy_requests.append(
+                    (deploy_action.actionParams.appName, deploy_action, network_actions)
+                )
+
+            results_by_app = self.deploy_ami_operation.deploy_batch(
+                ec2_session=shell_context.aws_api.ec2_session,
+                s3_session=shell_context.aws_api.s3_session,
+                iam_client=shell_context.aws_api.iam_client,
+                reservation=self.model_parser.convert_to_reservation_model(
+                    command_context.reservation
+                ),
+                aws_ec2_cp_resource_model=shell_context.aws_ec2_resource_model,
+                deploy_requests=deploy_requests,
+                ec2_client=shell_context.aws_api.ec2_client,
+                cancellation_context=cancellation_context,
+                logger=shell_context.logger,
+                ec2_session_key=shell_context.aws_api.ec2_session_key,
+            )
+
+            return [result for results in results_by_app for result in results]
+
     def refresh_ip(self, command_context):
         """# noqa
         :param ResourceRemoteCommandContext command_context:
@@ -480,6 +534,47 @@ class AWSShell:
                 resource_fullname=resource_fullname,
             )
 
+    def refresh_credentials(self, command_context, cancellation_context=None):
+        """# noqa
+        Sets the Windows password of the instance deployed with "Defer Credentials"
+        :param ResourceRemoteCommandContext command_context:
+        :param CancellationContext cancellation_context:
+        """
+        with AwsShellContext(
+            context=command_context, aws_session_manager=self.aws_session_manager
+        ) as shell_context:
+            shell_context.logger.info("Refresh Credentials")
+
+            deployed_instance_id = (
+                self.model_parser.try_get_deployed_connected_resource_instance_id(
+                    command_context
+                )
+            )
+            resource_fullname = self.model_parser.get_connectd_resource_fullname(
+                command_context
+            )
+            (
+                user_attr_name,
+                password_attr_name,
+            ) = self.model_parser.get_credentials_attrs_from_connected_resource_details(
+                command_context
+            )
+            key_pair_location = shell_context.aws_ec2_resource_model.key_pairs_location
+
+            self.refresh_credentials_operation.refresh_credentials(
+                cloudshell_session=shell_context.cloudshell_session,
+                ec2_session=shell_context.aws_api.ec2_session,
+                s3_session=shell_context.aws_api.s3_session,
+                deployed_instance_id=deployed_instance_id,
+                key_pair_location=key_pair_location,
+                reservation_id=self._get_reservation_id(command_context),
+                resource_fullname=resource_fullname,
+                password_attribute_name=password_attr_name,
+                user_attribute_name=user_attr_name,
+                logger=shell_context.logger,
+                cancellation_context=cancellation_context,
+            )
+
     def get_access_key(self, command_context):
         """# noqa
         Returns the pem file for the connected resource
@@ -533,27 +628,25 @@ class AWSShell:
         :type context: ResourceCommandContext
         :rtype str
         """
-        results = []
         vm_details_requests = [
             VmDetailsRequest(item)
             for item in DeployDataHolder(jsonpickle.decode(requests_json)).items
         ]
 
-        for request in vm_details_requests:
-            if cancellation_context.is_cancelled:
-                break
-
-            try:
-                with AwsShellContext(
-                    context=context, aws_session_manager=self.aws_session_manager
-                ) as shell_context:
-                    shell_context.logger.info("Get VmDetails")
-                    vm_details = self.vm_details_operation.get_vm_details(
-                        request.uuid, shell_context.aws_api.ec2_session
-                    )
-                    vm_details.appName = request.app_name
-                    results.append(vm_details)
-            except Exception as e:
+        try:
+            with AwsShellContext(
+                context=context, aws_session_manager=self.aws_session_manager
+            ) as shell_context:
+                shell_context.logger.info("Get VmDetails")
+                results = self.vm_details_operation.get_vm_details_list(
+                    requests=vm_details_requests,
+                    ec2_client=shell_context.aws_api.ec2_client,
+                    cancellation_context=cancellation_context,
+                    logger=shell_context.logger,
+                )
+        except Exception as e:
+            results = []
+            for request in vm_details_requests:
                 result = VmDetailsData()
                 result.appName = request.app_name
                 result.error = str(e)
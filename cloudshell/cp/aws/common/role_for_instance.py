@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterable
 
 from botocore.exceptions import ClientError
 
 from cloudshell.cp.aws.domain.handlers.ec2 import TagsHandler
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter
 from cloudshell.cp.aws.models.deploy_aws_ec2_ami_instance_resource_model import (
     DeployAWSEc2AMIInstanceResourceModel,
 )
@@ -14,6 +16,12 @@ from cloudshell.cp.aws.models.reservation_model import ReservationModel
 if TYPE_CHECKING:
     from mypy_boto3_iam import IAMClient
 
+# IAM calls for the policies of the role made at the same time
+IAM_MAX_WORKERS = 5
+INSTANCE_PROFILE_WAITER = BackoffWaiter(
+    name="instance_profile", initial_delay=1, max_delay=5, timeout=60
+)
+
 
 def create_profile_for_instance(
     app_blueprint_name: str,
@@ -41,21 +49,62 @@ def create_profile_for_instance(
         ),
         Tags=tags.aws_tags,
     )
-    for policy_arn in deploy_app.policies_arns_for_new_role:
+
+    def attach_policy(policy_arn):
         logger.info(f"Attaching policy {policy_arn} to role {role_name}")
         iam_client.attach_role_policy(RoleName=role_name, PolicyArn=policy_arn)
 
-    logger.info(f"Creating instance profile {role_name}")
-    iam_client.create_instance_profile(
-        InstanceProfileName=role_name, Tags=tags.aws_tags
+    def create_instance_profile():
+        logger.info(f"Creating instance profile {role_name}")
+        iam_client.create_instance_profile(
+            InstanceProfileName=role_name, Tags=tags.aws_tags
+        )
+
+    # the profile doesn't depend on the policies of the role
+    _run_concurrently(
+        [create_instance_profile]
+        + [
+            lambda arn=policy_arn: attach_policy(arn)
+            for policy_arn in deploy_app.policies_arns_for_new_role
+        ]
     )
     logger.info(f"Adding role {role_name} to instance profile {role_name}")
     iam_client.add_role_to_instance_profile(
         InstanceProfileName=role_name, RoleName=role_name
     )
+    wait_for_instance_profile(iam_client, role_name, logger)
     return role_name
 
 
+def wait_for_instance_profile(
+    iam_client: IAMClient,
+    profile_name: str,
+    logger,
+    waiter: BackoffWaiter = INSTANCE_PROFILE_WAITER,
+) -> dict:
+    """Waits until IAM returns the new instance profile with its role.
+
+    Launching an instance with a profile IAM doesn't return yet fails, and
+    failed RunInstances calls are expensive, so the profile is polled instead.
+    """
+
+    def get_profile_with_role():
+        try:
+            response = iam_client.get_instance_profile(InstanceProfileName=profile_name)
+        except ClientError as e:
+            if "NoSuchEntity" not in str(e):
+                raise
+            return None
+        profile = response["InstanceProfile"]
+        return profile if profile["Roles"] else None
+
+    logger.info(f"Waiting for instance profile {profile_name}")
+    return waiter.wait(
+        get_profile_with_role,
+        f"Timeout: Waiting for instance profile {profile_name}",
+    )
+
+
 def delete_profile_for_instance(
     app_blueprint_name: str,
     iam_client: IAMClient,
@@ -71,18 +120,35 @@ def delete_profile_for_instance(
             raise
     else:
         logger.info(f"Deleting role {role_name}")
-        for policy in resp["AttachedPolicies"]:
-            iam_client.detach_role_policy(
-                RoleName=role_name, PolicyArn=policy["PolicyArn"]
+        _run_concurrently(
+            lambda arn=policy["PolicyArn"]: iam_client.detach_role_policy(
+                RoleName=role_name, PolicyArn=arn
             )
+            for policy in resp["AttachedPolicies"]
+        )
         # detach role from profile
         iam_client.remove_role_from_instance_profile(
             InstanceProfileName=role_name, RoleName=role_name
         )
-        # delete role
-        iam_client.delete_role(RoleName=role_name)
-        # delete profile
-        iam_client.delete_instance_profile(InstanceProfileName=role_name)
+        # the role and the profile don't depend on each other anymore
+        _run_concurrently(
+            [
+                lambda: iam_client.delete_role(RoleName=role_name),
+                lambda: iam_client.delete_instance_profile(
+                    InstanceProfileName=role_name
+                ),
+            ]
+        )
+
+
+def _run_concurrently(calls: Iterable[Callable[[], object]]) -> None:
+    """Runs the calls in threads, raises the first error after all are done."""
+    with ThreadPoolExecutor(
+        max_workers=IAM_MAX_WORKERS, thread_name_prefix="iam"
+    ) as executor:
+        futures = [executor.submit(call) for call in calls]
+    for future in futures:
+        future.result()
 
 
 def _get_role_name(app_blueprint_name: str, reservation_id: str) -> str:
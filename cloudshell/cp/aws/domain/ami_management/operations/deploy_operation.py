@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import copy
+import json
+import os
 import traceback
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from multiprocessing import TimeoutError  # noqa: A004
 from typing import TYPE_CHECKING
 
+import attr
+
 from cloudshell.cp.core.models import (
     ConnectSubnet,
     ConnectToSubnetActionResult,
     ConnectToSubnetParams,
+    DeployApp,
     DeployAppResult,
 )
 from cloudshell.cp.core.utils import convert_dict_to_attributes_list
@@ -20,15 +29,25 @@ from cloudshell.cp.aws.common.role_for_instance import (
 )
 from cloudshell.cp.aws.domain.common.cancellation_service import check_if_cancelled
 from cloudshell.cp.aws.domain.common.list_helper import first_or_default
+from cloudshell.cp.aws.domain.common.phase_timings import PhaseTimings
 from cloudshell.cp.aws.domain.handlers.ec2 import (
     IsolationTagValue,
     TagsHandler,
     TypeTagValue,
 )
+from cloudshell.cp.aws.domain.services.ec2.image_cache import (
+    IMAGE_METADATA_CACHE,
+    ImageKey,
+    ImageMetadata,
+    ImageMetadataCache,
+)
 from cloudshell.cp.aws.domain.services.ec2.security_group import SecurityGroupService
 from cloudshell.cp.aws.domain.services.parsers.port_group_attribute_parser import (
     PortGroupAttributeParser,
 )
+from cloudshell.cp.aws.domain.services.waiters.instance import (
+    InstanceTerminatedException,
+)
 from cloudshell.cp.aws.models.ami_deployment_model import AMIDeploymentModel
 from cloudshell.cp.aws.models.aws_ec2_cloud_provider_resource_model import VpcMode
 from cloudshell.cp.aws.models.network_actions_models import DeployNetworkingResultModel
@@ -37,13 +56,21 @@ if TYPE_CHECKING:
     from logging import Logger
 
     from mypy_boto3_ec2 import EC2ServiceResource  # noqa: I900
-    from mypy_boto3_ec2.service_resource import Vpc  # noqa: I900
+    from mypy_boto3_ec2.service_resource import (  # noqa: I900
+        Instance,
+        SecurityGroup,
+        Vpc,
+    )
     from mypy_boto3_iam import IAMClient  # noqa: I900
 
     from cloudshell.cp.aws.domain.services.ec2.network_interface import (
         NetworkInterfaceService,
     )
     from cloudshell.cp.aws.domain.services.ec2.vpc import VPCService
+    from cloudshell.cp.aws.domain.services.ec2.warm_pool import WarmPoolService
+    from cloudshell.cp.aws.domain.services.session_providers.session_cache import (
+        SessionKey,
+    )
     from cloudshell.cp.aws.domain.services.strategy.device_index import (
         AbstractDeviceIndexStrategy,
     )
@@ -56,6 +83,51 @@ if TYPE_CHECKING:
     from cloudshell.cp.aws.models.reservation_model import ReservationModel
 
 
+# threads preparing the image and the IAM profile while the security group
+# is created in the command thread
+PRE_LAUNCH_MAX_WORKERS = 2
+# apps of the batch deploy prepared and configured at the same time
+BATCH_MAX_WORKERS = 5
+# independent rollback steps run at the same time
+ROLLBACK_MAX_WORKERS = 4
+# adds durations and AWS calls of the deploy phases to the deploy result
+DEPLOY_TIMINGS_IN_RESULT = (
+    os.getenv("QS_AWS_DEPLOY_TIMINGS_IN_RESULT", "false").lower() == "true"
+)
+
+
+def _copy_resource(resource):
+    """Returns a new boto3 resource object for another thread.
+
+    Resources aren't thread safe, the copy shares the thread safe client.
+    """
+    return type(resource)(client=resource.meta.client)
+
+
+@attr.s(auto_attribs=True)
+class AppDeployment:
+    """State of the app deployment shared between the deploy steps."""
+
+    name: str
+    deploy_action: DeployApp
+    network_actions: list[ConnectSubnet] | None
+    network_config_results: list[DeployNetworkingResultModel] = attr.ib(factory=list)
+    image: ImageMetadata | None = None
+    security_group: SecurityGroup | None = None
+    vpc_id: str | None = None
+    deployment_info: AMIDeploymentModel | None = None
+    instance: Instance | None = None
+    # set if the app can use the warm pool
+    warm_pool_key: str | None = None
+    results: list | None = None
+    error: Exception | None = None
+    timings: PhaseTimings = attr.ib(factory=PhaseTimings)
+
+    @property
+    def model(self) -> DeployAWSEc2AMIInstanceResourceModel:
+        return self.deploy_action.actionParams.deployment.customModel
+
+
 class DeployAMIOperation:
     MAX_IO1_IOPS = 20000
     MAX_IO2_IOPS = 64000
@@ -72,6 +144,8 @@ class DeployAMIOperation:
         network_interface_service: NetworkInterfaceService,
         device_index_strategy: AbstractDeviceIndexStrategy,
         vm_details_provider,
+        image_cache: ImageMetadataCache = IMAGE_METADATA_CACHE,
+        warm_pool_service: WarmPoolService | None = None,
     ):
         """# noqa
         :param cloudshell.cp.aws.domain.services.ec2.instance.InstanceService instance_service: Instance Service
@@ -81,6 +155,8 @@ class DeployAMIOperation:
         :param SubnetService subnet_service: Subnet Service
         :param ElasticIpService elastic_ip_service: Elastic Ips Service
         :param VmDetailsProvider vm_details_provider:
+        :param ImageMetadataCache image_cache: AMI attributes shared between deploys
+        :param WarmPoolService warm_pool_service: stopped instances claimed by deploys
         """
         self.instance_service = instance_service
         self.security_group_service = security_group_service
@@ -92,6 +168,8 @@ class DeployAMIOperation:
         self.network_interface_service = network_interface_service
         self.device_index_strategy = device_index_strategy
         self.vm_details_provider = vm_details_provider
+        self.image_cache = image_cache
+        self.warm_pool_service = warm_pool_service
 
     def deploy(
         self,
@@ -106,6 +184,7 @@ class DeployAMIOperation:
         ec2_client,
         cancellation_context,
         logger,
+        ec2_session_key: SessionKey | None = None,
     ):
         """# noqa
         :param ec2_client: boto3.ec2.client
@@ -124,138 +203,621 @@ class DeployAMIOperation:
         :type network_actions: list[cloudshell.cp.core.models.ConnectSubnet]
         :param logging.Logger logger:
         :param CancellationContext cancellation_context:
+        :param ec2_session_key: key of the EC2 session, AMI attributes are cached by it
         :return: Deploy Result
         :rtype: list[RequestActionBase]
         """
-        ami_deployment_model: DeployAWSEc2AMIInstanceResourceModel = (  # noqa
-            ami_deploy_action.actionParams.deployment.customModel
-        )
-        vpc = self._get_vpc(
-            ec2_session,
-            aws_ec2_cp_resource_model,
-            reservation.reservation_id,
-            logger,
-            network_actions,
-        )
-        key_name = self.key_pair_service.get_reservation_key_name(
-            reservation_id=reservation.reservation_id
+        app = AppDeployment(name, ami_deploy_action, network_actions)
+        PhaseTimings.count_aws_calls(
+            ec2_client, ec2_session.meta.client, s3_session.meta.client, iam_client
         )
+        try:
+            return self._deploy_app(
+                app=app,
+                ec2_session=ec2_session,
+                s3_session=s3_session,
+                iam_client=iam_client,
+                reservation=reservation,
+                aws_ec2_cp_resource_model=aws_ec2_cp_resource_model,
+                ec2_client=ec2_client,
+                cancellation_context=cancellation_context,
+                logger=logger,
+                ec2_session_key=ec2_session_key,
+            )
+        finally:
+            self._log_timings(app, logger)
+
+    def _deploy_app(
+        self,
+        app: AppDeployment,
+        ec2_session,
+        s3_session,
+        iam_client,
+        reservation,
+        aws_ec2_cp_resource_model,
+        ec2_client,
+        cancellation_context,
+        logger,
+        ec2_session_key,
+    ):
+        with app.timings.phase("key_pair"):
+            key_name = self.key_pair_service.get_reservation_key_name(
+                reservation_id=reservation.reservation_id
+            )
         logger.info(f"Found shared sandbox key pair '{key_name}'")
 
         check_if_cancelled(cancellation_context)
 
-        instance = None
-        security_group = None
-        network_config_results = self._prepare_network_result_models(
-            network_actions=network_actions
+        app.network_config_results = self._prepare_network_result_models(
+            network_actions=app.network_actions
         )
         try:
-            security_group = self._create_security_group_for_instance(
-                ami_deployment_model=ami_deployment_model,
+            self._prepare_launch(
+                app=app,
                 ec2_session=ec2_session,
+                iam_client=iam_client,
+                aws_ec2_cp_resource_model=aws_ec2_cp_resource_model,
                 reservation=reservation,
-                vpc=vpc,
+                key_name=key_name,
+                cancellation_context=cancellation_context,
+                logger=logger,
+                ec2_session_key=ec2_session_key,
+            )
+            if not self._claim_warm_instance(app, ec2_session, logger):
+                with app.timings.phase("run_instances"):
+                    app.instance = self.instance_service.create_instance(
+                        ec2_session,
+                        app.deployment_info,
+                    )
+            self._disable_source_dest_check(app, ec2_client)
+            self._configure_instance(
+                app=app,
+                ec2_session=ec2_session,
+                ec2_client=ec2_client,
+                reservation=reservation,
+                cancellation_context=cancellation_context,
                 logger=logger,
             )
+            self._replenish_warm_pool(app, ec2_session, reservation, logger)
+        except Exception as e:
+            self._rollback_app(app, e, ec2_session, iam_client, reservation, logger)
+            raise  # re-raise original exception after rollback
 
-            check_if_cancelled(cancellation_context)
+        return self._create_deploy_results(
+            app=app,
+            s3_session=s3_session,
+            aws_ec2_cp_resource_model=aws_ec2_cp_resource_model,
+            reservation=reservation,
+            cancellation_context=cancellation_context,
+            logger=logger,
+        )
 
-            ami_deployment_info = self._create_deployment_parameters(
+    def deploy_batch(
+        self,
+        ec2_session,
+        s3_session,
+        iam_client,
+        reservation,
+        aws_ec2_cp_resource_model,
+        deploy_requests,
+        ec2_client,
+        cancellation_context,
+        logger,
+        ec2_session_key: SessionKey | None = None,
+    ):
+        """# noqa
+        Deploys many apps sharing the VPC, the key pair, the images and the launch calls.
+
+        Apps with the same launch parameters are created with one RunInstances call
+        and all instances are waited for together. A failed app is rolled back and
+        gets a failed result, the other apps are deployed.
+        :param deploy_requests: app name, deploy action and network actions of each app
+        :type deploy_requests: list[tuple[str, cloudshell.cp.core.models.DeployApp, list[cloudshell.cp.core.models.ConnectSubnet]]]
+        :param ec2_session_key: key of the EC2 session, AMI attributes are cached by it
+        :return: deploy results of each app in the order of the requests
+        :rtype: list[list[RequestActionBase]]
+        """
+        apps = [
+            AppDeployment(name, deploy_action, network_actions)
+            for name, deploy_action, network_actions in deploy_requests
+        ]
+        PhaseTimings.count_aws_calls(
+            ec2_client, ec2_session.meta.client, s3_session.meta.client, iam_client
+        )
+        try:
+            return self._deploy_apps(
+                apps=apps,
+                ec2_session=ec2_session,
+                s3_session=s3_session,
+                iam_client=iam_client,
+                reservation=reservation,
+                aws_ec2_cp_resource_model=aws_ec2_cp_resource_model,
+                ec2_client=ec2_client,
+                cancellation_context=cancellation_context,
+                logger=logger,
+                ec2_session_key=ec2_session_key,
+            )
+        finally:
+            for app in apps:
+                self._log_timings(app, logger)
+
+    def _deploy_apps(
+        self,
+        apps: list[AppDeployment],
+        ec2_session,
+        s3_session,
+        iam_client,
+        reservation,
+        aws_ec2_cp_resource_model,
+        ec2_client,
+        cancellation_context,
+        logger,
+        ec2_session_key,
+    ):
+        # phases shared by all apps
+        shared_timings = PhaseTimings()
+        with shared_timings.phase("key_pair"):
+            key_name = self.key_pair_service.get_reservation_key_name(
+                reservation_id=reservation.reservation_id
+            )
+        logger.info(f"Found shared sandbox key pair '{key_name}'")
+
+        check_if_cancelled(cancellation_context)
+
+        # in the predefined mode the VPC depends on the subnets of the app
+        vpc = None
+        if aws_ec2_cp_resource_model.vpc_mode is not VpcMode.PREDEFINED:
+            with shared_timings.phase("vpc"):
+                vpc = self._get_vpc(
+                    ec2_session,
+                    aws_ec2_cp_resource_model,
+                    reservation.reservation_id,
+                    logger,
+                    [],
+                )
+        for app in apps:
+            app.timings.merge(shared_timings)
+
+        # the steps run on worker threads, every step gets its own resources
+        def fail(app, error):
+            logger.error(f"Failed to deploy the app {app.name}", exc_info=error)
+            app.error = error
+            try:
+                self._rollback_app(
+                    app,
+                    error,
+                    _copy_resource(ec2_session),
+                    iam_client,
+                    reservation,
+                    logger,
+                )
+            except Exception:
+                logger.exception(f"Failed to roll back the app {app.name}")
+
+        def prepare_launch(app):
+            app.network_config_results = self._prepare_network_result_models(
+                network_actions=app.network_actions
+            )
+            worker_session = _copy_resource(ec2_session)
+            self._prepare_launch(
+                app=app,
+                ec2_session=worker_session,
+                iam_client=iam_client,
+                aws_ec2_cp_resource_model=aws_ec2_cp_resource_model,
+                reservation=reservation,
+                key_name=key_name,
+                cancellation_context=cancellation_context,
+                logger=logger,
+                vpc=vpc and worker_session.Vpc(vpc.id),
+                ec2_session_key=ec2_session_key,
+            )
+
+        def disable_source_dest_check(app):
+            self._disable_source_dest_check(app, ec2_client)
+
+        def configure_instance(app):
+            self._configure_instance(
+                app=app,
+                ec2_session=_copy_resource(ec2_session),
+                ec2_client=ec2_client,
+                reservation=reservation,
+                cancellation_context=cancellation_context,
+                logger=logger,
+                wait_for_running=False,
+            )
+
+        def create_results(app):
+            app.results = self._create_deploy_results(
+                app=app,
+                s3_session=_copy_resource(s3_session),
+                aws_ec2_cp_resource_model=aws_ec2_cp_resource_model,
+                reservation=reservation,
+                cancellation_context=cancellation_context,
+                logger=logger,
+            )
+
+        self._run_apps_step(apps, prepare_launch, fail)
+        self._launch_instances(apps, ec2_session, fail, logger)
+        self._run_apps_step(apps, disable_source_dest_check, fail)
+
+        launched_apps = [app for app in apps if not app.error]
+        if launched_apps:
+            wait_timings = PhaseTimings()
+            try:
+                with wait_timings.phase("running_wait"):
+                    self.instance_service.wait_for_instances_to_run_in_aws(
+                        [app.instance for app in launched_apps], cancellation_context
+                    )
+            except InstanceTerminatedException as e:
+                # the other instances are running
+                for app in launched_apps:
+                    reason = e.reasons.get(app.instance.id)
+                    if reason:
+                        fail(
+                            app,
+                            InstanceTerminatedException({app.instance.id: reason}),
+                        )
+            except Exception as e:
+                for app in launched_apps:
+                    fail(app, e)
+            for app in launched_apps:
+                app.timings.merge(wait_timings)
+
+        self._run_apps_step(apps, configure_instance, fail)
+        for app in apps:
+            if not app.error:
+                self._replenish_warm_pool(app, ec2_session, reservation, logger)
+        # the steps check the cancellation, so cancelled apps are rolled back
+        self._run_apps_step(apps, create_results, fail)
+
+        return [app.results or [self._create_failed_deploy_result(app)] for app in apps]
+
+    def _prepare_launch(
+        self,
+        app: AppDeployment,
+        ec2_session,
+        iam_client,
+        aws_ec2_cp_resource_model,
+        reservation,
+        key_name,
+        cancellation_context,
+        logger,
+        vpc=None,
+        ec2_session_key=None,
+    ):
+        """Creates the security group and the IAM profile and the launch params."""
+        model = app.model
+        # the image and the IAM profile don't depend on the VPC and the
+        # security group, so they are prepared in parallel. Leaving the pool
+        # waits for all branches, so the rollback sees everything they created
+        with ThreadPoolExecutor(
+            max_workers=PRE_LAUNCH_MAX_WORKERS, thread_name_prefix="deploy"
+        ) as executor:
+            image_future = None
+            if app.image is None:
+                image_future = executor.submit(
+                    app.timings.timed("image", self._get_available_image),
+                    _copy_resource(ec2_session),
+                    ec2_session_key,
+                    model,
+                )
+            iam_role_future = executor.submit(
+                app.timings.timed(
+                    "iam_profile", self._get_iam_instance_profile_request
+                ),
+                app.name,
+                model,
+                iam_client,
+                reservation,
+                logger,
+            )
+            if vpc is None:
+                with app.timings.phase("vpc"):
+                    vpc = self._get_vpc(
+                        ec2_session,
+                        aws_ec2_cp_resource_model,
+                        reservation.reservation_id,
+                        logger,
+                        app.network_actions,
+                    )
+            app.vpc_id = vpc.id
+            with app.timings.phase("security_group"):
+                app.security_group = self._create_security_group_for_instance(
+                    ami_deployment_model=model,
+                    ec2_session=ec2_session,
+                    reservation=reservation,
+                    vpc=vpc,
+                    logger=logger,
+                )
+        if image_future:
+            app.image = image_future.result()
+        iam_role = iam_role_future.result()
+
+        check_if_cancelled(cancellation_context)
+
+        with app.timings.phase("launch_params"):
+            app.deployment_info = self._create_deployment_parameters(
                 ec2_session=ec2_session,
                 iam_client=iam_client,
                 aws_ec2_resource_model=aws_ec2_cp_resource_model,
-                ami_deployment_model=ami_deployment_model,
-                network_actions=network_actions,
+                ami_deployment_model=model,
+                network_actions=app.network_actions,
                 vpc=vpc,
-                security_group=security_group,
+                security_group=app.security_group,
                 key_pair=key_name,
                 reservation=reservation,
-                network_config_results=network_config_results,
-                app_name=name,
+                network_config_results=app.network_config_results,
+                app_name=app.name,
                 logger=logger,
+                image=app.image,
+                iam_role=iam_role,
             )
 
-            instance = self.instance_service.create_instance(
-                ec2_session,
-                ami_deployment_info,
-            )
-            logger.info("Instance created, populating results with interface data")
-            self.instance_service.wait_for_instance_to_run_in_aws(
-                ec2_client,
-                instance,
-                ami_deployment_model.wait_for_status_check,
-                ami_deployment_model.status_check_timeout,
-                cancellation_context,
-                logger,
+    def _launch_instances(self, apps, ec2_session, fail, logger):
+        """Creates instances of the apps with identical launch params at once."""
+        for app in apps:
+            if not app.error:
+                try:
+                    self._claim_warm_instance(app, ec2_session, logger)
+                except Exception as e:
+                    fail(app, e)
+
+        apps_by_launch_key = defaultdict(list)
+        for app in apps:
+            if not app.error and app.instance is None:
+                key = self._get_launch_key(app.deployment_info)
+                apps_by_launch_key[key].append(app)
+
+        for group in apps_by_launch_key.values():
+            logger.info(f"Creating {len(group)} instance(s) with one call")
+            group_timings = PhaseTimings()
+            try:
+                with group_timings.phase("run_instances"):
+                    instances = self.instance_service.create_instances(
+                        ec2_session, group[0].deployment_info, count=len(group)
+                    )
+            except Exception as e:
+                for app in group:
+                    fail(app, e)
+            else:
+                for app, instance in zip(group, instances):
+                    app.instance = instance
+            for app in group:
+                app.timings.merge(group_timings)
+
+    def _claim_warm_instance(self, app: AppDeployment, ec2_session, logger) -> bool:
+        """Starts a stopped instance of the warm pool instead of launching one."""
+        if not (
+            self.warm_pool_service
+            and self.warm_pool_service.is_poolable(app.deployment_info)
+        ):
+            return False
+
+        with app.timings.phase("warm_pool"):
+            app.warm_pool_key = self.warm_pool_service.get_pool_key(
+                ec2_session, app.vpc_id, app.deployment_info
             )
-            self.instance_service.set_tags(
-                instance, name, reservation, ami_deployment_info.custom_tags
+            app.instance = self.warm_pool_service.claim(
+                ec2_session, app.warm_pool_key, logger
             )
+            if app.instance is None:
+                return False
+            # the claimed instance is terminated by the rollback as a launched one
+            self.warm_pool_service.apply_claimed(app.instance, app.deployment_info)
+        return True
+
+    def _replenish_warm_pool(
+        self, app: AppDeployment, ec2_session, reservation, logger
+    ) -> None:
+        """Replaces the instance the app took from the pool or could take."""
+        if app.warm_pool_key is None:
+            return
+        # the exclusive group is deleted with the app, pool instances don't use it
+        exclusive_group_ids = []
+        if app.security_group:
+            exclusive_group_ids.append(app.security_group.group_id)
+        self.warm_pool_service.replenish_in_background(
+            _copy_resource(ec2_session),
+            app.warm_pool_key,
+            app.deployment_info,
+            exclusive_group_ids,
+            reservation.reservation_id,
+            logger,
+        )
+
+    @staticmethod
+    def _get_launch_key(ami_deployment_info: AMIDeploymentModel) -> str:
+        """Returns the same key for deployments created with the same params."""
+        return json.dumps(
+            [
+                ami_deployment_info.aws_ami_id,
+                ami_deployment_info.instance_type,
+                ami_deployment_info.aws_key,
+                ami_deployment_info.block_device_mappings,
+                ami_deployment_info.network_interfaces,
+                ami_deployment_info.iam_role,
+                ami_deployment_info.user_data,
+                ami_deployment_info.tags.aws_tags,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+    @staticmethod
+    def _run_apps_step(apps, step, fail):
+        """Runs the step for the apps that didn't fail yet on a thread pool."""
+
+        def run(app):
+            try:
+                step(app)
+            except Exception as e:
+                fail(app, e)
 
+        pending_apps = [app for app in apps if not app.error]
+        with ThreadPoolExecutor(
+            max_workers=BATCH_MAX_WORKERS, thread_name_prefix="deploy-batch"
+        ) as executor:
+            list(executor.map(run, pending_apps))
+
+    def _disable_source_dest_check(self, app: AppDeployment, ec2_client):
+        """Disables the check right after the launch.
+
+        RunInstances doesn't accept the attribute, but NICs are created with
+        the instance, so it's set while the instance is still pending.
+        """
+        if not app.model.enable_source_dest_check:
+            with app.timings.phase("source_dest_check"):
+                self.instance_service.disable_source_dest_check(
+                    ec2_client, app.instance
+                )
+
+    def _configure_instance(
+        self,
+        app: AppDeployment,
+        ec2_session,
+        ec2_client,
+        reservation,
+        cancellation_context,
+        logger,
+        wait_for_running=True,
+    ):
+        model = app.model
+        instance = app.instance
+        logger.info("Instance created, populating results with interface data")
+        if wait_for_running:
+            with app.timings.phase("running_wait", polled=True):
+                self.instance_service.wait_for_instance_to_run_in_aws(
+                    ec2_client,
+                    instance,
+                    False,
+                    model.status_check_timeout,
+                    cancellation_context,
+                    logger,
+                )
+        if model.wait_for_status_check:
+            with app.timings.phase("status_check_wait", polled=True):
+                self.instance_service.wait_for_status_check(
+                    ec2_client,
+                    instance,
+                    model.status_check_timeout,
+                    cancellation_context,
+                    logger,
+                )
+        with app.timings.phase("instance_load"):
             # Reload the instance attributes
             retry_helper.do_with_retry(lambda: instance.load())
 
-            if not ami_deployment_model.enable_source_dest_check:
-                self.instance_service.disable_source_dest_check(ec2_client, instance)
+        with app.timings.phase("tagging"):
+            # other tags are set at launch, the name contains the instance id
+            self.instance_service.set_name_tag(instance, app.name)
 
-            self._populate_network_config_results_with_interface_data(
-                instance=instance, network_config_results=network_config_results
-            )
+        self._populate_network_config_results_with_interface_data(
+            instance=instance, network_config_results=app.network_config_results
+        )
 
-            check_if_cancelled(cancellation_context)
+        check_if_cancelled(cancellation_context)
 
+        with app.timings.phase("elastic_ips"):
             self.elastic_ip_service.set_elastic_ips(
                 ec2_session=ec2_session,
                 ec2_client=ec2_client,
                 instance=instance,
-                ami_deployment_model=ami_deployment_model,
-                network_actions=network_actions,
-                network_config_results=network_config_results,
+                ami_deployment_model=model,
+                network_actions=app.network_actions,
+                network_config_results=app.network_config_results,
                 logger=logger,
             )
 
-            check_if_cancelled(cancellation_context)
+        check_if_cancelled(cancellation_context)
 
-        except Exception as e:
+    def _rollback_app(
+        self,
+        app: AppDeployment,
+        exception,
+        ec2_session,
+        iam_client,
+        reservation,
+        logger,
+    ):
+        if app.instance:
+            instance_id = app.instance.id
+        else:
+            instance_id = self._extract_instance_id_on_cancellation(exception, None)
+        with app.timings.phase("rollback"):
             self._rollback_deploy(
                 ec2_session=ec2_session,
                 iam_client=iam_client,
-                instance_id=self._extract_instance_id_on_cancellation(e, instance),
-                custom_security_group=security_group,
-                network_config_results=network_config_results,
-                app_name=name,
+                instance_id=instance_id,
+                custom_security_group=app.security_group,
+                network_config_results=app.network_config_results,
+                app_name=app.name,
                 reservation=reservation,
                 logger=logger,
             )
-            raise  # re-raise original exception after rollback
 
+    def _create_deploy_results(
+        self,
+        app: AppDeployment,
+        s3_session,
+        aws_ec2_cp_resource_model,
+        reservation,
+        cancellation_context,
+        logger,
+    ):
+        model = app.model
+        instance = app.instance
         logger.info(f"Instance {instance.id} created, getting ami credentials")
-        ami_credentials = self._get_ami_credentials(
-            key_pair_location=aws_ec2_cp_resource_model.key_pairs_location,
-            wait_for_credentials=ami_deployment_model.wait_for_credentials,
-            instance=instance,
-            reservation=reservation,
-            s3_session=s3_session,
-            ami_deploy_action=ami_deploy_action,
-            cancellation_context=cancellation_context,
-            logger=logger,
+        with app.timings.phase("credentials", polled=True):
+            # deferred credentials are written to the resource by refresh_credentials
+            ami_credentials = self._get_ami_credentials(
+                key_pair_location=aws_ec2_cp_resource_model.key_pairs_location,
+                wait_for_credentials=(
+                    model.wait_for_credentials and not model.defer_credentials
+                ),
+                instance=instance,
+                reservation=reservation,
+                s3_session=s3_session,
+                ami_deploy_action=app.deploy_action,
+                cancellation_context=cancellation_context,
+                logger=logger,
+            )
+        credentials_pending = bool(
+            model.defer_credentials and instance.platform and not ami_credentials
         )
+        if credentials_pending:
+            logger.info(
+                f"Windows password of the instance {instance.id} is not ready yet, "
+                f"it can be set later with the refresh credentials command"
+            )
 
         logger.info("Preparing result")
 
         deployed_app_attributes = self._prepare_deployed_app_attributes(
             ami_credentials=ami_credentials,
-            ami_deployment_model=ami_deployment_model,
-            network_config_results=network_config_results,
+            ami_deployment_model=model,
+            network_config_results=app.network_config_results,
         )
 
-        vm_details_data = self.vm_details_provider.create(instance)
+        with app.timings.phase("vm_details"):
+            vm_details_data = self.vm_details_provider.create(
+                instance,
+                volumes=self._get_launched_root_volume(
+                    instance, app.deployment_info.block_device_mappings
+                ),
+            )
 
         network_actions_results_dtos = self._prepare_network_config_results_dto(
-            network_config_results=network_config_results,
-            network_actions=network_actions,
+            network_config_results=app.network_config_results,
+            network_actions=app.network_actions,
         )
 
+        additional_data = {
+            "inbound_ports": model.inbound_ports,
+            "public_ip": instance.public_ip_address,
+            "credentials_pending": credentials_pending,
+        }
+        if DEPLOY_TIMINGS_IN_RESULT:
+            additional_data["timings"] = app.timings.to_dict()
         deploy_app_result = DeployAppResult(
             vmName=self._get_name_from_tags(instance),
             vmUuid=instance.instance_id,
@@ -264,15 +826,26 @@ class DeployAMIOperation:
             ),
             deployedAppAddress=instance.private_ip_address,
             vmDetailsData=vm_details_data,
-            deployedAppAdditionalData={
-                "inbound_ports": ami_deployment_model.inbound_ports,
-                "public_ip": instance.public_ip_address,
-            },
+            deployedAppAdditionalData=additional_data,
         )
-        deploy_app_result.actionId = ami_deploy_action.actionId
+        deploy_app_result.actionId = app.deploy_action.actionId
         network_actions_results_dtos.append(deploy_app_result)
         return network_actions_results_dtos
 
+    @staticmethod
+    def _log_timings(app: AppDeployment, logger):
+        timings = app.timings.to_dict()
+        timings.update(app=app.name, success=app.results is not None)
+        logger.info(f"Deploy timings: {json.dumps(timings, default=str)}")
+
+    @staticmethod
+    def _create_failed_deploy_result(app: AppDeployment) -> DeployAppResult:
+        return DeployAppResult(
+            actionId=app.deploy_action.actionId,
+            success=False,
+            errorMessage=f"DeployApp ended with the error: {app.error}",
+        )
+
     def _get_vpc(
         self,
         ec2_session: EC2ServiceResource,
@@ -513,19 +1086,18 @@ class DeployAMIOperation:
             )
         )
 
-        security_group = self.security_group_service.create_security_group(
-            ec2_session=ec2_session,
-            vpc_id=vpc.id,
-            security_group_name=security_group_name,
-        )
-
         tags = TagsHandler.create_security_group_tags(
             security_group_name,
             reservation,
             IsolationTagValue.EXCLUSIVE,
             TypeTagValue.INBOUND_PORTS,
         )
-        tags.add_tags_to_obj(security_group)
+        security_group = self.security_group_service.create_security_group(
+            ec2_session=ec2_session,
+            vpc_id=vpc.id,
+            security_group_name=security_group_name,
+            tags=tags,
+        )
 
         self.security_group_service.set_security_group_rules(
             security_group=security_group,
@@ -559,6 +1131,8 @@ class DeployAMIOperation:
         network_config_results,
         app_name,
         logger,
+        image=None,
+        iam_role=None,
     ):
         """# noqa
         :param ec2_session:
@@ -578,17 +1152,18 @@ class DeployAMIOperation:
         :param network_config_results: list of network configuration result objects
         :type network_config_results: list[DeployNetworkingResultModel]
         :param logging.Logger logger:
+        :param image: the available AMI, loaded if not provided
+        :param dict iam_role: IamInstanceProfile param, created if not provided
         """
         aws_model = AMIDeploymentModel()
-        if not ami_deployment_model.aws_ami_id:
-            raise ValueError("AWS Image Id cannot be empty")
-
-        image = ec2_session.Image(ami_deployment_model.aws_ami_id)
-        self._validate_image_available(image, ami_deployment_model.aws_ami_id)
+        if image is None:
+            image = self._get_available_image(ec2_session, None, ami_deployment_model)
 
         aws_model.custom_tags = self._get_custom_tags(
             custom_tags=ami_deployment_model.custom_tags, logger=logger
         )
+        aws_model.tags = TagsHandler.create_reservation_tags(reservation)
+        aws_model.tags.update_tags(aws_model.custom_tags)
         aws_model.source_dest_check = ami_deployment_model.enable_source_dest_check
         aws_model.status_check_timeout = ami_deployment_model.status_check_timeout
         aws_model.user_data = self._get_user_data(
@@ -597,9 +1172,11 @@ class DeployAMIOperation:
         )
 
         aws_model.aws_ami_id = ami_deployment_model.aws_ami_id
-        aws_model.iam_role = self._get_iam_instance_profile_request(
-            app_name, ami_deployment_model, iam_client, reservation, logger
-        )
+        if iam_role is None:
+            iam_role = self._get_iam_instance_profile_request(
+                app_name, ami_deployment_model, iam_client, reservation, logger
+            )
+        aws_model.iam_role = iam_role
         aws_model.min_count = 1
         aws_model.max_count = 1
         aws_model.instance_type = self._get_instance_item(
@@ -826,7 +1403,7 @@ class DeployAMIOperation:
         self, image, ami_deployment_model, aws_ec2_resource_model
     ):
         """# noqa
-        :param image: A resource representing an EC2 image
+        :param image: attributes of the EC2 image
         :param aws_ec2_resource_model: The resource model of the AMI deployment option
         :type aws_ec2_resource_model: cloudshell.cp.aws.models.aws_ec2_cloud_provider_resource_model.AWSEc2CloudProviderResourceModel
         :param ami_deployment_model: The resource model on which the AMI will be deployed on
@@ -872,8 +1449,9 @@ class DeployAMIOperation:
                 },
             }
         ]
+        # the image attributes are shared by deploys, so they are copied
         block_device_mappings.extend(
-            bdm
+            copy.deepcopy(bdm)
             for bdm in image.block_device_mappings
             if bdm["DeviceName"] != image.root_device_name and bdm.get("Ebs")
         )
@@ -910,6 +1488,32 @@ class DeployAMIOperation:
 
         return block_device_mappings
 
+    def _get_launched_root_volume(self, instance, block_device_mappings):
+        """Describes the root volume from the launch request without API calls.
+
+        :return: root volume by volume id or None if it isn't in the request
+        :rtype: dict[str, dict] | None
+        """
+        instance_data = instance.meta.data
+        volume_id = self.vm_details_provider.get_root_volume_id(instance_data)
+        ebs = next(
+            (
+                bdm.get("Ebs", {})
+                for bdm in block_device_mappings
+                if bdm["DeviceName"] == instance_data.get("RootDeviceName")
+            ),
+            {},
+        )
+        if not volume_id or "VolumeSize" not in ebs or "VolumeType" not in ebs:
+            return None
+        return {
+            volume_id: {
+                "VolumeId": volume_id,
+                "Size": ebs["VolumeSize"],
+                "VolumeType": ebs["VolumeType"],
+            }
+        }
+
     def _suggested_iops(self, storage_size):
         """# noqa
         :param int storage_size:
@@ -960,25 +1564,40 @@ class DeployAMIOperation:
         reservation,
         logger,
     ):
-        """# noqa
+        """Rolls back the deploy, independent steps run at the same time.
 
+        Elastic IPs and the IAM profile don't wait for the instance termination,
+        the security group is deleted after it. A failed step doesn't stop others.
         :param boto3.ec2.client ec2_session:
         :param str instance_id:
         :param custom_security_group: Security Group object
         :param list[DeployNetworkingResultModel] network_config_results:
         :param logging.Logger logger:
-        :return:
+        :return: outcome of every step, "ok", "skipped" or the error
+        :rtype: dict[str, str]
         """
         logger.info("Starting rollback for deploy operation")
+        outcomes = {}
 
-        if instance_id:
+        def run_step(name, func):
+            try:
+                func()
+            except Exception as e:
+                logger.exception(f"Rollback step {name} failed")
+                outcomes[name] = f"failed: {e}"
+                return False
+            outcomes[name] = "ok"
+            return True
+
+        # the steps run on worker threads, every step gets its own resource
+        def terminate_instance():
             instance = self.instance_service.get_instance_by_id(
-                ec2_session=ec2_session, id=instance_id
+                ec2_session=_copy_resource(ec2_session), id=instance_id
             )
             logger.debug(f"Terminating instance id: {instance.id}")
             self.instance_service.terminate_instances([instance])
 
-        if custom_security_group:
+        def delete_security_group():
             logger.debug(
                 "Deleting custom security group {} - {}".format(
                     custom_security_group.id, custom_security_group.group_name
@@ -986,14 +1605,70 @@ class DeployAMIOperation:
             )
             self.security_group_service.delete_security_group(custom_security_group)
 
-        if network_config_results and len(network_config_results):
-            for r in filter(lambda x: x.public_ip, network_config_results):
-                logger.debug(f"Releasing elastic ip {r.public_ip}")
-                self.elastic_ip_service.find_and_release_elastic_address(
-                    ec2_session=ec2_session, elastic_ip=r.public_ip
+        def instance_and_security_group():
+            terminated = not instance_id or run_step("instance", terminate_instance)
+            if not custom_security_group:
+                return
+            if terminated:
+                run_step("security_group", delete_security_group)
+            else:
+                # the group can't be deleted while the instance uses it
+                outcomes["security_group"] = "skipped"
+
+        def release_elastic_ip(public_ip):
+            logger.debug(f"Releasing elastic ip {public_ip}")
+            self.elastic_ip_service.find_and_release_elastic_address(
+                ec2_session=_copy_resource(ec2_session), elastic_ip=public_ip
+            )
+
+        public_ips = [r.public_ip for r in network_config_results or [] if r.public_ip]
+        with ThreadPoolExecutor(
+            max_workers=ROLLBACK_MAX_WORKERS, thread_name_prefix="rollback"
+        ) as executor:
+            executor.submit(instance_and_security_group)
+            for public_ip in public_ips:
+                executor.submit(
+                    run_step,
+                    f"elastic_ip {public_ip}",
+                    partial(release_elastic_ip, public_ip),
                 )
+            executor.submit(
+                run_step,
+                "iam_profile",
+                partial(
+                    delete_profile_for_instance,
+                    app_name,
+                    iam_client,
+                    reservation,
+                    logger,
+                ),
+            )
+
+        logger.info(f"Rollback outcome: {json.dumps(outcomes, sort_keys=True)}")
+        return outcomes
+
+    def _get_available_image(
+        self, ec2_session, ec2_session_key, ami_deployment_model
+    ) -> ImageMetadata:
+        """Returns attributes of the AMI, deploys of the same AMI share them.
+
+        The image is loaded without the cache if the session key isn't known.
+        """
+        ami_id = ami_deployment_model.aws_ami_id
+        if not ami_id:
+            raise ValueError("AWS Image Id cannot be empty")
+        if ec2_session_key is None:
+            return self._load_available_image(ec2_session, ami_id)
+
+        key = ImageKey(ec2_session_key, ami_id)
+        return self.image_cache.get(
+            key, lambda: self._load_available_image(ec2_session, ami_id)
+        )
 
-        delete_profile_for_instance(app_name, iam_client, reservation, logger)
+    def _load_available_image(self, ec2_session, ami_id) -> ImageMetadata:
+        image = ec2_session.Image(ami_id)
+        self._validate_image_available(image, ami_id)
+        return ImageMetadata.from_image(image)
 
     def _validate_image_available(self, image, ami_id):
         if hasattr(image, "state") and image.state == "available":
@@ -0,0 +1,76 @@
+class RefreshCredentialsOperation:
+    PASSWORD = "Password"
+    USER = "User"
+
+    def __init__(self, instance_service, credentials_service, key_pair_service):
+        """# noqa
+        :param instance_service: Instance Service
+        :type instance_service: cloudshell.cp.aws.domain.services.ec2.instance.InstanceService
+        :param credentials_service: Instance Credentials Service
+        :type credentials_service: cloudshell.cp.aws.domain.services.ec2.instance_credentials.InstanceCredentialsService
+        :param key_pair_service: Key Pair Service
+        :type key_pair_service: cloudshell.cp.aws.domain.services.ec2.keypair.KeyPairService
+        """
+        self.instance_service = instance_service
+        self.credentials_service = credentials_service
+        self.key_pair_service = key_pair_service
+
+    def refresh_credentials(
+        self,
+        cloudshell_session,
+        ec2_session,
+        s3_session,
+        deployed_instance_id,
+        key_pair_location,
+        reservation_id,
+        resource_fullname,
+        password_attribute_name,
+        user_attribute_name,
+        logger,
+        cancellation_context=None,
+    ):
+        """# noqa
+        Waits for the Windows password of the instance deployed with deferred
+        credentials and sets it on the deployed resource
+        :param CloudShellAPISession cloudshell_session:
+        :param ec2_session: ec2_session
+        :param s3_session: s3_session
+        :param str deployed_instance_id:
+        :param str key_pair_location: bucket with the reservation key pair
+        :param str reservation_id:
+        :param str resource_fullname:
+        :param str password_attribute_name: name of the password attribute with namespace
+        :param str user_attribute_name: name of the user attribute with namespace
+        :param logging.Logger logger:
+        :param CancellationContext cancellation_context:
+        :return: True if the credentials were set
+        :rtype: bool
+        """
+        instance = self.instance_service.get_active_instance_by_id(
+            ec2_session, deployed_instance_id
+        )
+        # has value for windows instances only
+        if not instance.platform:
+            logger.info(f"Instance {instance.id} is not Windows, nothing to refresh")
+            return False
+
+        key_value = self.key_pair_service.load_key_pair_by_name(
+            s3_session=s3_session,
+            bucket_name=key_pair_location,
+            reservation_id=reservation_id,
+        )
+        credentials = self.credentials_service.get_windows_credentials(
+            instance=instance,
+            key_value=key_value,
+            wait_for_password=True,
+            cancellation_context=cancellation_context,
+        )
+
+        cloudshell_session.SetAttributeValue(
+            resource_fullname, user_attribute_name, credentials.user_name
+        )
+        cloudshell_session.SetAttributeValue(
+            resource_fullname, password_attribute_name, credentials.password
+        )
+        logger.info(f"Credentials of the instance {instance.id} are set")
+        return True
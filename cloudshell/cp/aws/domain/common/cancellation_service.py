@@ -1,9 +1,17 @@
-from typing import Optional
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from typing import Callable, Optional
 
 from cloudshell.shell.core.driver_context import CancellationContext
 
 from cloudshell.cp.aws.domain.common.exceptions import CancellationException
 
+# seconds between checks of the cancellation contexts
+CANCELLATION_CHECK_INTERVAL = 0.5
+
 
 class CommandCancellationService:
     @staticmethod
@@ -18,7 +26,7 @@ def check_if_cancelled(
 ):
     """Check if command was cancelled from the CloudShell.
 
-    :param cancellation_context: cancellation context
+    :param cancellation_context: cancellation context or cancellation token
     :param dict data: Dictionary that will be added to the cancellation exception
         if raised. Use this container to add context data to the cancellation
         exception to be used by the exception handler
@@ -26,3 +34,115 @@ def check_if_cancelled(
     """
     if cancellation_context and cancellation_context.is_cancelled:
         raise CancellationException("Command was cancelled", data)
+
+
+class CancellationToken:
+    def __init__(self, cancellation_context: CancellationContext | None = None):
+        """Cancellation state of the command that waits can block on.
+
+        CloudShell only sets is_cancelled on the context, so a watcher thread
+        checks contexts of all live tokens and wakes up their waits. The token
+        can be used everywhere the cancellation context is expected.
+        """
+        self.cancellation_context = cancellation_context
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+        if cancellation_context is not None:
+            _WATCHER.watch(self)
+
+    @classmethod
+    def from_context(
+        cls, cancellation_context: CancellationContext | CancellationToken | None
+    ) -> CancellationToken:
+        if isinstance(cancellation_context, cls):
+            return cancellation_context
+        return cls(cancellation_context)
+
+    @property
+    def is_cancelled(self) -> bool:
+        if (
+            not self._event.is_set()
+            and self.cancellation_context is not None
+            and self.cancellation_context.is_cancelled
+        ):
+            self.cancel()
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Blocks until the command is cancelled or the timeout.
+
+        :return: True if the command is cancelled
+        """
+        return self.is_cancelled or self._event.wait(timeout)
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Calls the callback when the command is cancelled.
+
+        :return: function that removes the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def raise_if_cancelled(self, data: Optional[dict] = None) -> None:
+        check_if_cancelled(self, data)
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+class _CancellationWatcher:
+    def __init__(self, interval: float = CANCELLATION_CHECK_INTERVAL):
+        """Cancels tokens whose contexts were cancelled.
+
+        Tokens are kept by weak references, the thread stops when there are no
+        tokens left.
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._tokens: weakref.WeakSet[CancellationToken] = weakref.WeakSet()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, token: CancellationToken) -> None:
+        with self._lock:
+            self._tokens.add(token)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="CancellationWatcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while self._check_tokens():
+            time.sleep(self.interval)
+
+    def _check_tokens(self) -> bool:
+        """Cancels tokens, returns False and stops the thread if none are left."""
+        with self._lock:
+            tokens = list(self._tokens)
+            if not tokens:
+                self._thread = None
+                return False
+        cancelled = [token for token in tokens if token.is_cancelled]
+        with self._lock:
+            for token in cancelled:
+                self._tokens.discard(token)
+        return True
+
+
+_WATCHER = _CancellationWatcher()
@@ -1,2 +1,6 @@
 def first_or_default(lst, lambda_expression):
     return next(filter(lambda_expression, lst), None)
+
+
+def chunks(lst, size):
+    return [lst[i : i + size] for i in range(0, len(lst), size)]
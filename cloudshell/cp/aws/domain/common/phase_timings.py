@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, TypeVar
+
+import attr
+
+# unique id of the botocore handler, it is registered once per client
+AWS_CALLS_HANDLER_ID = "cloudshell-phase-timings-aws-calls"
+
+_local = threading.local()
+
+T = TypeVar("T")
+
+
+@attr.s(auto_attribs=True)
+class PhaseTiming:
+    duration: float = 0  # seconds
+    aws_calls: int = 0
+    # the phase waits for the shared pollers, their calls aren't counted
+    polled: bool = False
+
+
+class PhaseTimings:
+    def __init__(self):
+        """Thread-safe durations and AWS call counts of command phases.
+
+        AWS calls are counted for the innermost phase of the thread that made
+        them, so a phase that runs in another thread has to be entered there.
+        Calls of the shared instance status and password pollers run in their
+        own threads for many commands at once, so they aren't counted, phases
+        that wait for them are marked as polled.
+        A phase entered several times sums up.
+        """
+        self._lock = threading.Lock()
+        self._start_time = time.monotonic()
+        self._phases: dict[str, PhaseTiming] = {}
+
+    @contextmanager
+    def phase(self, name: str, polled: bool = False) -> Iterator[None]:
+        """# noqa
+        :param polled: the phase waits for the shared pollers
+        """
+        previous = getattr(_local, "current", None)
+        _local.current = self, name
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            _local.current = previous
+            with self._lock:
+                timing = self._phases.setdefault(name, PhaseTiming())
+                timing.duration += time.monotonic() - start_time
+                timing.polled |= polled
+
+    def timed(self, name: str, func: Callable[..., T]) -> Callable[..., T]:
+        """Returns the function that runs in the phase, e.g. in another thread."""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def merge(self, other: PhaseTimings) -> None:
+        """Adds phases of the other timings, e.g. shared by many commands."""
+        for name, other_timing in other.get_phases().items():
+            with self._lock:
+                timing = self._phases.setdefault(name, PhaseTiming())
+                timing.duration += other_timing.duration
+                timing.aws_calls += other_timing.aws_calls
+                timing.polled |= other_timing.polled
+
+    def get_phases(self) -> dict[str, PhaseTiming]:
+        with self._lock:
+            return {name: attr.evolve(t) for name, t in self._phases.items()}
+
+    def to_dict(self) -> dict:
+        """Returns JSON serializable timings, durations are in seconds."""
+        phases = {}
+        for name, t in self.get_phases().items():
+            phases[name] = {"duration": round(t.duration, 3), "aws_calls": t.aws_calls}
+            if t.polled:
+                phases[name]["polled"] = True
+        total = round(time.monotonic() - self._start_time, 3)
+        return {"total": total, "phases": phases}
+
+    def _add_aws_call(self, name: str) -> None:
+        with self._lock:
+            self._phases.setdefault(name, PhaseTiming()).aws_calls += 1
+
+    @staticmethod
+    def count_aws_calls(*clients) -> None:
+        """Counts calls of the boto3 clients in the current phase.
+
+        Calls of the shared pollers aren't in any phase, see polled phases.
+        """
+        for client in clients:
+            client.meta.events.register(
+                "before-call", _count_aws_call, unique_id=AWS_CALLS_HANDLER_ID
+            )
+
+
+def _count_aws_call(**kwargs) -> None:
+    current = getattr(_local, "current", None)
+    if current:
+        timings, name = current
+        timings._add_aws_call(name)
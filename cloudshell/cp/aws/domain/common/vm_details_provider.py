@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from cloudshell.cp.core.models import (
     VmDetailsData,
     VmDetailsNetworkInterface,
@@ -9,81 +11,132 @@ class VmDetailsProvider:
     def __init__(self):
         pass
 
-    def create(self, instance, deploy_app_name=""):
-        vm_instance_data = self._get_vm_instance_data(instance, instance.vpc_id)
-        vm_network_data = self._get_vm_network_data(instance)
-
+    def create(
+        self,
+        instance,
+        deploy_app_name: str = "",
+        volumes: dict[str, dict] | None = None,
+    ) -> VmDetailsData:
+        """Creates vm details with one DescribeInstances call.
+
+        The root volume is described with one more call if volumes aren't set.
+        :type instance: mypy_boto3_ec2.service_resource.Instance
+        :param volumes: volume descriptions from DescribeVolumes by volume id
+        """
+        instance.reload()
+        instance_data = instance.meta.data
+        if volumes is None:
+            volumes = self._describe_root_volume(instance.meta.client, instance_data)
+        return self.create_from_description(instance_data, volumes, deploy_app_name)
+
+    def create_from_description(
+        self,
+        instance_data: dict,
+        volumes: dict[str, dict] | None = None,
+        deploy_app_name: str = "",
+    ) -> VmDetailsData:
+        """Creates vm details from already fetched data without AWS API calls.
+
+        :param instance_data: instance description from DescribeInstances
+        :param volumes: volume descriptions from DescribeVolumes by volume id
+        """
         return VmDetailsData(
-            vmInstanceData=vm_instance_data,
-            vmNetworkData=vm_network_data,
+            vmInstanceData=self._get_vm_instance_data(instance_data, volumes or {}),
+            vmNetworkData=self._get_vm_network_data(instance_data),
             appName=deploy_app_name,
         )
 
-    def _get_vm_instance_data(self, instance, vpc_id):
+    @staticmethod
+    def get_root_volume_id(instance_data: dict) -> str | None:
+        mappings = instance_data.get("BlockDeviceMappings") or []
+        root_device_name = instance_data.get("RootDeviceName")
+        mapping = next(
+            (m for m in mappings if m["DeviceName"] == root_device_name),
+            next(iter(mappings), None),
+        )
+        return mapping and mapping.get("Ebs", {}).get("VolumeId")
+
+    def _describe_root_volume(self, ec2_client, instance_data: dict) -> dict[str, dict]:
+        volume_id = self.get_root_volume_id(instance_data)
+        if not volume_id:
+            return {}
+        response = ec2_client.describe_volumes(
+            Filters=[{"Name": "volume-id", "Values": [volume_id]}]
+        )
+        return {volume["VolumeId"]: volume for volume in response["Volumes"]}
+
+    def _get_vm_instance_data(
+        self, instance_data: dict, volumes: dict[str, dict]
+    ) -> list[VmDetailsProperty]:
         # if not windows, instance platform is empty; therefore we default to linux
-        platform = instance.platform or "linux"
-        volume = self._get_volume(instance)
+        platform = instance_data.get("Platform") or "linux"
+        volume_id = self.get_root_volume_id(instance_data)
+        volume = volumes.get(volume_id, {})
+        size = volume.get("Size")
         data = [
-            VmDetailsProperty(key="AMI ID", value=instance.image_id),
-            VmDetailsProperty(key="instance type", value=instance.instance_type),
+            VmDetailsProperty(key="AMI ID", value=instance_data.get("ImageId")),
+            VmDetailsProperty(
+                key="instance type", value=instance_data.get("InstanceType")
+            ),
             VmDetailsProperty(key="platform", value=platform),
-            VmDetailsProperty(key="Storage Name", value=self._get_volume_id(volume)),
-            VmDetailsProperty(key="Storage Type", value=self._get_volume_type(volume)),
-            VmDetailsProperty(key="Storage Size", value=self._get_volume_size(volume)),
-            VmDetailsProperty(key="VPC ID", value=vpc_id, hidden=True),
+            VmDetailsProperty(key="Storage Name", value=volume_id),
+            VmDetailsProperty(key="Storage Type", value=volume.get("VolumeType")),
+            VmDetailsProperty(
+                key="Storage Size", value=f"{size} GiB" if size else None
+            ),
+            VmDetailsProperty(
+                key="VPC ID", value=instance_data.get("VpcId"), hidden=True
+            ),
             VmDetailsProperty(
                 key="Availability Zone",
-                value=self._get_availability_zone(instance),
+                value=instance_data.get("Placement", {}).get("AvailabilityZone"),
                 hidden=True,
             ),
         ]
 
-        if instance.iam_instance_profile:
-            arn = instance.iam_instance_profile["Arn"]
+        iam_instance_profile = instance_data.get("IamInstanceProfile")
+        if iam_instance_profile:
+            arn = iam_instance_profile["Arn"]
             instance_profile_name = arn.split("instance-profile/")[-1]
             data.append(VmDetailsProperty(key="IAM Role", value=instance_profile_name))
 
         return data
 
-    def _get_vm_network_data(self, instance):
+    def _get_vm_network_data(
+        self, instance_data: dict
+    ) -> list[VmDetailsNetworkInterface]:
         network_interfaces_results = []
-
-        instance.reload()
-
-        if not instance.network_interfaces:
-            return network_interfaces_results
-
         network_interfaces = sorted(
-            instance.network_interfaces, key=lambda x: x.attachment.get("DeviceIndex")
+            instance_data.get("NetworkInterfaces") or [],
+            key=lambda x: x["Attachment"].get("DeviceIndex"),
         )
 
         for network_interface in network_interfaces:
-            is_attached_to_elastic_ip = self._has_elastic_ip(network_interface)
-            is_primary = self._is_primary_interface(network_interface)
-            public_ip = self._calculate_public_ip(network_interface)
+            association = network_interface.get("Association")
+            device_index = network_interface["Attachment"].get("DeviceIndex")
+            interface_id = network_interface["NetworkInterfaceId"]
+            private_ip = network_interface.get("PrivateIpAddress")
+            public_ip = self._get_public_ip_from_association(association)
 
             network_data = [
-                VmDetailsProperty(key="IP", value=network_interface.private_ip_address),
+                VmDetailsProperty(key="IP", value=private_ip),
                 VmDetailsProperty(key="Public IP", value=public_ip),
-                VmDetailsProperty(key="Elastic IP", value=is_attached_to_elastic_ip),
-                VmDetailsProperty(
-                    key="MAC Address", value=network_interface.mac_address
-                ),
                 VmDetailsProperty(
-                    key="NIC", value=network_interface.network_interface_id
+                    key="Elastic IP", value=self._is_elastic_ip_association(association)
                 ),
                 VmDetailsProperty(
-                    key="Device Index",
-                    value=network_interface.attachment.get("DeviceIndex"),
+                    key="MAC Address", value=network_interface.get("MacAddress")
                 ),
+                VmDetailsProperty(key="NIC", value=interface_id),
+                VmDetailsProperty(key="Device Index", value=device_index),
             ]
 
             current_interface = VmDetailsNetworkInterface(
-                interfaceId=network_interface.network_interface_id,
-                networkId=network_interface.subnet_id,
-                isPrimary=is_primary,
+                interfaceId=interface_id,
+                networkId=network_interface.get("SubnetId"),
+                isPrimary=device_index == 0,
                 networkData=network_data,
-                privateIpAddress=network_interface.private_ip_address,
+                privateIpAddress=private_ip,
                 publicIpAddress=public_ip,
             )
 
@@ -91,42 +144,18 @@ class VmDetailsProvider:
 
         return network_interfaces_results
 
-    def _calculate_public_ip(self, interface):
-        # interface has public ip if:
-        # a. is elastic ip
-        # b. not elastic, but primary and instance has public ip
-
-        if (
-            interface.association_attribute is not None
-            and "PublicIp" in interface.association_attribute
-        ):
-            return interface.association_attribute.get("PublicIp")
+    @staticmethod
+    def _get_public_ip_from_association(association: dict | None) -> str:
+        if association is not None and "PublicIp" in association:
+            return association.get("PublicIp")
         return ""
 
-    def _has_elastic_ip(self, interface):
+    @staticmethod
+    def _is_elastic_ip_association(association: dict | None) -> bool:
         # IpOwnerId: amazon - temporary public ip
         # IpOwnerId: some guid - elastic ip
         return (
-            interface.association_attribute is not None
-            and "IpOwnerId" in interface.association_attribute
-            and interface.association_attribute.get("IpOwnerId") != "amazon"
+            association is not None
+            and "IpOwnerId" in association
+            and association.get("IpOwnerId") != "amazon"
         )
-
-    def _is_primary_interface(self, interface):
-        return interface.attachment.get("DeviceIndex") == 0
-
-    @staticmethod
-    def _get_volume(instance):
-        return next((v for v in instance.volumes.all()), None)
-
-    def _get_availability_zone(self, instance):
-        return instance.placement.get("AvailabilityZone", None)
-
-    def _get_volume_size(self, volume):
-        return "{} {}".format(volume.size, "GiB") if volume else None
-
-    def _get_volume_type(self, volume):
-        return volume.volume_type if volume else None
-
-    def _get_volume_id(self, volume):
-        return volume.volume_id if volume else None
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 import attr
 
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 
     from cloudshell.cp.aws.domain.services.ec2.keypair import KeyPairService
     from cloudshell.cp.aws.domain.services.ec2.vpc import VPCService
+    from cloudshell.cp.aws.domain.services.ec2.warm_pool import WarmPoolService
     from cloudshell.cp.aws.models.aws_api import AwsApiClients
     from cloudshell.cp.aws.models.aws_ec2_cloud_provider_resource_model import (
         AWSEc2CloudProviderResourceModel,
@@ -21,6 +22,7 @@ if TYPE_CHECKING:
 class CleanupSandboxInfraOperation:
     vpc_service: "VPCService"
     key_pair_service: "KeyPairService"
+    warm_pool_service: "Optional[WarmPoolService]" = None
 
     def cleanup(
         self,
@@ -46,6 +48,9 @@ class CleanupSandboxInfraOperation:
         )
 
         try:
+            # replenishers launch instances in the subnets that are removed
+            if self.warm_pool_service:
+                self.warm_pool_service.stop_replenishers(reservation_id, logger)
             strategy.cleanup()
         except Exception as exc:
             logger.exception("Error in cleanup connectivity")
@@ -116,8 +116,7 @@ class PrepareSubnetExecutor:
         # create new subnet for the non-existing ones
         for item in action_items:
             self._step_create_new_subnet_if_needed(item, vpc, availability_zone)
-        for item in action_items:
-            self._step_wait_till_available(item)
+        self._step_wait_till_available(action_items)
 
         for item in action_items:
             self._step_set_tags(item)
@@ -209,12 +208,21 @@ class PrepareSubnetExecutor:
             )
             item.is_new_subnet = True
 
-    @step_wrapper
-    def _step_wait_till_available(self, item):
-        if item.is_new_subnet:
-            self.logger.info(f"Waiting for subnet {item.cidr} - start")
-            self.subnet_waiter.wait(item.subnet, self.subnet_waiter.AVAILABLE)
-            self.logger.info(f"Waiting for subnet {item.cidr} - end")
+    def _step_wait_till_available(self, action_items):
+        self.cancellation_service.check_if_cancelled(self.cancellation_context)
+        new_items = [i for i in action_items if i.is_new_subnet and not i.error]
+        if not new_items:
+            return
+        cidrs = ", ".join(item.cidr for item in new_items)
+        self.logger.info(f"Waiting for subnets {cidrs} - start")
+        errors = self.subnet_waiter.multi_wait(
+            [item.subnet for item in new_items],
+            self.subnet_waiter.AVAILABLE,
+            self.cancellation_context,
+        )
+        for item in new_items:
+            item.error = errors.get(item.subnet.subnet_id, item.error)
+        self.logger.info(f"Waiting for subnets {cidrs} - end")
 
     @step_wrapper
     def _step_set_tags(self, item):
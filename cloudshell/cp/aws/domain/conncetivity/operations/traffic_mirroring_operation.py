@@ -1,15 +1,12 @@
 import itertools
 import json
-import time
 from collections import defaultdict
 
 from jsonschema import validate
 
 from cloudshell.cp.core.models import RemoveTrafficMirroringResult
 
-from cloudshell.cp.aws.domain.common.CheckCancellationThread import (
-    CheckCancellationThread,
-)
+from cloudshell.cp.aws.domain.common.cancellation_service import CancellationToken
 from cloudshell.cp.aws.domain.conncetivity.operations.traffic_mirror_cleaner import (
     TrafficMirrorCleaner,
 )
@@ -41,15 +38,6 @@ class TrafficMirrorOperation:
         )  # type: TrafficMirrorService
         self._cancellation_service = cancellation_service
 
-    def _handle_cancellation(self, cancellation_context):
-        while True:
-            time.sleep(1)
-            cancelled = self._cancellation_service.check_if_cancelled(
-                cancellation_context
-            )
-            if cancelled:
-                raise Exception("User cancelled traffic mirroring")
-
     def create(
         self, ec2_client, reservation, actions, cancellation_context, logger, cloudshell
     ):
@@ -85,18 +73,19 @@ class TrafficMirrorOperation:
         )
 
         success = False
+        cancellation_token = CancellationToken.from_context(cancellation_context)
 
         try:
-            with CheckCancellationThread(
-                cancellation_context, self._cancellation_service
-            ):
-                logger.info("Getting or creating traffic mirror targets...")
-                self._get_or_create_targets(ec2_client, reservation, fulfillments)
+            logger.info("Getting or creating traffic mirror targets...")
+            self._get_or_create_targets(ec2_client, reservation, fulfillments)
+            self._cancellation_service.check_if_cancelled(cancellation_token)
 
-                logger.info("Creating traffic mirror filters and sessions...")
-                self._create_traffic_filters_and_sessions(ec2_client, fulfillments)
-                # self._get_or_create_sessions(ec2_client,
-                #                              fulfillments)
+            logger.info("Creating traffic mirror filters and sessions...")
+            self._create_traffic_filters_and_sessions(
+                ec2_client, fulfillments, cancellation_token
+            )
+            # self._get_or_create_sessions(ec2_client,
+            #                              fulfillments)
 
             success = True
             message = "Success"
@@ -141,11 +130,15 @@ class TrafficMirrorOperation:
             fulfillments,
         )
 
-    def _create_traffic_filters_and_sessions(self, ec2_client, fulfillments):
+    def _create_traffic_filters_and_sessions(
+        self, ec2_client, fulfillments, cancellation_token
+    ):
         """# noqa
         :param list[cloudshell.cp.aws.models.traffic_mirror_fulfillment.TrafficMirrorFulfillment] fulfillments:
+        :param cloudshell.cp.aws.domain.common.cancellation_service.CancellationToken cancellation_token:
         """
         for fulfillment in fulfillments:
+            self._cancellation_service.check_if_cancelled(cancellation_token)
             self._create_filter(ec2_client, fulfillment)
             fulfillment.mirror_session_id = self._create_session(
                 ec2_client, fulfillment
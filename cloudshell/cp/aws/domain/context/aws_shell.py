@@ -8,6 +8,9 @@ from cloudshell.shell.core.session.logging_session import LoggingSessionContext
 from cloudshell.cp.aws.domain.context.aws_api import AwsApiSessionContext
 from cloudshell.cp.aws.domain.context.aws_resource_model import AwsResourceModelContext
 from cloudshell.cp.aws.domain.services.parsers.aws_model_parser import AWSModelsParser
+from cloudshell.cp.aws.domain.services.session_providers.session_cache import (
+    is_credentials_error,
+)
 
 
 class AwsShellContext:
@@ -21,6 +24,7 @@ class AwsShellContext:
         self.aws_session_manager = aws_session_manager
         self.model_parser = AWSModelsParser()
         self._logger: Logger | None = None
+        self._shell_context: AwsShellContextModel | None = None
 
     def __enter__(self) -> AwsShellContextModel:
         """Initializes all aws shell context dependencies."""
@@ -35,16 +39,18 @@ class AwsShellContext:
                         cloudshell_session=cloudshell_session,
                         aws_ec2_resource_model=aws_ec2_resource_model,
                     ) as aws_api:
-                        return AwsShellContextModel(
+                        self._shell_context = AwsShellContextModel(
                             logger=logger,
                             cloudshell_session=cloudshell_session,
                             aws_ec2_resource_model=aws_ec2_resource_model,
                             aws_api=aws_api,
                         )
+                        return self._shell_context
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """# noqa
-        Called upon end of the context. Does nothing
+        Called upon end of the context. Drops cached AWS sessions if AWS
+        rejected their credentials
         :param exc_type: Exception type
         :param exc_val: Exception value
         :param exc_tb: Exception traceback
@@ -52,6 +58,16 @@ class AwsShellContext:
         """
         if self._logger and exc_type:
             self._logger.exception("Exception occurred in AwsShellContext")
+        if self._shell_context and is_credentials_error(exc_val):
+            self._logger.info("Invalidating cached AWS sessions")
+            # the original exception is more useful than a failed invalidation
+            try:
+                self.aws_session_manager.invalidate_sessions(
+                    cloudshell_session=self._shell_context.cloudshell_session,
+                    aws_ec2_data_model=self._shell_context.aws_ec2_resource_model,
+                )
+            except Exception:
+                self._logger.exception("Failed to invalidate cached AWS sessions")
 
 
 class AwsShellContextModel:
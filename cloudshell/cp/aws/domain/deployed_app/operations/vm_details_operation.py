@@ -1,14 +1,83 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from cloudshell.cp.core.models import VmDetailsData
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from mypy_boto3_ec2 import EC2Client  # noqa: I900
+
+    from cloudshell.shell.core.driver_context import CancellationContext
+
+    from cloudshell.cp.aws.models.vm_details import VmDetailsRequest
+
+
 class VmDetailsOperation:
-    def __init__(self, instance_service, vm_details_provider):
+    INSTANCE_NOT_FOUND_MSG = "Can't perform action. EC2 instance was terminated/removed"
+
+    def __init__(self, instance_service, vm_details_provider, ec2_storage_service):
         """# noqa
         :type instance_service: InstanceService
         :type vm_details_provider: VmDetailsProvider
+        :type ec2_storage_service: EC2StorageService
         """
         self.instance_service = instance_service
         self.vm_details_provider = vm_details_provider
+        self.ec2_storage_service = ec2_storage_service
 
     def get_vm_details(self, instance_id, ec2_session):
         instance = self.instance_service.get_active_instance_by_id(
             ec2_session, instance_id
         )
         return self.vm_details_provider.create(instance)
+
+    def get_vm_details_list(
+        self,
+        requests: list[VmDetailsRequest],
+        ec2_client: EC2Client,
+        cancellation_context: CancellationContext,
+        logger: Logger,
+    ) -> list[VmDetailsData]:
+        """Get vm details for all requested apps.
+
+        Instances and their root volumes are fetched with one describe call for
+        all apps, vm details are built from the fetched data.
+        """
+        if cancellation_context.is_cancelled:
+            return []
+
+        instance_ids = list({request.uuid for request in requests})
+        logger.info(f"Describing {len(instance_ids)} instances")
+        instances = self.instance_service.describe_instances(ec2_client, instance_ids)
+        volume_ids = list(
+            filter(
+                None,
+                map(self.vm_details_provider.get_root_volume_id, instances.values()),
+            )
+        )
+        volumes = self.ec2_storage_service.describe_volumes(ec2_client, volume_ids)
+
+        results = []
+        for request in requests:
+            if cancellation_context.is_cancelled:
+                break
+            try:
+                vm_details = self._get_vm_details_from_description(
+                    instances.get(request.uuid), volumes
+                )
+            except Exception as e:
+                logger.exception(f"Failed to get vm details for {request.app_name}")
+                vm_details = VmDetailsData()
+                vm_details.error = str(e)
+            vm_details.appName = request.app_name
+            results.append(vm_details)
+        return results
+
+    def _get_vm_details_from_description(
+        self, instance_data: dict | None, volumes: dict[str, dict]
+    ) -> VmDetailsData:
+        if not instance_data or instance_data["State"]["Name"] == "terminated":
+            raise Exception(self.INSTANCE_NOT_FOUND_MSG)
+        return self.vm_details_provider.create_from_description(instance_data, volumes)
@@ -80,9 +80,11 @@ class RouteTableHandler:
         cls, vpc: "Vpc", reservation: "ReservationModel", rt_name: str
     ) -> "RouteTableHandler":
         tags = TagsHandler.create_default_tags(rt_name, reservation)
-        rt = cls(vpc.create_route_table())
-        rt.add_tags(tags)
-        return rt
+        return cls(
+            vpc.create_route_table(
+                TagSpecifications=tags.get_tag_specifications("route-table")
+            )
+        )
 
     @classmethod
     def create_private_rt(
@@ -27,6 +27,7 @@ class TagName:
     IsPublic = "IsPublic"
     Isolation = "Isolation"
     Type = "Type"
+    WarmPool = "WarmPool"
 
 
 class IsolationTagValue(Enum):
@@ -69,8 +70,14 @@ class TagsHandler:
     def create_default_tags(
         cls, name: str, reservation: "ReservationModel"
     ) -> "TagsHandler":
+        tags = {TagName.Name: name}
+        tags.update(cls.create_reservation_tags(reservation)._tags_dict)
+        return cls(tags)
+
+    @classmethod
+    def create_reservation_tags(cls, reservation: "ReservationModel") -> "TagsHandler":
+        """Default tags without the Name, for resources named after creation."""
         tags = {
-            TagName.Name: name,
             TagName.CreatedBy: CREATED_BY_QUALI,
             TagName.Blueprint: reservation.blueprint,
             TagName.Owner: reservation.owner,
@@ -102,6 +109,13 @@ class TagsHandler:
     def aws_tags(self) -> List[Union["Ec2TagsType", "IamTagsType"]]:
         return [{"Key": key, "Value": value} for key, value in self._tags_dict.items()]
 
+    def get_tag_specifications(self, *resource_types: str) -> List[dict]:
+        """Returns TagSpecifications to tag resources in the create call."""
+        return [
+            {"ResourceType": resource_type, "Tags": self.aws_tags}
+            for resource_type in resource_types
+        ]
+
     def get(self, name: str) -> Optional[str]:
         return self._tags_dict.get(name)
 
@@ -151,3 +165,21 @@ class TagsHandler:
         except AttributeError:
             ec2 = aws_obj.meta.client
             ec2.create_tags(Resources=(aws_obj.id,), Tags=self.aws_tags)
+
+    def add_tags_to_resources(self, ec2_client, resource_ids: List[str]) -> None:
+        """Tags many EC2 resources with one call."""
+        try:
+            self._add_tags_to_resources(ec2_client, resource_ids)
+        except botocore.exceptions.ClientError as e:
+            if "notfound" in str(e).lower():
+                raise TagServiceCannotFindTheObject(resource_ids)
+            else:
+                raise
+
+    @retry(
+        wait_fixed=5 * 1000,
+        stop_max_delay=5 * 60 * 1000,
+        retry_on_exception=tag_service_cannot_find_obj,
+    )
+    def _add_tags_to_resources(self, ec2_client, resource_ids: List[str]) -> None:
+        ec2_client.create_tags(Resources=resource_ids, Tags=self.aws_tags)
@@ -1,5 +1,5 @@
-import time
 from enum import Enum
+from multiprocessing import TimeoutError  # noqa: A004
 from typing import TYPE_CHECKING, Generator, Optional
 
 import attr
@@ -7,6 +7,7 @@ from retrying import retry
 
 from cloudshell.cp.aws.common.cached_property import cached_property, invalidated_cache
 from cloudshell.cp.aws.domain.handlers.ec2 import TagsHandler
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter
 
 if TYPE_CHECKING:
     from logging import Logger
@@ -128,8 +129,14 @@ class VpcPeeringHandler:
         reservation: "ReservationModel",
         logger: "Logger",
     ) -> "VpcPeeringHandler":
+        connection_name = get_connection_name(reservation.reservation_id)
+        tags = TagsHandler.create_default_tags(connection_name, reservation)
         inst = cls(
-            ec2_session.create_vpc_peering_connection(VpcId=vpc_id1, PeerVpcId=vpc_id2)
+            ec2_session.create_vpc_peering_connection(
+                VpcId=vpc_id1,
+                PeerVpcId=vpc_id2,
+                TagSpecifications=tags.get_tag_specifications("vpc-peering-connection"),
+            )
         )
         logger.debug(f"VPC Peering created {inst.id}, Status: {inst.status.value}")
 
@@ -145,10 +152,6 @@ class VpcPeeringHandler:
         logger.debug(f"Waiting until VPC peering status will be {Status.ACTIVE}")
         inst.wait_until_status(Status.ACTIVE)
 
-        connection_name = get_connection_name(reservation.reservation_id)
-        tags = TagsHandler.create_default_tags(connection_name, reservation)
-        inst.add_tags(tags)
-
         return inst
 
     @property
@@ -194,19 +197,39 @@ class VpcPeeringHandler:
         delay: int = 10,
         timeout: int = 10 * 60,
         raise_on_error: bool = True,
+        initial_delay: float = 1,
     ):
-        start_time = time.time()
-        while self.status != status:
-            if raise_on_error and self.status in (
-                Status.REJECTED,
-                Status.FAILED,
-            ):
-                raise VpcPeeringConnectionFailedStatus(self.status, status)
-
-            if time.time() - start_time > timeout:
-                raise VpcPeeringConnectionWaitTimeout(self.status, status)
-            time.sleep(delay)
-            self.update()
+        """Polls the connection with growing delays until it gets the status.
+
+        :param delay: max seconds between polls
+        :param timeout: seconds until the timeout error is raised
+        :param initial_delay: seconds before the second poll
+        """
+        loaded = False
+
+        def is_in_status():
+            nonlocal loaded
+            # the first poll checks the status the connection already has
+            if loaded:
+                self.update()
+            loaded = True
+            current_status = self.status
+            if current_status is status:
+                return True
+            if raise_on_error and current_status in (Status.REJECTED, Status.FAILED):
+                raise VpcPeeringConnectionFailedStatus(current_status, status)
+            return False
+
+        waiter = BackoffWaiter(
+            name="vpc_peering",
+            initial_delay=initial_delay,
+            max_delay=delay,
+            timeout=timeout,
+        )
+        try:
+            waiter.wait(is_in_status, "")
+        except TimeoutError:
+            raise VpcPeeringConnectionWaitTimeout(self.status, status)
 
     @retry(stop_max_attempt_number=30, wait_fixed=1000)
     def accept_peering(self):
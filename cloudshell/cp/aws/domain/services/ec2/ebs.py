@@ -1,4 +1,12 @@
+from typing import Dict, List
+
+from cloudshell.cp.aws.domain.common.list_helper import chunks
+
+
 class EC2StorageService:
+    # max number of values in a describe filter
+    FILTER_VALUES_LIMIT = 200
+
     @staticmethod
     def get_available_volumes(ec2_session):
         available_volumes = ec2_session.volumes.filter(
@@ -23,3 +31,14 @@ class EC2StorageService:
         for volume in volumes:
             self.delete_volume(volume)
         return
+
+    def describe_volumes(self, ec2_client, volume_ids: List[str]) -> Dict[str, dict]:
+        """Returns DescribeVolumes data by volume id."""
+        paginator = ec2_client.get_paginator("describe_volumes")
+        volumes = {}
+        for ids in chunks(list(volume_ids), self.FILTER_VALUES_LIMIT):
+            pages = paginator.paginate(Filters=[{"Name": "volume-id", "Values": ids}])
+            for page in pages:
+                for volume_data in page["Volumes"]:
+                    volumes[volume_data["VolumeId"]] = volume_data
+        return volumes
@@ -1,6 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
-from typing import List
+from typing import List, Optional, Tuple
 
+from botocore.exceptions import ClientError
 from retrying import retry
 
 from cloudshell.cp.core.models import ConnectSubnet, ConnectToSubnetParams
@@ -12,6 +14,26 @@ from cloudshell.cp.aws.models.deploy_aws_ec2_ami_instance_resource_model import
 )
 from cloudshell.cp.aws.models.network_actions_models import DeployNetworkingResultModel
 
+# errors of resources that are not visible to the API yet after creation
+EVENTUAL_CONSISTENCY_ERROR_CODES = frozenset(
+    {
+        "InvalidAllocationID.NotFound",
+        "InvalidInstanceID.NotFound",
+        "InvalidNetworkInterfaceID.NotFound",
+    }
+)
+# network interfaces getting elastic ips at the same time
+ELASTIC_IPS_MAX_WORKERS = 4
+ASSOCIATION_NOT_FOUND = "InvalidAssociationID.NotFound"
+
+
+def is_eventual_consistency_error(exception: Exception) -> bool:
+    return (
+        isinstance(exception, ClientError)
+        and exception.response.get("Error", {}).get("Code")
+        in EVENTUAL_CONSISTENCY_ERROR_CODES
+    )
+
 
 class ElasticIpService:
     def __init__(self):
@@ -31,12 +53,14 @@ class ElasticIpService:
             return
 
         if self._is_single_subnet_mode(network_actions):
-            elastic_ip = self.allocate_elastic_address(ec2_client=ec2_client)
+            elastic_ip, allocation_id = self.allocate_address(ec2_client=ec2_client)
             # set elastic ip data in deploy result
             network_config_results[0].public_ip = elastic_ip
             network_config_results[0].is_elastic_ip = True
-            self.associate_elastic_ip_to_instance(
-                ec2_session=ec2_session, instance=instance, elastic_ip=elastic_ip
+            self.associate_address(
+                ec2_client=ec2_client,
+                allocation_id=allocation_id,
+                instance_id=instance.id,
             )
             logger.info(
                 f"Single subnet mode detected. Allocated & associated elastic ip "
@@ -45,6 +69,7 @@ class ElasticIpService:
             return
 
         # allocate elastic ip for each interface inside a public subnet
+        public_interfaces = []
         for action in network_actions:
             if (
                 not isinstance(action.actionParams, ConnectToSubnetParams)
@@ -63,22 +88,33 @@ class ElasticIpService:
                     instance.network_interfaces_attribute,
                 )
             )
+            public_interfaces.append((action_result, interface["NetworkInterfaceId"]))
 
-            # allocate and assign elastic ip
-            elastic_ip = self.allocate_elastic_address(ec2_client=ec2_client)
+        def set_elastic_ip(action_result, interface_id):
+            elastic_ip, allocation_id = self.allocate_address(ec2_client=ec2_client)
             action_result.public_ip = elastic_ip  # set elastic ip data in deploy result
             action_result.is_elastic_ip = True
-            interface_id = interface["NetworkInterfaceId"]
-            self.associate_elastic_ip_to_network_interface(
-                ec2_session=ec2_session,
-                interface_id=interface_id,
-                elastic_ip=elastic_ip,
+            self.associate_address(
+                ec2_client=ec2_client,
+                allocation_id=allocation_id,
+                network_interface_id=interface_id,
             )
             logger.info(
                 f"Multi-subnet mode detected. Allocated & associated elastic ip "
                 f"{elastic_ip} to interface {interface_id}"
             )
 
+        with ThreadPoolExecutor(
+            max_workers=ELASTIC_IPS_MAX_WORKERS, thread_name_prefix="elastic-ip"
+        ) as executor:
+            futures = [
+                executor.submit(set_elastic_ip, action_result, interface_id)
+                for action_result, interface_id in public_interfaces
+            ]
+        # all interfaces are done, allocated ips are in the results for the rollback
+        for future in futures:
+            future.result()
+
     def _is_single_subnet_mode(self, network_actions):
         # todo move code to networking service
         return network_actions is None or (
@@ -86,44 +122,36 @@ class ElasticIpService:
         )
 
     @retry(
-        retry_on_exception=retry_if_client_error,
-        stop_max_attempt_number=30,
-        wait_fixed=1000,
+        retry_on_exception=is_eventual_consistency_error,
+        wait_exponential_multiplier=500,
+        wait_exponential_max=5 * 1000,
+        stop_max_delay=60 * 1000,
     )
-    def associate_elastic_ip_to_instance(self, ec2_session, instance, elastic_ip: str):
-        """Assign an elastic ip to the primary interface.
-
-        and primary private ip of the given instance
+    def associate_address(
+        self,
+        ec2_client,
+        allocation_id: str,
+        instance_id: Optional[str] = None,
+        network_interface_id: Optional[str] = None,
+    ) -> str:
+        """Associates the allocated elastic ip to the instance or the interface.
+
+        Retries with a growing delay only while the new address, instance or
+        interface isn't visible to the API yet.
         """
-        response = list(ec2_session.vpc_addresses.filter(PublicIps=[elastic_ip]))
-        if len(response) == 1:
-            vpc_address = response[0]
-            vpc_address.associate(InstanceId=instance.id, AllowReassociation=False)
+        if instance_id:
+            target = {"InstanceId": instance_id}
         else:
-            raise ValueError(f"Failed to find elastic ip {elastic_ip} allocation id")
-
-    @retry(
-        retry_on_exception=retry_if_client_error,
-        stop_max_attempt_number=30,
-        wait_fixed=1000,
-    )
-    def associate_elastic_ip_to_network_interface(
-        self, ec2_session, interface_id: str, elastic_ip: str
-    ):
-        """Assign an elastic ip to a specific network interface."""
-        response = list(ec2_session.vpc_addresses.filter(PublicIps=[elastic_ip]))
-        if len(response) == 1:
-            vpc_address = response[0]
-            vpc_address.associate(
-                NetworkInterfaceId=interface_id, AllowReassociation=False
-            )
-        else:
-            raise ValueError(f"Failed to find elastic ip {elastic_ip} allocation id")
+            target = {"NetworkInterfaceId": network_interface_id}
+        response = ec2_client.associate_address(
+            AllocationId=allocation_id, AllowReassociation=False, **target
+        )
+        return response["AssociationId"]
 
-    def allocate_elastic_address(self, ec2_client) -> str:
-        """Return allocated elastic ip."""
+    def allocate_address(self, ec2_client) -> Tuple[str, str]:
+        """Return allocated elastic ip and its allocation id."""
         result = ec2_client.allocate_address(Domain="vpc")
-        return result["PublicIp"]
+        return result["PublicIp"], result["AllocationId"]
 
     @retry(
         retry_on_exception=retry_if_client_error,
@@ -134,9 +162,23 @@ class ElasticIpService:
         response = list(ec2_session.vpc_addresses.filter(PublicIps=[elastic_ip]))
         if len(response) == 1:
             vpc_address = response[0]
+            # the instance may be still running when the deploy is rolled back
+            if vpc_address.association_id:
+                self.disassociate_address(vpc_address)
             self.release_elastic_address(vpc_address)
         else:
             raise ValueError(f"Failed to find elastic ip {elastic_ip}")
 
     def release_elastic_address(self, vpc_address):
         vpc_address.release()
+
+    @staticmethod
+    def disassociate_address(vpc_address):
+        try:
+            vpc_address.meta.client.disassociate_address(
+                AssociationId=vpc_address.association_id
+            )
+        except ClientError as e:
+            # the terminated instance released the association
+            if e.response.get("Error", {}).get("Code") != ASSOCIATION_NOT_FOUND:
+                raise
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+import attr
+
+from cloudshell.cp.aws.domain.services.session_providers.session_cache import (
+    SessionKey,
+    _KeyLocks,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_ec2.service_resource import Image  # noqa: I900
+
+
+# minutes, 0 disables the cache
+IMAGE_CACHE_TTL = int(os.getenv("QS_AWS_IMAGE_CACHE_TTL", "10"))
+
+
+class ImageKey(NamedTuple):
+    # AMIs available for the region, credentials and assumed role of the session
+    session_key: SessionKey
+    image_id: str
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class ImageMetadata:
+    """Attributes of the AMI used in the deploy."""
+
+    image_id: str
+    state: str
+    root_device_name: str | None
+    block_device_mappings: list[dict]
+    platform: str | None
+
+    @classmethod
+    def from_image(cls, image: Image) -> ImageMetadata:
+        return cls(
+            image_id=image.image_id,
+            state=image.state,
+            root_device_name=image.root_device_name,
+            block_device_mappings=image.block_device_mappings,
+            platform=image.platform,
+        )
+
+
+class ImageMetadataCache:
+    def __init__(
+        self,
+        ttl: int = IMAGE_CACHE_TTL,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """Thread-safe cache of AMI attributes shared by deploys of the same image.
+
+        Only one thread describes the image for the key, others wait for it.
+        Errors aren't cached, so an image that isn't available is described
+        again by the next deploy.
+        :param ttl: time in minutes a value lives in the cache
+        :param timer: monotonic clock used to expire the values
+        """
+        self.ttl = ttl * 60
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._values: dict[ImageKey, tuple[ImageMetadata, float]] = {}
+        self._key_locks = _KeyLocks()
+
+    def get(self, key: ImageKey, load: Callable[[], ImageMetadata]) -> ImageMetadata:
+        if self.ttl <= 0:
+            return load()
+
+        with self._key_locks(key):
+            with self._lock:
+                value, expires_at = self._values.get(key, (None, 0))
+            if value is None or self._timer() >= expires_at:
+                value = load()
+                with self._lock:
+                    self._values[key] = value, self._timer() + self.ttl
+        return value
+
+    def invalidate(self, key: ImageKey | None = None) -> None:
+        """Removes the value for the key or all values if key isn't set."""
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+
+IMAGE_METADATA_CACHE = ImageMetadataCache()
@@ -1,9 +1,10 @@
-from typing import TYPE_CHECKING, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from retrying import retry
 
-from cloudshell.cp.aws.domain.handlers.ec2 import TagsHandler
-from cloudshell.cp.aws.models.reservation_model import ReservationModel
+from cloudshell.cp.aws.domain.common.list_helper import chunks
+from cloudshell.cp.aws.domain.handlers.ec2 import TagName, TagsHandler
 
 if TYPE_CHECKING:
     from logging import Logger
@@ -19,12 +20,18 @@ if TYPE_CHECKING:
     from cloudshell.cp.aws.domain.services.waiters.instance import InstanceWaiter
     from cloudshell.cp.aws.models.ami_deployment_model import AMIDeploymentModel
 
+# NICs of the instance modified at the same time
+NICS_MAX_WORKERS = 4
+
 
 def _retry_profile_not_found(exception: Exception) -> bool:
     return "iamInstanceProfile.name is invalid" in str(exception)
 
 
 class InstanceService:
+    # max number of values in a describe filter
+    FILTER_VALUES_LIMIT = 200
+
     def __init__(
         self,
         instance_waiter: "InstanceWaiter",
@@ -39,29 +46,64 @@ class InstanceService:
         wait_fixed=1000,  # 1 sec
         stop_max_delay=30 * 1000,  # 30 sec
     )
-    def create_instance(
+    def create_instances(
         self,
         ec2_session: "EC2ServiceResource",
         ami_deployment_info: "AMIDeploymentModel",
-    ) -> "Instance":
-        instance = ec2_session.create_instances(
+        count: Optional[int] = None,
+    ) -> List["Instance"]:
+        """Creates instances with the same params, count overrides min and max."""
+        return ec2_session.create_instances(
             ImageId=ami_deployment_info.aws_ami_id,
-            MinCount=ami_deployment_info.min_count,
-            MaxCount=ami_deployment_info.max_count,
+            MinCount=count or ami_deployment_info.min_count,
+            MaxCount=count or ami_deployment_info.max_count,
             InstanceType=ami_deployment_info.instance_type,
             KeyName=ami_deployment_info.aws_key,
             BlockDeviceMappings=ami_deployment_info.block_device_mappings,
             NetworkInterfaces=ami_deployment_info.network_interfaces,
             IamInstanceProfile=ami_deployment_info.iam_role,  # profile
             UserData=ami_deployment_info.user_data,
-        )[0]
-        return instance
+            TagSpecifications=ami_deployment_info.tags.get_tag_specifications(
+                "instance", "volume", "network-interface"
+            ),
+        )
+
+    def create_instance(
+        self,
+        ec2_session: "EC2ServiceResource",
+        ami_deployment_info: "AMIDeploymentModel",
+    ) -> "Instance":
+        return self.create_instances(ec2_session, ami_deployment_info)[0]
+
+    @retry(
+        # if we created a new profile, it takes time for aws to recognize it
+        retry_on_exception=_retry_profile_not_found,
+        wait_fixed=1000,  # 1 sec
+        stop_max_delay=30 * 1000,  # 30 sec
+    )
+    def associate_iam_instance_profile(
+        self, instance: "Instance", iam_role: Dict[str, str]
+    ):
+        """Associates the profile with the instance that was launched without it."""
+        instance.meta.client.associate_iam_instance_profile(
+            IamInstanceProfile=iam_role, InstanceId=instance.id
+        )
 
     def disable_source_dest_check(self, ec2_client: "EC2Client", instance: "Instance"):
-        for nic in instance.network_interfaces_attribute:
-            self.network_interface_service.disable_source_dest_check(
-                ec2_client, nic["NetworkInterfaceId"]
-            )
+        """Disables the check on all NICs of the instance at the same time."""
+        with ThreadPoolExecutor(
+            max_workers=NICS_MAX_WORKERS, thread_name_prefix="source-dest-check"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self.network_interface_service.disable_source_dest_check,
+                    ec2_client,
+                    nic["NetworkInterfaceId"],
+                )
+                for nic in instance.network_interfaces_attribute
+            ]
+        for future in futures:
+            future.result()
 
     def wait_for_instance_to_run_in_aws(
         self,
@@ -79,14 +121,42 @@ class InstanceService:
         )
 
         if wait_for_status_check:
-            self.instance_waiter.wait_status_ok(
+            self.wait_for_status_check(
                 ec2_client,
                 instance,
-                logger,
                 status_check_timeout,
                 cancellation_context,
+                logger,
             )
-            logger.info("Instance created with status: instance_status_ok.")
+
+    def wait_for_instances_to_run_in_aws(
+        self,
+        instances: List["Instance"],
+        cancellation_context: "CancellationContext",
+    ):
+        """Waits for all instances with one describe call per poll."""
+        self.instance_waiter.multi_wait(
+            instances,
+            self.instance_waiter.RUNNING,
+            cancellation_context,
+        )
+
+    def wait_for_status_check(
+        self,
+        ec2_client: "EC2Client",
+        instance: "Instance",
+        status_check_timeout: int,
+        cancellation_context: "CancellationContext",
+        logger: "Logger",
+    ):
+        self.instance_waiter.wait_status_ok(
+            ec2_client,
+            instance,
+            logger,
+            status_check_timeout,
+            cancellation_context,
+        )
+        logger.info("Instance created with status: instance_status_ok.")
 
     def terminate_instance(self, instance):
         return self.terminate_instances([instance])[0]
@@ -101,21 +171,17 @@ class InstanceService:
             instances, self.instance_waiter.TERMINATED
         )
 
-    def set_tags(
-        self,
-        instance: "Instance",
-        name: str,
-        reservation: "ReservationModel",
-        custom_tags: dict,
-    ):
+    def set_name_tag(self, instance: "Instance", name: str):
+        """Names the loaded instance and its volumes with one call."""
         # todo create the name with a name generator
         new_name = f"{name} {instance.instance_id}"
-        tags = TagsHandler.create_default_tags(new_name, reservation)
-        tags.update_tags(custom_tags)
-        tags.add_tags_to_obj(instance)
-
-        for volume in instance.volumes.all():
-            tags.add_tags_to_obj(volume)
+        volume_ids = [
+            device["Ebs"]["VolumeId"]
+            for device in instance.block_device_mappings or []
+            if "Ebs" in device
+        ]
+        tags = TagsHandler({TagName.Name: new_name})
+        tags.add_tags_to_resources(instance.meta.client, [instance.id, *volume_ids])
 
     @staticmethod
     def get_instance_by_id(ec2_session, id):  # noqa: A002
@@ -132,6 +198,25 @@ class InstanceService:
 
         return instance
 
+    @classmethod
+    def describe_instances(
+        cls, ec2_client: "EC2Client", instance_ids: List[str]
+    ) -> Dict[str, dict]:
+        """Returns DescribeInstances data by instance id.
+
+        Unlike InstanceIds param the filter doesn't fail the whole call when
+        one of the instances doesn't exist, it's just missing in the result.
+        """
+        paginator = ec2_client.get_paginator("describe_instances")
+        instances = {}
+        for ids in chunks(list(instance_ids), cls.FILTER_VALUES_LIMIT):
+            pages = paginator.paginate(Filters=[{"Name": "instance-id", "Values": ids}])
+            for page in pages:
+                for reservation in page["Reservations"]:
+                    for instance_data in reservation["Instances"]:
+                        instances[instance_data["InstanceId"]] = instance_data
+        return instances
+
     @staticmethod
     def get_all_instances(vpc: "Vpc") -> List["Instance"]:
         return list(vpc.instances.all())
@@ -31,11 +31,12 @@ class InstanceCredentialsService:
         :param instance: Ami amazon instance
         :param key_value: pem lines
         """
-        password_data = instance.password_data()["PasswordData"]  # todo returns bytes?
-        if not password_data and wait_for_password:
-            password_data = self.password_waiter.wait(  # todo bytes?
+        if wait_for_password:
+            password_data = self.password_waiter.wait(
                 instance=instance, cancellation_context=cancellation_context
             )
+        else:
+            password_data = self.password_waiter.get_password(instance)
 
         if not password_data:
             return None
@@ -157,10 +157,10 @@ class RouteTablesService:
         reservation: "ReservationModel",
         table_name: str,
     ) -> "RouteTable":
-        route_table = vpc.create_route_table()
         tags = self.tag_service.get_default_tags(table_name, reservation)
-        self.tag_service.set_ec2_resource_tags(route_table, tags)
-        return route_table
+        return vpc.create_route_table(
+            TagSpecifications=[{"ResourceType": "route-table", "Tags": tags}]
+        )
 
     def get_route_table(self, vpc: "Vpc", table_name: str) -> Optional["RouteTable"]:
         tag = self.tag_service.get_name_tag(table_name)
@@ -31,12 +31,19 @@ class SecurityGroupService:
 
     @staticmethod
     def create_security_group(
-        ec2_session: "EC2ServiceResource", vpc_id: str, security_group_name: str
+        ec2_session: "EC2ServiceResource",
+        vpc_id: str,
+        security_group_name: str,
+        tags: Optional[TagsHandler] = None,
     ) -> "SecurityGroup":
+        kwargs = {}
+        if tags:
+            kwargs["TagSpecifications"] = tags.get_tag_specifications("security-group")
         return ec2_session.create_security_group(
             GroupName=security_group_name,
             Description=SecurityGroupService.CLOUDSHELL_SECURITY_GROUP_DESCRIPTION,
             VpcId=vpc_id,
+            **kwargs,
         )
 
     @staticmethod
@@ -345,22 +352,19 @@ class SecurityGroupService:
             )
         )
 
-        # create a new security group in vpc
-        custom_security_group = self.create_security_group(
-            ec2_session, vpc_id, security_group_name
-        )
-
-        logger.info(f"Custom security group '{security_group_name}' created.")
-
-        # add tags to the created security group that will define it as a custom
-        # security group
+        # tags of the new security group define it as a custom security group
         tags = TagsHandler.create_security_group_tags(
             security_group_name,
             reservation,
             IsolationTagValue.EXCLUSIVE,
             TypeTagValue.INTERFACE,
         )
-        tags.add_tags_to_obj(custom_security_group)
+        # create a new security group in vpc
+        custom_security_group = self.create_security_group(
+            ec2_session, vpc_id, security_group_name, tags
+        )
+
+        logger.info(f"Custom security group '{security_group_name}' created.")
 
         # attach the custom security group to the nic
         custom_security_group_id = custom_security_group.group_id
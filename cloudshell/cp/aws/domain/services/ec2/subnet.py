@@ -20,8 +20,14 @@ class SubnetService:
         vpc: "Vpc",
         cidr: str,
         availability_zone: str,
+        tags: Optional[TagsHandler] = None,
     ):
-        return vpc.create_subnet(CidrBlock=cidr, AvailabilityZone=availability_zone)
+        kwargs = {}
+        if tags:
+            kwargs["TagSpecifications"] = tags.get_tag_specifications("subnet")
+        return vpc.create_subnet(
+            CidrBlock=cidr, AvailabilityZone=availability_zone, **kwargs
+        )
 
     def get_vpc_subnets(self, vpc: "Vpc") -> List["Subnet"]:
         subnets = list(vpc.subnets.all())
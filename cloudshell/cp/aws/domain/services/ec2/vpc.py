@@ -85,13 +85,14 @@ class VPCService:
         :type cidr: str
         :return: vpc
         """
-        vpc = ec2_session.create_vpc(CidrBlock=cidr)
+        vpc_name = self.VPC_RESERVATION.format(reservation.reservation_id)
+        tags = TagsHandler.create_default_tags(vpc_name, reservation)
+        vpc = ec2_session.create_vpc(
+            CidrBlock=cidr, TagSpecifications=tags.get_tag_specifications("vpc")
+        )
 
         self.vpc_waiter.wait(vpc=vpc, state=self.vpc_waiter.AVAILABLE)
 
-        vpc_name = self.VPC_RESERVATION.format(reservation.reservation_id)
-        self._set_tags(vpc_name=vpc_name, reservation=reservation, vpc=vpc)
-
         return vpc
 
     def find_vpc_for_reservation(
@@ -134,11 +135,6 @@ class VPCService:
                 raise
         return vpc
 
-    @staticmethod
-    def _set_tags(vpc_name: str, reservation: "ReservationModel", vpc: "Vpc"):
-        tags = TagsHandler.create_default_tags(vpc_name, reservation)
-        tags.add_tags_to_obj(vpc)
-
     def remove_all_internet_gateways(self, vpc: "Vpc"):
         """Removes all internet gateways from a VPC."""
         for igw in self.get_all_igws(vpc):
@@ -160,11 +156,11 @@ class VPCService:
         vpc: "Vpc",
         reservation: "ReservationModel",
     ) -> "InternetGateway":
-        igw = ec2_session.create_internet_gateway()
-
         igw_name = f"IGW {reservation.reservation_id}"
         tags = TagsHandler.create_default_tags(igw_name, reservation)
-        tags.add_tags_to_obj(igw)
+        igw = ec2_session.create_internet_gateway(
+            TagSpecifications=tags.get_tag_specifications("internet-gateway")
+        )
 
         vpc.attach_internet_gateway(InternetGatewayId=igw.id)
         return igw
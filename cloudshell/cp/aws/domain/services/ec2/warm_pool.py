@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from botocore.exceptions import ClientError
+
+from cloudshell.cp.aws.domain.common.cancellation_service import (
+    CancellationToken,
+    check_if_cancelled,
+)
+from cloudshell.cp.aws.domain.handlers.ec2 import TagName, TagsHandler
+from cloudshell.cp.aws.domain.services.session_providers.session_cache import _KeyLocks
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from mypy_boto3_ec2 import EC2ServiceResource  # noqa: I900
+    from mypy_boto3_ec2.service_resource import Instance  # noqa: I900
+
+    from cloudshell.cp.aws.domain.services.ec2.instance import InstanceService
+    from cloudshell.cp.aws.models.ami_deployment_model import AMIDeploymentModel
+
+
+# stopped instances kept in every pool, 0 disables the warm pool
+WARM_POOL_SIZE = int(os.getenv("QS_AWS_WARM_POOL_SIZE", "0"))
+# hours, older stopped pool instances are terminated by the reaper
+WARM_POOL_MAX_AGE = int(os.getenv("QS_AWS_WARM_POOL_MAX_AGE", "24"))
+# seconds the cleanup waits for the replenishers of the reservation
+REPLENISHER_STOP_TIMEOUT = 5 * 60
+
+# pool instances that are launched, but not ready to be claimed yet
+LAUNCHING_STATES = ("pending", "running", "stopping")
+STOPPED_STATE = "stopped"
+INCORRECT_STATE_ERROR_CODE = "IncorrectInstanceState"
+# NIC params that are the same for all sandboxes using the subnet
+POOL_NIC_PARAMS = ("SubnetId", "DeviceIndex", "AssociatePublicIpAddress")
+
+
+class WarmPoolService:
+    def __init__(
+        self,
+        instance_service: InstanceService,
+        size: int = WARM_POOL_SIZE,
+        max_age: int = WARM_POOL_MAX_AGE,
+    ):
+        """Stopped instances launched in advance and claimed by deploys.
+
+        A pool holds instances of the AMI, instance type, key pair and block
+        devices in the same region, VPC and subnets. EC2 sets the key pair only
+        at launch, so pool instances are launched with the reservation key pair
+        and the pool serves the sandboxes using it. The security groups of the
+        app, its IAM profile and tags are set on claim.
+        Apps with settings that can't be changed after the first boot aren't
+        pooled: fixed private IPs and user data.
+        The instances have the tags of the reservation that launched them, so
+        they are removed with its infra together with the subnets.
+        :param instance_service: launches, waits and starts pool instances
+        :param size: number of instances kept in every pool
+        :param max_age: hours a stopped instance stays in the pool
+        """
+        self.instance_service = instance_service
+        self.size = size
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._claimed_ids: set[str] = set()
+        self._key_locks = _KeyLocks()
+        self._replenishers: dict[
+            str, list[tuple[threading.Thread, CancellationToken]]
+        ] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def is_poolable(self, deployment_info: AMIDeploymentModel) -> bool:
+        """Returns True if the app can use a pool instance."""
+        return (
+            self.enabled
+            and not deployment_info.user_data
+            and not any(
+                "PrivateIpAddress" in nic for nic in deployment_info.network_interfaces
+            )
+        )
+
+    @staticmethod
+    def get_pool_key(
+        ec2_session: EC2ServiceResource,
+        vpc_id: str,
+        deployment_info: AMIDeploymentModel,
+    ) -> str:
+        """Returns the same key for deployments that can share pool instances."""
+        subnet_ids = [
+            nic["SubnetId"]
+            for nic in sorted(
+                deployment_info.network_interfaces, key=lambda x: x["DeviceIndex"]
+            )
+        ]
+        params = json.dumps(
+            [
+                deployment_info.aws_ami_id,
+                deployment_info.instance_type,
+                ec2_session.meta.client.meta.region_name,
+                vpc_id,
+                subnet_ids,
+                # the key pair can't be changed on claim
+                deployment_info.aws_key,
+                # volumes can't be changed on claim
+                deployment_info.block_device_mappings,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(params.encode()).hexdigest()
+
+    def claim(
+        self, ec2_session: EC2ServiceResource, pool_key: str, logger: Logger
+    ) -> Instance | None:
+        """Starts a stopped instance of the pool and takes it out of the pool.
+
+        Deploys in other processes can claim the same instance, only the one
+        that starts it from the stopped state gets it.
+        """
+        for instance in self._get_pool_instances(
+            ec2_session, pool_key, [STOPPED_STATE]
+        ):
+            with self._lock:
+                if instance.id in self._claimed_ids:
+                    continue
+                self._claimed_ids.add(instance.id)
+            if self._start_if_stopped(instance):
+                logger.info(f"Claimed the warm pool instance {instance.id}")
+                instance.delete_tags(Tags=[{"Key": TagName.WarmPool}])
+                return instance
+            logger.info(f"The warm pool instance {instance.id} was claimed by another")
+
+        logger.info("No stopped instances in the warm pool")
+        return None
+
+    def apply_claimed(
+        self, instance: Instance, deployment_info: AMIDeploymentModel
+    ) -> None:
+        """Applies the security groups, tags and profile of the app to the instance."""
+        ec2_client = instance.meta.client
+        groups_by_device_index = {
+            str(nic["DeviceIndex"]): nic.get("Groups")
+            for nic in deployment_info.network_interfaces
+        }
+        nic_ids = []
+        for nic in instance.network_interfaces_attribute:
+            nic_ids.append(nic["NetworkInterfaceId"])
+            groups = groups_by_device_index.get(str(nic["Attachment"]["DeviceIndex"]))
+            if groups:
+                ec2_client.modify_network_interface_attribute(
+                    NetworkInterfaceId=nic["NetworkInterfaceId"], Groups=groups
+                )
+
+        # tags of the reservation that launched the instance are replaced, the
+        # pool tag is removed by the claim
+        tag_keys = {
+            TagName.WarmPool,
+            *(t["Key"] for t in deployment_info.tags.aws_tags),
+        }
+        stale_tags = [
+            {"Key": tag["Key"]}
+            for tag in instance.tags or []
+            if tag["Key"] not in tag_keys
+        ]
+        if stale_tags:
+            instance.delete_tags(Tags=stale_tags)
+        volume_ids = [
+            device["Ebs"]["VolumeId"]
+            for device in instance.block_device_mappings or []
+            if "Ebs" in device
+        ]
+        deployment_info.tags.add_tags_to_resources(
+            ec2_client, [instance.id, *volume_ids, *nic_ids]
+        )
+        if deployment_info.iam_role:
+            self.instance_service.associate_iam_instance_profile(
+                instance, deployment_info.iam_role
+            )
+
+    def replenish_in_background(
+        self,
+        ec2_session: EC2ServiceResource,
+        pool_key: str,
+        deployment_info: AMIDeploymentModel,
+        exclusive_group_ids: list[str],
+        reservation_id: str,
+        logger: Logger,
+    ) -> threading.Thread:
+        """Replenishes the pool in a thread stopped by the reservation cleanup."""
+        cancellation_token = CancellationToken()
+        thread = threading.Thread(
+            target=self._replenish_safe,
+            args=(
+                ec2_session,
+                pool_key,
+                deployment_info,
+                exclusive_group_ids,
+                reservation_id,
+                cancellation_token,
+                logger,
+            ),
+            name="warm-pool-replenisher",
+            daemon=True,
+        )
+        with self._lock:
+            self._replenishers.setdefault(reservation_id, []).append(
+                (thread, cancellation_token)
+            )
+        thread.start()
+        return thread
+
+    def stop_replenishers(
+        self,
+        reservation_id: str,
+        logger: Logger,
+        timeout: float = REPLENISHER_STOP_TIMEOUT,
+    ) -> None:
+        """Cancels the replenishers of the reservation and waits for them.
+
+        Instances they launched and didn't stop yet are terminated.
+        :param timeout: seconds to wait for all replenishers
+        """
+        with self._lock:
+            replenishers = self._replenishers.pop(reservation_id, [])
+        for _, cancellation_token in replenishers:
+            cancellation_token.cancel()
+        deadline = time.monotonic() + timeout
+        for thread, _ in replenishers:
+            thread.join(max(deadline - time.monotonic(), 0))
+        running = [thread.name for thread, _ in replenishers if thread.is_alive()]
+        if running:
+            logger.warning(
+                f"{len(running)} warm pool replenisher(s) didn't stop in {timeout}s"
+            )
+
+    def _replenish_safe(
+        self,
+        ec2_session,
+        pool_key,
+        deployment_info,
+        exclusive_group_ids,
+        reservation_id,
+        cancellation_token,
+        logger,
+    ) -> None:
+        try:
+            self.replenish(
+                ec2_session,
+                pool_key,
+                deployment_info,
+                exclusive_group_ids,
+                logger,
+                cancellation_token,
+            )
+        except Exception:
+            if cancellation_token.is_cancelled:
+                logger.info("Stopped replenishing the warm pool")
+            else:
+                logger.exception("Failed to replenish the warm pool")
+        finally:
+            with self._lock:
+                replenishers = self._replenishers.get(reservation_id, [])
+                self._replenishers[reservation_id] = [
+                    x for x in replenishers if x[1] is not cancellation_token
+                ]
+                if not self._replenishers[reservation_id]:
+                    del self._replenishers[reservation_id]
+
+    def replenish(
+        self,
+        ec2_session: EC2ServiceResource,
+        pool_key: str,
+        deployment_info: AMIDeploymentModel,
+        exclusive_group_ids: list[str],
+        logger: Logger,
+        cancellation_context: CancellationToken | None = None,
+    ) -> None:
+        """Launches missing pool instances and stops them when they're ready.
+
+        :param exclusive_group_ids: groups of the app that aren't used by
+            pool instances, they are deleted with the app
+        :param cancellation_context: stops the replenishing, launched instances
+            are terminated
+        """
+        self.reap(ec2_session, logger)
+
+        # only one thread launches instances for the pool
+        with self._key_locks(pool_key):
+            check_if_cancelled(cancellation_context)
+            instances = self._get_pool_instances(
+                ec2_session, pool_key, [STOPPED_STATE, *LAUNCHING_STATES]
+            )
+            with self._lock:
+                count = len([i for i in instances if i.id not in self._claimed_ids])
+            missing = self.size - count
+            if missing <= 0:
+                return
+
+            logger.info(f"Launching {missing} warm pool instance(s)")
+            pool_info = self._create_pool_deployment_info(
+                deployment_info, pool_key, exclusive_group_ids
+            )
+            new_instances = self.instance_service.create_instances(
+                ec2_session, pool_info, count=missing
+            )
+            try:
+                self.instance_service.wait_for_instances_to_run_in_aws(
+                    new_instances, cancellation_context
+                )
+                # the first boot is done before the instance is stopped
+                for instance in new_instances:
+                    self.instance_service.wait_for_status_check(
+                        instance.meta.client,
+                        instance,
+                        0,
+                        cancellation_context,
+                        logger,
+                    )
+            except Exception:
+                for instance in new_instances:
+                    instance.terminate()
+                raise
+            for instance in new_instances:
+                instance.stop()
+
+    def reap(self, ec2_session: EC2ServiceResource, logger: Logger) -> None:
+        """Terminates stopped pool instances older than the max age."""
+        expired_before = datetime.now(timezone.utc) - timedelta(hours=self.max_age)
+        instances = ec2_session.instances.filter(
+            Filters=[
+                {"Name": "tag-key", "Values": [TagName.WarmPool]},
+                {"Name": "instance-state-name", "Values": [STOPPED_STATE]},
+            ]
+        )
+        with self._lock:
+            expired = [
+                instance
+                for instance in instances
+                if instance.launch_time < expired_before
+                and instance.id not in self._claimed_ids
+            ]
+            # terminated instances can't be claimed
+            self._claimed_ids.update(instance.id for instance in expired)
+        for instance in expired:
+            logger.info(f"Terminating the expired warm pool instance {instance.id}")
+            instance.terminate()
+
+    @staticmethod
+    def _start_if_stopped(instance: Instance) -> bool:
+        """Starts the instance, returns False if it wasn't stopped.
+
+        StartInstances changes the state at once, so only one of concurrent
+        calls gets the stopped previous state.
+        """
+        try:
+            response = instance.meta.client.start_instances(InstanceIds=[instance.id])
+        except ClientError as e:
+            # the instance is being terminated by the reaper
+            if e.response.get("Error", {}).get("Code") == INCORRECT_STATE_ERROR_CODE:
+                return False
+            raise
+        previous_state = response["StartingInstances"][0]["PreviousState"]["Name"]
+        return previous_state == STOPPED_STATE
+
+    @staticmethod
+    def _get_pool_instances(
+        ec2_session: EC2ServiceResource, pool_key: str, states: list[str]
+    ) -> list[Instance]:
+        return list(
+            ec2_session.instances.filter(
+                Filters=[
+                    {"Name": f"tag:{TagName.WarmPool}", "Values": [pool_key]},
+                    {"Name": "instance-state-name", "Values": states},
+                ]
+            )
+        )
+
+    @staticmethod
+    def _create_pool_deployment_info(
+        deployment_info: AMIDeploymentModel,
+        pool_key: str,
+        exclusive_group_ids: list[str],
+    ) -> AMIDeploymentModel:
+        pool_info = copy.copy(deployment_info)
+        # fixed private ips would collide with the apps, the groups of the app
+        # are set on claim
+        pool_info.network_interfaces = [
+            {
+                **{key: nic[key] for key in POOL_NIC_PARAMS if key in nic},
+                "Groups": [
+                    group_id
+                    for group_id in nic.get("Groups", [])
+                    if group_id not in exclusive_group_ids
+                ],
+            }
+            for nic in deployment_info.network_interfaces
+        ]
+        # the profile is associated on claim
+        pool_info.iam_role = {}
+        pool_info.user_data = ""
+        pool_info.tags = TagsHandler.from_tags_list(deployment_info.tags.aws_tags)
+        pool_info.tags.update_tags(
+            {TagName.Name: "Warm pool instance", TagName.WarmPool: pool_key}
+        )
+        return pool_info
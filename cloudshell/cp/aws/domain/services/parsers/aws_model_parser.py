@@ -155,6 +155,20 @@ class AWSModelsParser:
             )
         return public_ip_attr, public_ip_on_resource
 
+    @staticmethod
+    def get_credentials_attrs_from_connected_resource_details(resource_context):
+        """Returns names of the user and password attributes with namespaces."""
+        user_attr, password_attr = "User", "Password"
+        if resource_context.remote_endpoints is not None:
+            attributes = resource_context.remote_endpoints[0].attributes
+            user_attr, _ = AWSModelsParser.get_attribute_tuple_ignoring_namespace(
+                attributes, user_attr
+            )
+            password_attr, _ = AWSModelsParser.get_attribute_tuple_ignoring_namespace(
+                attributes, password_attr
+            )
+        return user_attr, password_attr
+
     @staticmethod
     def get_private_ip_from_connected_resource_details(resource_context):
         private_ip_on_resource = ""
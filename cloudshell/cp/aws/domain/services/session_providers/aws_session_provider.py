@@ -1,11 +1,26 @@
+from __future__ import annotations
+
 import configparser
 import os
 from typing import TYPE_CHECKING
 
 import boto3
+import botocore.session
+from botocore.credentials import RefreshableCredentials
 
 from cloudshell.api.cloudshell_api import CloudShellAPISession
 
+from cloudshell.cp.aws.domain.services.session_providers.session_cache import (
+    ASSUME_ROLE_CACHE,
+    DECRYPTED_PASSWORDS_CACHE,
+    SESSION_CACHE,
+    AssumeRoleCredentialsCache,
+    AwsSessionCache,
+    CachedSession,
+    DecryptedPasswordsCache,
+    SessionKey,
+    get_credentials_fingerprint,
+)
 from cloudshell.cp.aws.models.aws_api import AwsApiClients
 from cloudshell.cp.aws.models.aws_ec2_cloud_provider_resource_model import VpcMode
 
@@ -20,7 +35,15 @@ class AWSSessionProvider:
     S3 = "s3"
     IAM = "iam"
 
-    def __init__(self):
+    def __init__(
+        self,
+        session_cache: AwsSessionCache | None = None,
+        assume_role_cache: AssumeRoleCredentialsCache | None = None,
+        passwords_cache: DecryptedPasswordsCache | None = None,
+    ):
+        self.session_cache = session_cache or SESSION_CACHE
+        self.assume_role_cache = assume_role_cache or ASSUME_ROLE_CACHE
+        self.passwords_cache = passwords_cache or DECRYPTED_PASSWORDS_CACHE
         self.test_cred_path = os.path.join(os.path.dirname(__file__), "test_cred.ini")
         if not os.path.isfile(self.test_cred_path):
             self.test_cred_path = ""
@@ -34,27 +57,12 @@ class AWSSessionProvider:
         if not default_session:
             raise ValueError("Could not create AWS Session")
 
-        if aws_ec2_data_model.vpc_mode == VpcMode.SHARED:
-            aws_ec2_session = self._assume_shared_vpc_role(
-                default_session, aws_ec2_data_model
-            )
-        elif (
-            aws_ec2_data_model.vpc_mode == VpcMode.PREDEFINED
-            and aws_ec2_data_model.shared_vpc_role_arn
-        ):
-            aws_ec2_session = self._assume_shared_vpc_role(
-                default_session, aws_ec2_data_model
-            )
-        else:
-            aws_ec2_session = default_session
-
-        return AwsApiClients(
-            ec2_session=aws_ec2_session.resource(self.EC2),
-            s3_session=default_session.resource(self.S3),
-            ec2_client=aws_ec2_session.client(self.EC2),
-            default_ec2_session=default_session.resource(self.EC2),
-            iam_client=aws_ec2_session.client(self.IAM),
-        )
+        def get_aws_ec2_session() -> CachedSession:
+            if self._is_shared_vpc_role_used(aws_ec2_data_model):
+                return self._get_shared_vpc_session(default_session, aws_ec2_data_model)
+            return default_session
+
+        return AwsApiClients(default_session, get_aws_ec2_session)
 
     def get_s3_session(self, cloudshell_session, aws_ec2_data_model):
         aws_session = self._get_aws_session(aws_ec2_data_model, cloudshell_session)
@@ -77,14 +85,63 @@ class AWSSessionProvider:
             raise ValueError("Could not create AWS Client")
         return aws_session.client(self.EC2)
 
+    def invalidate_sessions(
+        self,
+        cloudshell_session: "CloudShellAPISession",
+        aws_ec2_data_model: "AWSEc2CloudProviderResourceModel",
+    ) -> None:
+        """Removes cached sessions, e.g. when AWS rejected their credentials."""
+        credentials = self._get_aws_credentials(cloudshell_session, aws_ec2_data_model)
+        key = self._get_session_key(aws_ec2_data_model, credentials)
+        self.session_cache.invalidate(key)
+        if aws_ec2_data_model.shared_vpc_role_arn:
+            role_key = key._replace(role_arn=aws_ec2_data_model.shared_vpc_role_arn)
+            self.session_cache.invalidate(role_key)
+            self.assume_role_cache.invalidate(role_key)
+
+    @staticmethod
+    def _is_shared_vpc_role_used(
+        aws_ec2_data_model: "AWSEc2CloudProviderResourceModel",
+    ) -> bool:
+        return aws_ec2_data_model.vpc_mode == VpcMode.SHARED or (
+            aws_ec2_data_model.vpc_mode == VpcMode.PREDEFINED
+            and bool(aws_ec2_data_model.shared_vpc_role_arn)
+        )
+
+    @staticmethod
+    def _get_session_key(
+        aws_ec2_data_model: "AWSEc2CloudProviderResourceModel", credentials
+    ) -> SessionKey:
+        if credentials:
+            fingerprint = get_credentials_fingerprint(
+                credentials.access_key_id, credentials.secret_access_key
+            )
+        else:
+            fingerprint = ""
+        return SessionKey(aws_ec2_data_model.region, fingerprint)
+
     def _get_aws_session(
         self,
         aws_ec2_data_model: "AWSEc2CloudProviderResourceModel",
         cloudshell_session: "CloudShellAPISession",
-    ):
+    ) -> CachedSession:
         credentials = self._get_aws_credentials(cloudshell_session, aws_ec2_data_model)
-        aws_session = self._create_aws_session(aws_ec2_data_model, credentials)
-        return aws_session
+        return self.session_cache.get(
+            self._get_session_key(aws_ec2_data_model, credentials),
+            lambda: self._create_aws_session(aws_ec2_data_model, credentials),
+        )
+
+    def _get_shared_vpc_session(
+        self,
+        default_session: CachedSession,
+        aws_ec2_data_model: "AWSEc2CloudProviderResourceModel",
+    ) -> CachedSession:
+        return self.session_cache.get(
+            default_session.key._replace(
+                role_arn=aws_ec2_data_model.shared_vpc_role_arn
+            ),
+            lambda: self._assume_shared_vpc_role(default_session, aws_ec2_data_model),
+        )
 
     @staticmethod
     def _create_aws_session(aws_ec2_data_model, credentials):
@@ -98,24 +155,52 @@ class AWSSessionProvider:
             )
         return aws_session
 
-    @staticmethod
     def _assume_shared_vpc_role(
-        aws_session, aws_ec2_data_model: "AWSEc2CloudProviderResourceModel"
+        self,
+        aws_session: CachedSession,
+        aws_ec2_data_model: "AWSEc2CloudProviderResourceModel",
     ):
+        """Creates a session with the Shared role credentials.
+
+        Credentials are taken from the assume role cache and botocore renews them
+        before they expire, so the session can outlive the temporary credentials.
+        """
+        key = aws_session.key._replace(role_arn=aws_ec2_data_model.shared_vpc_role_arn)
+
+        def get_credentials_metadata():
+            credentials = self.assume_role_cache.get(
+                key, lambda: self._call_assume_role(aws_session, aws_ec2_data_model)
+            )
+            return {
+                "access_key": credentials["AccessKeyId"],
+                "secret_key": credentials["SecretAccessKey"],
+                "token": credentials["SessionToken"],
+                "expiry_time": credentials["Expiration"].isoformat(),
+            }
+
+        botocore_session = botocore.session.get_session()
+        # botocore doesn't have a public setter for refreshable credentials
+        botocore_session._credentials = RefreshableCredentials.create_from_metadata(
+            metadata=get_credentials_metadata(),
+            refresh_using=get_credentials_metadata,
+            method="assume-role",
+        )
+        return boto3.Session(
+            botocore_session=botocore_session, region_name=aws_ec2_data_model.region
+        )
+
+    @staticmethod
+    def _call_assume_role(
+        aws_session: CachedSession,
+        aws_ec2_data_model: "AWSEc2CloudProviderResourceModel",
+    ) -> dict:
         endpoint_url = f"https://sts.{aws_ec2_data_model.region}.amazonaws.com"
         sts = aws_session.client("sts", endpoint_url=endpoint_url)
         data = sts.assume_role(
             RoleArn=aws_ec2_data_model.shared_vpc_role_arn,
             RoleSessionName="CS-SharedVPC-Session",
         )
-        credentials = data["Credentials"]
-        session = boto3.Session(
-            aws_access_key_id=credentials["AccessKeyId"],
-            aws_secret_access_key=credentials["SecretAccessKey"],
-            aws_session_token=credentials["SessionToken"],
-            region_name=aws_ec2_data_model.region,
-        )
-        return session
+        return data["Credentials"]
 
     def _get_aws_credentials(self, cloudshell_session=None, aws_ec2_data_model=None):
         if self.test_cred_path:
@@ -144,9 +229,10 @@ class AWSSessionProvider:
             config.get("Credentials", "Secret Access Key"),
         )
 
-    @staticmethod
-    def _decrypt_key(cloudshell_session, field):
-        return cloudshell_session.DecryptPassword(field).Value
+    def _decrypt_key(self, cloudshell_session, field):
+        return self.passwords_cache.get(
+            field, lambda: cloudshell_session.DecryptPassword(field).Value
+        )
 
 
 class AWSCredentials:
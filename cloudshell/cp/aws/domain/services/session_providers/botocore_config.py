@@ -0,0 +1,38 @@
+import os
+
+from botocore.config import Config
+
+MAX_POOL_CONNECTIONS = int(os.getenv("QS_AWS_MAX_POOL_CONNECTIONS", "50"))
+RETRY_MODE = os.getenv("QS_AWS_RETRY_MODE", "adaptive")
+MAX_ATTEMPTS = int(os.getenv("QS_AWS_MAX_ATTEMPTS", "10"))
+CONNECT_TIMEOUT = int(os.getenv("QS_AWS_CONNECT_TIMEOUT", "10"))  # seconds
+READ_TIMEOUT = int(os.getenv("QS_AWS_READ_TIMEOUT", "60"))  # seconds
+TCP_KEEPALIVE = os.getenv("QS_AWS_TCP_KEEPALIVE", "true").lower() == "true"
+
+
+def create_botocore_config(
+    max_pool_connections: int = MAX_POOL_CONNECTIONS,
+    retry_mode: str = RETRY_MODE,
+    max_attempts: int = MAX_ATTEMPTS,
+    connect_timeout: int = CONNECT_TIMEOUT,
+    read_timeout: int = READ_TIMEOUT,
+    tcp_keepalive: bool = TCP_KEEPALIVE,
+) -> Config:
+    """Transport settings for all EC2, S3, IAM and STS clients.
+
+    The default pool of 10 connections and legacy retries throttle the driver
+    when it runs many AWS calls concurrently.
+    """
+    kwargs = {
+        "max_pool_connections": max_pool_connections,
+        "retries": {"mode": retry_mode, "max_attempts": max_attempts},
+        "connect_timeout": connect_timeout,
+        "read_timeout": read_timeout,
+    }
+    # tcp_keepalive is supported since botocore 1.27
+    if tcp_keepalive and "tcp_keepalive" in Config.OPTION_DEFAULTS:
+        kwargs["tcp_keepalive"] = True
+    return Config(**kwargs)
+
+
+BOTOCORE_CONFIG = create_botocore_config()
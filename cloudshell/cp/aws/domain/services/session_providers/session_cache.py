@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+from botocore.exceptions import ClientError, NoCredentialsError
+
+from cloudshell.cp.aws.domain.services.session_providers.botocore_config import (
+    BOTOCORE_CONFIG,
+)
+
+if TYPE_CHECKING:
+    from boto3.session import Session
+    from botocore.config import Config
+
+
+# minutes, 0 disables the cache
+SESSION_CACHE_TTL = int(os.getenv("QS_AWS_SESSION_CACHE_TTL", "30"))
+# minutes, 0 disables the cache
+DECRYPTED_PASSWORDS_CACHE_TTL = int(
+    os.getenv("QS_AWS_DECRYPTED_PASSWORDS_CACHE_TTL", "30")
+)
+DECRYPTED_PASSWORDS_CACHE_SIZE = 128
+# minutes before expiration when assumed role credentials are renewed, it matches
+# the botocore advisory refresh timeout
+ASSUME_ROLE_REFRESH_MARGIN = 15
+
+CREDENTIALS_ERROR_CODES = frozenset(
+    {
+        "AuthFailure",
+        "AuthorizationHeaderMalformed",
+        "ExpiredToken",
+        "ExpiredTokenException",
+        "InvalidAccessKeyId",
+        "InvalidClientTokenId",
+        "SignatureDoesNotMatch",
+        "UnrecognizedClientException",
+    }
+)
+
+
+def is_credentials_error(exception: BaseException | None) -> bool:
+    if isinstance(exception, NoCredentialsError):
+        return True
+    if isinstance(exception, ClientError):
+        error_code = exception.response.get("Error", {}).get("Code")
+        return error_code in CREDENTIALS_ERROR_CODES
+    return False
+
+
+def get_credentials_fingerprint(access_key_id: str, secret_access_key: str) -> str:
+    """Identifies credentials in the cache key without keeping them in plain text."""
+    data = f"{access_key_id}:{secret_access_key}".encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+class _KeyLocks:
+    """Locks that let only one thread at a time load a value for the key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks = {}
+
+    def __call__(self, key) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+
+class SessionKey(NamedTuple):
+    region: str
+    credentials_fingerprint: str
+    role_arn: str = ""
+
+
+class CachedSession:
+    def __init__(
+        self,
+        key: SessionKey,
+        session: Session,
+        expires_at: float,
+        config: Config | None = None,
+    ):
+        """Boto3 session with the clients and resources created from it.
+
+        Clients are thread safe and shared between commands. Resources are not
+        thread safe, so every call returns a new resource object that uses the
+        shared client of the service.
+        :param config: botocore config used for all clients
+        """
+        self.key = key
+        self.session = session
+        self.expires_at = expires_at
+        self.config = config
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._resources = {}
+
+    def client(self, service_name: str, **kwargs):
+        client_key = (service_name, tuple(sorted(kwargs.items())))
+        with self._lock:
+            client = self._clients.get(client_key)
+            if client is None:
+                client = self.session.client(service_name, config=self.config, **kwargs)
+                self._clients[client_key] = client
+        return client
+
+    def resource(self, service_name: str):
+        with self._lock:
+            resource = self._resources.get(service_name)
+            if resource is None:
+                resource = self.session.resource(service_name, config=self.config)
+                self._resources[service_name] = resource
+                # share the resource's client instead of creating another one
+                self._clients.setdefault((service_name, ()), resource.meta.client)
+        return type(resource)(client=self.client(service_name))
+
+    def is_expired(self, now: float) -> bool:
+        return now >= self.expires_at
+
+
+class AwsSessionCache:
+    def __init__(
+        self,
+        ttl: int = SESSION_CACHE_TTL,
+        timer: Callable[[], float] = time.monotonic,
+        config: Config | None = BOTOCORE_CONFIG,
+    ):
+        """Thread-safe cache of boto3 sessions and their clients.
+
+        :param ttl: time in minutes a session lives in the cache
+        :param timer: monotonic clock used to expire the sessions
+        :param config: botocore config used for all clients
+        """
+        self.ttl = ttl * 60
+        self.config = config
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._sessions: dict[SessionKey, CachedSession] = {}
+        self._key_locks = _KeyLocks()
+
+    def get(
+        self, key: SessionKey, session_factory: Callable[[], Session]
+    ) -> CachedSession:
+        """Returns the cached session or creates it with the session factory.
+
+        Only one thread creates a session for the key, others wait for it.
+        """
+        if self.ttl <= 0:
+            return CachedSession(key, session_factory(), self._timer(), self.config)
+
+        with self._key_locks(key):
+            cached = self._sessions.get(key)
+            if cached is None or cached.is_expired(self._timer()):
+                session = session_factory()
+                expires_at = self._timer() + self.ttl
+                cached = CachedSession(key, session, expires_at, self.config)
+                with self._lock:
+                    self._sessions[key] = cached
+        return cached
+
+    def invalidate(self, key: SessionKey | None = None) -> None:
+        """Removes the session for the key or all sessions if key isn't set."""
+        with self._lock:
+            if key is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(key, None)
+
+
+class AssumeRoleCredentialsCache:
+    def __init__(
+        self,
+        refresh_margin: int = ASSUME_ROLE_REFRESH_MARGIN,
+        timer: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        """Thread-safe cache of the temporary credentials returned by STS.
+
+        Credentials are reused until refresh_margin minutes before their
+        expiration. Only one thread calls STS for the key, others wait for it.
+        :param refresh_margin: minutes before expiration to renew credentials
+        :param timer: returns current time with a timezone
+        """
+        self.refresh_margin = timedelta(minutes=refresh_margin)
+        self.hits = 0
+        self.misses = 0
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._credentials: dict[SessionKey, dict] = {}
+        self._key_locks = _KeyLocks()
+
+    def get(self, key: SessionKey, assume_role: Callable[[], dict]) -> dict:
+        """Returns cached credentials or calls assume_role to get new ones.
+
+        :param key: session key with the role ARN
+        :param assume_role: returns "Credentials" of the STS AssumeRole response
+        """
+        with self._key_locks(key):
+            credentials = self._credentials.get(key)
+            if credentials is None or self._need_refresh(credentials):
+                credentials = assume_role()
+                with self._lock:
+                    self._credentials[key] = credentials
+                    self.misses += 1
+            else:
+                with self._lock:
+                    self.hits += 1
+        return credentials
+
+    def invalidate(self, key: SessionKey | None = None) -> None:
+        """Removes credentials for the key or all credentials if key isn't set."""
+        with self._lock:
+            if key is None:
+                self._credentials.clear()
+            else:
+                self._credentials.pop(key, None)
+
+    def _need_refresh(self, credentials: dict) -> bool:
+        return credentials["Expiration"] - self.refresh_margin <= self._timer()
+
+
+class DecryptedPasswordsCache:
+    def __init__(
+        self,
+        ttl: int = DECRYPTED_PASSWORDS_CACHE_TTL,
+        max_size: int = DECRYPTED_PASSWORDS_CACHE_SIZE,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """Thread-safe in-memory cache of passwords decrypted by CloudShell.
+
+        Values are keyed by the encrypted value, so a changed password is
+        decrypted again. The least recently used values are dropped when the
+        cache is full.
+        :param ttl: time in minutes a value lives in the cache
+        :param max_size: max number of values in the cache
+        :param timer: monotonic clock used to expire the values
+        """
+        self.ttl = ttl * 60
+        self.max_size = max_size
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._values: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._key_locks = _KeyLocks()
+
+    def get(self, encrypted_value: str, decrypt: Callable[[], str]) -> str:
+        if self.ttl <= 0:
+            return decrypt()
+
+        with self._key_locks(encrypted_value):
+            value = self._get_valid(encrypted_value)
+            if value is None:
+                value = decrypt()
+                with self._lock:
+                    self._values[encrypted_value] = value, self._timer() + self.ttl
+                    while len(self._values) > self.max_size:
+                        self._values.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _get_valid(self, encrypted_value: str) -> str | None:
+        with self._lock:
+            try:
+                value, expires_at = self._values[encrypted_value]
+            except KeyError:
+                return None
+            if self._timer() >= expires_at:
+                del self._values[encrypted_value]
+                return None
+            self._values.move_to_end(encrypted_value)
+            return value
+
+
+SESSION_CACHE = AwsSessionCache()
+ASSUME_ROLE_CACHE = AssumeRoleCredentialsCache()
+DECRYPTED_PASSWORDS_CACHE = DecryptedPasswordsCache()
@@ -145,16 +145,15 @@ class PrepareCloudInfraAbsStrategy(metaclass=ABCMeta):
                 f"The isolated SG '{sg_name}' not found in the VPC '{self.vpc_name}'. "
                 "Creating a new one."
             )
-            sg = self._security_group_service.create_security_group(
-                self._aws_clients.ec2_session, self.vpc.id, sg_name
-            )
             tags = TagsHandler.create_security_group_tags(
                 sg_name,
                 self._reservation,
                 IsolationTagValue.SHARED,
                 TypeTagValue.ISOLATED,
             )
-            tags.add_tags_to_obj(sg)
+            sg = self._security_group_service.create_security_group(
+                self._aws_clients.ec2_session, self.vpc.id, sg_name, tags
+            )
         return sg
 
     def create_default_sg(self) -> SecurityGroup:
@@ -170,16 +169,15 @@ class PrepareCloudInfraAbsStrategy(metaclass=ABCMeta):
                 f"The default SG '{sg_name}' not found in the VPC '{self.vpc_name}'. "
                 "Creating a new one."
             )
-            sg = self._security_group_service.create_security_group(
-                self._aws_clients.ec2_session, self.vpc.id, sg_name
-            )
             tags = TagsHandler.create_security_group_tags(
                 sg_name,
                 self._reservation,
                 IsolationTagValue.SHARED,
                 TypeTagValue.DEFAULT,
             )
-            tags.add_tags_to_obj(sg)
+            sg = self._security_group_service.create_security_group(
+                self._aws_clients.ec2_session, self.vpc.id, sg_name, tags
+            )
         return sg
 
     @abstractmethod
@@ -107,8 +107,7 @@ class PrepareSubnetsAbsStrategy(metaclass=ABCMeta):
             self.set_subnet_cidr(item, is_multi_subnet_mode=is_multi_subnet_mode)
             self.get_existing_subnet(item)
             self.create_new_subnet_if_needed(item, availability_zone=availability_zone)
-        for item in action_items:
-            self.wait_till_available(item)
+        self.wait_till_available(action_items)
         for item in action_items:
             self.set_tags(item)
             self.attach_route_table(item)
@@ -165,26 +164,43 @@ class PrepareSubnetsAbsStrategy(metaclass=ABCMeta):
                 f"{availability_zone})"
             )
             item.subnet = self._subnet_service.create_subnet_nowait(
-                self.vpc, str(item.cidr), availability_zone
+                self.vpc, str(item.cidr), availability_zone, self._get_subnet_tags(item)
             )
             item.is_new_subnet = True
 
-    @subnet_step_wrapper
-    def wait_till_available(self, item: "ActionItem"):
-        if item.is_new_subnet:
-            self._logger.info(f"Waiting for subnet {item.cidr} - start")
-            self._subnet_waiter.wait(item.subnet, self._subnet_waiter.AVAILABLE)
-            self._logger.info(f"Waiting for subnet {item.cidr} - end")
+    def wait_till_available(self, action_items: List["ActionItem"]):
+        check_if_cancelled(self._cancellation_context)
+        new_items = [i for i in action_items if i.is_new_subnet and not i.error]
+        if not new_items:
+            return
+        cidrs = ", ".join(str(item.cidr) for item in new_items)
+        self._logger.info(f"Waiting for subnets {cidrs} - start")
+        errors = self._subnet_waiter.multi_wait(
+            [item.subnet for item in new_items],
+            self._subnet_waiter.AVAILABLE,
+            self._cancellation_context,
+        )
+        for item in new_items:
+            error = errors.get(item.subnet.subnet_id)
+            if error:
+                self._logger.error(f"Subnet {item.cidr} is not available: {error}")
+                item.error = error
+        self._logger.info(f"Waiting for subnets {cidrs} - end")
 
     @subnet_step_wrapper
     def set_tags(self, item: "ActionItem"):
+        # new subnets are tagged at creation
+        if not item.is_new_subnet:
+            self._get_subnet_tags(item).add_tags_to_obj(item.subnet)
+
+    def _get_subnet_tags(self, item: "ActionItem") -> TagsHandler:
         alias = item.action.actionParams.alias or f"Subnet-{item.cidr}"
         subnet_name = get_subnet_reservation_name(
             alias, self._reservation.reservation_id
         )
         tags = TagsHandler.create_default_tags(subnet_name, self._reservation)
         tags.set_is_public_tag(item.action.actionParams.isPublic)
-        tags.add_tags_to_obj(item.subnet)
+        return tags
 
     @subnet_step_wrapper
     def attach_route_table(self, item: "ActionItem"):
@@ -328,11 +344,10 @@ class PrepareSubnetsSharedStrategy(PrepareSubnetsAbsStrategy):
         sg_name = self._sg_service.subnet_sg_name(item.subnet.subnet_id)
         sg = self._sg_service.get_security_group_by_name(self.vpc, sg_name)
         if not sg:
+            tags = TagsHandler.create_default_tags(sg_name, self._reservation)
             sg = self._sg_service.create_security_group(
-                self._aws_clients.ec2_session, self.vpc.vpc_id, sg_name
+                self._aws_clients.ec2_session, self.vpc.vpc_id, sg_name, tags
             )
-            tags = TagsHandler.create_default_tags(sg_name, self._reservation)
-            tags.add_tags_to_obj(sg)
             self._sg_service.set_subnet_sg_rules(sg)
 
 
@@ -368,11 +383,10 @@ class PrepareSubnetsSingleStrategy(PrepareSubnetsAbsStrategy):
         sg_name = self._sg_service.subnet_sg_name(item.subnet.subnet_id)
         sg = self._sg_service.get_security_group_by_name(self.vpc, sg_name)
         if not sg:
+            tags = TagsHandler.create_default_tags(sg_name, self._reservation)
             sg = self._sg_service.create_security_group(
-                self._aws_clients.ec2_session, self.vpc.vpc_id, sg_name
+                self._aws_clients.ec2_session, self.vpc.vpc_id, sg_name, tags
             )
-            tags = TagsHandler.create_default_tags(sg_name, self._reservation)
-            tags.add_tags_to_obj(sg)
             self._sg_service.set_subnet_sg_rules(sg)
 
 
@@ -1,6 +1,5 @@
-import time
-
 from cloudshell.cp.aws.common import retry_helper
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter
 
 
 class AMIWaiter:
@@ -8,15 +7,23 @@ class AMIWaiter:
     AVAILABLE = "available"
     INSTANCE_STATES = [PENDING, AVAILABLE]
 
-    def __init__(self, delay=10, timeout=10):
+    def __init__(self, delay=10, timeout=10, initial_delay=2):
         """# noqa
-        :param delay: the time in seconds between each pull
+        :param delay: the max time in seconds between each pull
         :type delay: int
         :param timeout: timeout in minutes until time out exception will raised
         :type timeout: int
+        :param initial_delay: the time in seconds before the second pull, it grows up to the delay
+        :type initial_delay: float
         """
         self.delay = delay
         self.timeout = timeout * 60
+        self._waiter = BackoffWaiter(
+            name="ami",
+            initial_delay=initial_delay,
+            max_delay=delay,
+            timeout=self.timeout,
+        )
 
     def wait(self, subnet, state, load=False):
         """# noqa
@@ -31,15 +38,13 @@ class AMIWaiter:
         if state not in self.INSTANCE_STATES:
             raise ValueError("Unsupported instance state")
 
-        retry_helper.do_with_retry(lambda: subnet.reload())
-
-        start_time = time.time()
-        while subnet.state != state:
+        def is_in_state():
             retry_helper.do_with_retry(lambda: subnet.reload())
+            return subnet.state == state
 
-            if time.time() - start_time >= self.timeout:
-                raise Exception(f"Timeout: Waiting for instance to be {state} from")
-            time.sleep(self.delay)
+        self._waiter.wait(
+            is_in_state, f"Timeout: Waiting for instance to be {state} from"
+        )
 
         if load:
             subnet.reload()
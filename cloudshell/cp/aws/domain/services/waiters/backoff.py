@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from multiprocessing import TimeoutError  # noqa: A004
+from typing import Callable, TypeVar
+
+import attr
+
+T = TypeVar("T")
+
+
+@attr.s(auto_attribs=True)
+class WaitStats:
+    waits: int = 0
+    polls: int = 0
+    timeouts: int = 0
+    total_time: float = 0  # seconds
+    max_time: float = 0  # seconds
+
+
+class WaitMetrics:
+    """Thread-safe stats of the time spent in waiters by waiter name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, WaitStats] = {}
+
+    def record(self, name: str, wait_time: float, polls: int, timed_out: bool):
+        with self._lock:
+            stats = self._stats.setdefault(name, WaitStats())
+            stats.waits += 1
+            stats.polls += polls
+            stats.timeouts += int(timed_out)
+            stats.total_time += wait_time
+            stats.max_time = max(stats.max_time, wait_time)
+
+    def get(self, name: str) -> WaitStats:
+        with self._lock:
+            return attr.evolve(self._stats.get(name, WaitStats()))
+
+    def snapshot(self) -> dict[str, WaitStats]:
+        with self._lock:
+            return {name: attr.evolve(stats) for name, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+WAIT_METRICS = WaitMetrics()
+
+
+class BackoffWaiter:
+    def __init__(
+        self,
+        name: str,
+        initial_delay: float,
+        max_delay: float,
+        timeout: float,
+        multiplier: float = 2,
+        jitter: float = 0.1,
+        metrics: WaitMetrics = WAIT_METRICS,
+    ):
+        """Polls with exponentially growing delays until a condition is met.
+
+        :param name: waiter name used in metrics
+        :param initial_delay: seconds before the second poll
+        :param max_delay: max seconds between polls
+        :param timeout: seconds until the timeout error is raised
+        :param multiplier: factor the delay grows by after each poll
+        :param jitter: part of the delay randomly added or subtracted to spread
+            the polls of concurrent waiters
+        """
+        self.name = name
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.metrics = metrics
+
+    def get_delay(self, attempt: int) -> float:
+        """Returns seconds to sleep after the attempt, counting from 0."""
+        delay = min(self.initial_delay * self.multiplier**attempt, self.max_delay)
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return min(delay, self.max_delay)
+
+    def wait(
+        self,
+        condition: Callable[[], T],
+        timeout_message: str | Callable[[], str],
+        cancellation_check: Callable[[], None] | None = None,
+        timeout: float | None = None,
+        sleep: Callable[[float], object] | None = None,
+    ) -> T:
+        """Calls the condition until it returns a truthy value and returns it.
+
+        :param condition: polls the resource, can raise to stop waiting
+        :param timeout_message: message of the timeout error or a function that
+            returns it
+        :param cancellation_check: called before and after every sleep, raises
+            to stop waiting
+        :param timeout: seconds, overrides the waiter timeout
+        :param sleep: blocks for the delay between polls, can return earlier
+            when new data is available or the command is cancelled
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+        attempt = 0
+        timed_out = False
+        try:
+            while True:
+                result = condition()
+                attempt += 1
+                if result:
+                    return result
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    if callable(timeout_message):
+                        timeout_message = timeout_message()
+                    raise TimeoutError(timeout_message)
+
+                if cancellation_check:
+                    cancellation_check()
+                (sleep or time.sleep)(min(self.get_delay(attempt - 1), remaining))
+                # the sleep can be woken up by the cancellation
+                if cancellation_check:
+                    cancellation_check()
+        finally:
+            wait_time = time.monotonic() - start_time
+            self.metrics.record(self.name, wait_time, attempt, timed_out)
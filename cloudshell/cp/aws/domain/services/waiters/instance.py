@@ -1,9 +1,18 @@
-import time
-from multiprocessing import TimeoutError  # noqa: A004
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
 from retrying import retry
 
+from cloudshell.cp.aws.domain.common.cancellation_service import CancellationToken
+from cloudshell.cp.aws.domain.services.ec2.instance import InstanceService
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter
+from cloudshell.cp.aws.domain.services.waiters.instance_status_poller import (
+    INSTANCE_STATUS_POLLERS,
+)
+
 if TYPE_CHECKING:
     from logging import Logger
 
@@ -13,6 +22,20 @@ if TYPE_CHECKING:
     from cloudshell.shell.core.driver_context import CancellationContext
 
 
+class InstanceTerminatedException(Exception):
+    """Raised when instances get terminated while waiting for another state."""
+
+    def __init__(self, reasons: dict[str, str]):
+        """# noqa
+        :param reasons: the state reasons by the ids of the terminated instances
+        """
+        super().__init__(
+            "Instances were terminated: "
+            + ", ".join(f"{id_} ({reason})" for id_, reason in reasons.items())
+        )
+        self.reasons = reasons
+
+
 class InstanceWaiter:
     PENDING = "pending"
     RUNNING = "running"
@@ -21,22 +44,48 @@ class InstanceWaiter:
     STOPPING = "stopping"
     STOPPED = "stopped"
     INSTANCE_STATES = [PENDING, RUNNING, SHUTTING_DOWN, TERMINATED, STOPPING, STOPPED]
+    # instances in these states never get to any state but terminated
+    TERMINAL_STATES = ("shutting-down", TERMINATED)
 
     STATUS_OK = "ok"
     STATUS_IMPAIRED = "impaired"
 
-    def __init__(self, cancellation_service, delay=15, timeout=10):
+    def __init__(
+        self,
+        cancellation_service,
+        delay=15,
+        timeout=10,
+        initial_delay=2,
+        status_pollers=INSTANCE_STATUS_POLLERS,
+    ):
         """# noqa
-        :param delay: the time in seconds between each pull
+        :param delay: the max time in seconds between each pull
         :type delay: int
         :param timeout: timeout in minutes until time out exception will raised
         :type timeout: int
         :param cancellation_service:
         :type cancellation_service: cloudshell.cp.aws.domain.common.cancellation_service.CommandCancellationService
+        :param initial_delay: the time in seconds before the second pull, it grows up to the delay
+        :type initial_delay: float
+        :param status_pollers: pollers that share DescribeInstanceStatus calls between commands
+        :type status_pollers: cloudshell.cp.aws.domain.services.waiters.instance_status_poller.InstanceStatusPollers
         """
         self.delay = delay
         self.timeout = timeout * 60
         self.cancellation_service = cancellation_service
+        self.status_pollers = status_pollers
+        self._waiter = BackoffWaiter(
+            name="instance",
+            initial_delay=initial_delay,
+            max_delay=delay,
+            timeout=self.timeout,
+        )
+        self._status_waiter = BackoffWaiter(
+            name="instance_status",
+            initial_delay=initial_delay,
+            max_delay=delay,
+            timeout=self.timeout,
+        )
 
     def wait(self, instance, state, cancellation_context=None):
         """# noqa
@@ -46,11 +95,52 @@ class InstanceWaiter:
         :param CancellationContext cancellation_context:
         :return:
         """
-        return self.multi_wait([instance], state, cancellation_context)[0]
+        if not instance:
+            raise ValueError("Instance cannot be null")
+        if state not in self.INSTANCE_STATES:
+            raise ValueError("Unsupported instance state")
+
+        cancellation_token = CancellationToken.from_context(cancellation_context)
+
+        def check_if_cancelled():
+            self.cancellation_service.check_if_cancelled(
+                cancellation_token, {"instance_ids": [instance.id]}
+            )
+
+        with self._subscribe(
+            instance.meta.client, instance.id, cancellation_token
+        ) as subscription:
+
+            def get_status_in_state():
+                instance_status = subscription.get_status()
+                if instance_status is None:
+                    # terminated instances disappear from the poll results
+                    if state == self.TERMINATED and subscription.is_polled:
+                        return {"InstanceState": {"Name": self.TERMINATED}}
+                    return None
+                if instance_status["InstanceState"]["Name"] == state:
+                    return instance_status
+                return None
+
+            instance_status = self._waiter.wait(
+                get_status_in_state,
+                f"Timeout: Waiting for instance to be {state} from",
+                check_if_cancelled,
+                sleep=subscription.wait_for_update,
+            )
+
+        if isinstance(instance.meta.data, dict):
+            instance.meta.data["State"] = instance_status["InstanceState"]
+        check_if_cancelled()
+        return instance
 
     def multi_wait(self, instances, state, cancellation_context=None):
         """# noqa
         Will sync wait for the change of state of the instance
+
+        Instances terminated while waiting for another state are not waited for,
+        InstanceTerminatedException is raised for them when the others are in
+        the state.
         :param instances:
         :param str state:
         :param CancellationContext cancellation_context:
@@ -62,25 +152,43 @@ class InstanceWaiter:
             raise ValueError("Unsupported instance state")
 
         instance_ids = set(filter(lambda x: str(x.id), instances))
+        pending = {instance.id: instance for instance in instances}
+        terminated = {}
+        cancellation_token = CancellationToken.from_context(cancellation_context)
 
-        start_time = time.time()
-        last_item = 0
-        while len(instances) - last_item:
-            instance = instances[last_item]
-            if instance.state["Name"] != state:
-                self._reload_instance(instance)
-                if time.time() - start_time >= self.timeout:
-                    raise TimeoutError(
-                        f"Timeout: Waiting for instance to be {state} from"
-                    )
-                time.sleep(self.delay)
-            else:
-                last_item += 1
+        def are_in_state():
+            descriptions = self._describe_instances(list(pending.values()))
+            for instance_id, instance in list(pending.items()):
+                instance_data = descriptions.get(instance_id)
+                if instance_data is None:
+                    # terminated instances disappear from describe results
+                    if state == self.TERMINATED:
+                        del pending[instance_id]
+                    continue
+                instance.meta.data = instance_data
+                state_name = instance_data["State"]["Name"]
+                if state_name == state:
+                    del pending[instance_id]
+                elif state_name in self.TERMINAL_STATES and state != self.TERMINATED:
+                    reason = instance_data.get("StateReason", {}).get("Message")
+                    terminated[instance_id] = reason or state_name
+                    del pending[instance_id]
+            return not pending
 
+        def check_if_cancelled():
             self.cancellation_service.check_if_cancelled(
-                cancellation_context, {"instance_ids": instance_ids}
+                cancellation_token, {"instance_ids": instance_ids}
             )
 
+        self._waiter.wait(
+            are_in_state,
+            f"Timeout: Waiting for instance to be {state} from",
+            check_if_cancelled,
+            sleep=cancellation_token.wait,
+        )
+        check_if_cancelled()
+        if terminated:
+            raise InstanceTerminatedException(terminated)
         return instances
 
     def wait_status_ok(
@@ -94,37 +202,49 @@ class InstanceWaiter:
         if not instance:
             raise ValueError("Instance cannot be null")
 
-        timeout = status_check_timeout or self.timeout
-        start_time = time.time()
-        instance_status = self._get_instance_status(ec2_client, instance)
-        while not self._is_instance_status_ok(instance_status):
-            if time.time() - start_time >= timeout:
-                raise TimeoutError(
-                    "Timeout: Waiting for instance status check to be OK"
-                )
-            # if status check timeout is provided we want to wait until status check is
-            # OK or timeout is reached. We don't want to stop the waiter if the instance
-            # is impaired. That's because some virtual appliances might take 40+ minutes
-            # to be OK and AWS will show them as impaired after about 20 minutes until
-            # it begins to work
-            if not status_check_timeout and self._is_instance_status_impaired(
-                instance_status
-            ):
-                logger.error(f"Instance status check is not OK: {instance_status}")
-                raise ValueError(
-                    "Instance status check is not OK. Check the log and aws console "
-                    "for more details"
-                )
+        cancellation_token = CancellationToken.from_context(cancellation_context)
+        with self._subscribe(
+            ec2_client, instance.id, cancellation_token
+        ) as subscription:
 
-            self.cancellation_service.check_if_cancelled(
-                cancellation_context, {"instance_ids": [instance.id]}
-            )
-
-            time.sleep(self.delay)
+            def get_status_ok():
+                instance_status = subscription.get_status()
+                if self._is_instance_status_ok(instance_status):
+                    return instance_status
+                # if status check timeout is provided we want to wait until status
+                # check is OK or timeout is reached. We don't want to stop the waiter
+                # if the instance is impaired. That's because some virtual appliances
+                # might take 40+ minutes to be OK and AWS will show them as impaired
+                # after about 20 minutes until it begins to work
+                if not status_check_timeout and self._is_instance_status_impaired(
+                    instance_status
+                ):
+                    logger.error(f"Instance status check is not OK: {instance_status}")
+                    raise ValueError(
+                        "Instance status check is not OK. Check the log and aws "
+                        "console for more details"
+                    )
+                return None
 
-            instance_status = self._get_instance_status(ec2_client, instance)
+            return self._status_waiter.wait(
+                get_status_ok,
+                "Timeout: Waiting for instance status check to be OK",
+                lambda: self.cancellation_service.check_if_cancelled(
+                    cancellation_token, {"instance_ids": [instance.id]}
+                ),
+                timeout=status_check_timeout or self.timeout,
+                sleep=subscription.wait_for_update,
+            )
 
-        return instance_status
+    @contextmanager
+    def _subscribe(self, ec2_client, instance_id, cancellation_token):
+        """Subscribes to the instance status, cancellation wakes up the wait."""
+        with self.status_pollers.subscribe(ec2_client, instance_id) as subscription:
+            remove_callback = cancellation_token.add_callback(subscription.notify)
+            try:
+                yield subscription
+            finally:
+                remove_callback()
 
     def _is_instance_status_ok(self, instance_status):
         if not instance_status:
@@ -142,17 +262,17 @@ class InstanceWaiter:
             or instance_status["InstanceStatus"]["Status"] == self.STATUS_IMPAIRED
         )
 
-    @retry(stop_max_attempt_number=3, wait_fixed=1000)
-    def _get_instance_status(self, ec2_client, instance):
-        instance_status = ec2_client.describe_instance_status(
-            InstanceIds=[instance.id], IncludeAllInstances=True
-        )
-        if hasattr(instance_status, "InstanceStatuses"):
-            return instance_status.InstanceStatuses[0]
-        if "InstanceStatuses" in instance_status:
-            return instance_status["InstanceStatuses"][0]
-        return None
-
+    @staticmethod
     @retry(stop_max_attempt_number=30, wait_fixed=1000)
-    def _reload_instance(self, instance):
-        instance.reload()
+    def _describe_instances(instances: list["Instance"]) -> dict[str, dict]:
+        """Describes the instances with one call per client and API limit."""
+        instances_by_client = defaultdict(list)
+        for instance in instances:
+            instances_by_client[instance.meta.client].append(instance.id)
+
+        descriptions = {}
+        for ec2_client, instance_ids in instances_by_client.items():
+            descriptions.update(
+                InstanceService.describe_instances(ec2_client, instance_ids)
+            )
+        return descriptions
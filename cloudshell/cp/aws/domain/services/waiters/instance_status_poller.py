@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Callable
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from cloudshell.cp.aws.domain.common.list_helper import chunks
+
+if TYPE_CHECKING:
+    from mypy_boto3_ec2 import EC2Client  # noqa: I900
+
+
+# seconds between DescribeInstanceStatus calls for all waiting commands
+POLL_INTERVAL = int(os.getenv("QS_AWS_INSTANCE_STATUS_POLL_INTERVAL", "5"))
+# seconds without subscriptions before the polling thread stops
+IDLE_TIMEOUT = 60
+# max number of instance ids in DescribeInstanceStatus
+INSTANCE_IDS_LIMIT = 100
+NOT_FOUND_ERROR_CODE = "InvalidInstanceID.NotFound"
+# failed polls in a row before the error is delivered to subscriptions
+MAX_POLL_FAILURES = int(os.getenv("QS_AWS_INSTANCE_STATUS_POLL_MAX_FAILURES", "3"))
+THROTTLING_ERROR_CODES = frozenset(
+    {"Throttling", "ThrottlingException", "RequestLimitExceeded"}
+)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Connection, throttling and server errors can pass on the next poll."""
+    if isinstance(error, ClientError):
+        return (
+            error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+            or error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+            >= 500
+        )
+    return isinstance(error, BotoCoreError)
+
+
+class InstanceStatusSubscription:
+    def __init__(self, poller: InstanceStatusPoller, instance_id: str):
+        """Latest status of the instance delivered by the poller."""
+        self.poller = poller
+        self.instance_id = instance_id
+        self._updated = threading.Event()
+        self._lock = threading.Lock()
+        self._status = None
+        self._error = None
+        self._polled = False
+
+    @property
+    def is_polled(self) -> bool:
+        """The poller delivered a status, None means the instance is missing."""
+        with self._lock:
+            return self._polled
+
+    def get_status(self) -> dict | None:
+        """Returns the latest DescribeInstanceStatus item or None if not known yet.
+
+        Raises the error of the last poll if it failed.
+        """
+        with self._lock:
+            if self._error:
+                raise self._error
+            return self._status
+
+    def wait_for_update(self, timeout: float) -> bool:
+        """Blocks until the poller delivers a new status or the timeout."""
+        updated = self._updated.wait(timeout)
+        self._updated.clear()
+        return updated
+
+    def notify(self) -> None:
+        """Wakes up the wait for update without a new status."""
+        self._updated.set()
+
+    def close(self) -> None:
+        self.poller.unsubscribe(self)
+
+    def set_status(self, status: dict | None) -> None:
+        with self._lock:
+            self._status = status
+            self._error = None
+            self._polled = True
+        self._updated.set()
+
+    def set_error(self, error: Exception) -> None:
+        with self._lock:
+            self._error = error
+        self._updated.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class InstanceStatusPoller:
+    def __init__(
+        self,
+        ec2_client: EC2Client,
+        interval: float = POLL_INTERVAL,
+        idle_timeout: float = IDLE_TIMEOUT,
+        on_stop: Callable[[InstanceStatusPoller], None] | None = None,
+        max_failures: int = MAX_POLL_FAILURES,
+    ):
+        """Polls statuses of all subscribed instances with batched calls.
+
+        A background thread calls DescribeInstanceStatus for all subscribed
+        instances once per interval and delivers the results to subscriptions.
+        The thread starts with the first subscription and stops when there are
+        no subscriptions for idle_timeout seconds.
+        Transient errors are delivered only after max_failures polls of the
+        instance failed in a row, subscriptions keep the last status till then.
+        :param interval: seconds between polls
+        :param idle_timeout: seconds without subscriptions before stopping
+        :param on_stop: called when the thread stops because of idleness
+        :param max_failures: failed polls in a row before a transient error
+            is delivered
+        """
+        self.ec2_client = ec2_client
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.max_failures = max_failures
+        self._on_stop = on_stop
+        # failed polls in a row by instance id
+        self._failures: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, list[InstanceStatusSubscription]] = {}
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._thread is not None
+
+    def subscribe(self, instance_id: str) -> InstanceStatusSubscription:
+        subscription = InstanceStatusSubscription(self, instance_id)
+        with self._lock:
+            self._subscriptions.setdefault(instance_id, []).append(subscription)
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="InstanceStatusPoller", daemon=True
+                )
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: InstanceStatusSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.instance_id, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.instance_id, None)
+                self._failures.pop(subscription.instance_id, None)
+
+    def stop(self) -> None:
+        """Stops the polling thread, subscribing starts it again."""
+        with self._lock:
+            thread = self._thread
+        self._stop.set()
+        if thread and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self):
+        idle_time = 0
+        while True:
+            with self._lock:
+                instance_ids = list(self._subscriptions)
+                if self._stop.is_set() or (
+                    not instance_ids and idle_time >= self.idle_timeout
+                ):
+                    self._thread = None
+                    break
+
+            if instance_ids:
+                idle_time = 0
+                self._poll(instance_ids)
+            else:
+                idle_time += self.interval
+            self._stop.wait(self.interval)
+
+        if self._on_stop and not self._stop.is_set():
+            self._on_stop(self)
+
+    def _poll(self, instance_ids: list[str]) -> None:
+        for ids in chunks(instance_ids, INSTANCE_IDS_LIMIT):
+            try:
+                statuses = self._describe_instance_status(ids)
+            except Exception as e:
+                self._deliver_error(ids, e)
+            else:
+                for instance_id in ids:
+                    self._deliver_status(instance_id, statuses.get(instance_id))
+
+    def _describe_instance_status(self, instance_ids: list[str]) -> dict[str, dict]:
+        """Returns statuses by instance id.
+
+        Just created instances can be missing in the API for a few seconds, the
+        call fails for all ids then, so it's repeated without the missing ones.
+        """
+        try:
+            response = self.ec2_client.describe_instance_status(
+                InstanceIds=instance_ids, IncludeAllInstances=True
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != NOT_FOUND_ERROR_CODE:
+                raise
+            missing_ids = set(re.findall(r"i-[0-9a-f]+", str(e)))
+            instance_ids = [i for i in instance_ids if i not in missing_ids]
+            if not missing_ids or not instance_ids:
+                return {}
+            response = self.ec2_client.describe_instance_status(
+                InstanceIds=instance_ids, IncludeAllInstances=True
+            )
+        return {status["InstanceId"]: status for status in response["InstanceStatuses"]}
+
+    def _deliver_status(self, instance_id: str, status: dict | None) -> None:
+        with self._lock:
+            self._failures.pop(instance_id, None)
+            subscriptions = list(self._subscriptions.get(instance_id, []))
+        for subscription in subscriptions:
+            subscription.set_status(status)
+
+    def _deliver_error(self, instance_ids: list[str], error: Exception) -> None:
+        transient = is_transient_error(error)
+        subscriptions = []
+        with self._lock:
+            for instance_id in instance_ids:
+                if instance_id not in self._subscriptions:
+                    continue
+                failures = self._failures.get(instance_id, 0) + 1
+                self._failures[instance_id] = failures
+                if not transient or failures >= self.max_failures:
+                    subscriptions.extend(self._subscriptions[instance_id])
+        for subscription in subscriptions:
+            subscription.set_error(error)
+
+
+class InstanceStatusPollers:
+    POLLER_CLASS = InstanceStatusPoller
+
+    def __init__(self, interval: float = POLL_INTERVAL, idle_timeout=IDLE_TIMEOUT):
+        """Process-wide pollers by EC2 client.
+
+        Clients are cached per region and credentials, so all commands for the
+        same account and region share one poller.
+        """
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._pollers: dict[EC2Client, InstanceStatusPoller] = {}
+
+    def subscribe(
+        self, ec2_client: EC2Client, instance_id: str
+    ) -> InstanceStatusSubscription:
+        with self._lock:
+            poller = self._pollers.get(ec2_client)
+            if poller is None:
+                poller = self.POLLER_CLASS(
+                    ec2_client, self.interval, self.idle_timeout, self._remove
+                )
+                self._pollers[ec2_client] = poller
+        return poller.subscribe(instance_id)
+
+    def _remove(self, poller: InstanceStatusPoller) -> None:
+        with self._lock:
+            # the poller could get a new subscription after its thread stopped
+            if self._pollers.get(poller.ec2_client) is poller and not poller.is_running:
+                del self._pollers[poller.ec2_client]
+
+
+INSTANCE_STATUS_POLLERS = InstanceStatusPollers()
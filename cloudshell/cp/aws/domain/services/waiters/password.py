@@ -1,50 +1,87 @@
 import os
-import time
-from multiprocessing import TimeoutError  # noqa: A004
+from contextlib import contextmanager
+
+from cloudshell.cp.aws.domain.common.cancellation_service import CancellationToken
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter
+from cloudshell.cp.aws.domain.services.waiters.password_poller import (
+    PASSWORD_DATA_POLLERS,
+)
 
 
 class PasswordWaiter:
     TIMEOUT = int(os.getenv("QS_AWS_CRED_TIMEOUT", "15"))
 
-    def __init__(self, cancellation_service, delay=5, timeout=TIMEOUT):
+    def __init__(
+        self,
+        cancellation_service,
+        delay=5,
+        timeout=TIMEOUT,
+        initial_delay=2,
+        password_pollers=PASSWORD_DATA_POLLERS,
+    ):
         """# noqa
-        :param delay: the time in seconds between each pull
+        :param delay: the max time in seconds between each pull
         :type delay: int
         :param timeout: timeout in minutes until time out exception will raised
         :type timeout: int
         :param cancellation_service:
         :type cancellation_service: cloudshell.cp.aws.domain.common.cancellation_service.CommandCancellationService
+        :param initial_delay: the time in seconds before the second pull, it grows up to the delay
+        :type initial_delay: float
+        :param password_pollers: pollers that share GetPasswordData calls between commands
+        :type password_pollers: cloudshell.cp.aws.domain.services.waiters.password_poller.PasswordDataPollers
         """
         self.delay = delay
         self.timeout = timeout * 60
         self.cancellation_service = cancellation_service
+        self.password_pollers = password_pollers
+        self._waiter = BackoffWaiter(
+            name="password",
+            initial_delay=initial_delay,
+            max_delay=delay,
+            timeout=self.timeout,
+        )
 
     def wait(self, instance, cancellation_context=None):
         """# noqa
         will wait for the password of the machine to be set
         :param instance: Amazon AMI instance
         :param CancellationContext cancellation_context:
-        :return:
+        :return: encrypted password data
         """
         if not instance:
             raise ValueError("Instance cannot be null")
 
-        start_time = time.time()
-
-        password_data = self._get_password(instance)
-        while not password_data:
-            if time.time() - start_time >= self.timeout:
-                raise TimeoutError("Timeout: Waiting for instance to get password")
+        cancellation_token = CancellationToken.from_context(cancellation_context)
+        with self._subscribe(
+            instance.meta.client, instance.id, cancellation_token
+        ) as subscription:
 
-            self.cancellation_service.check_if_cancelled(cancellation_context)
+            def get_password():
+                password_data = subscription.get_status()
+                return password_data and password_data["PasswordData"]
 
-            time.sleep(self.delay)
-            password_data = self._get_password(instance)
-
-        return password_data
+            return self._waiter.wait(
+                get_password,
+                "Timeout: Waiting for instance to get password",
+                lambda: self.cancellation_service.check_if_cancelled(
+                    cancellation_token
+                ),
+                sleep=subscription.wait_for_update,
+            )
 
     @staticmethod
-    def _get_password(instance):
-        instance.load()
-        password_data = instance.password_data()["PasswordData"]
-        return password_data
+    def get_password(instance):
+        """Returns encrypted password data, empty if it's not generated yet."""
+        ec2_client = instance.meta.client
+        return ec2_client.get_password_data(InstanceId=instance.id)["PasswordData"]
+
+    @contextmanager
+    def _subscribe(self, ec2_client, instance_id, cancellation_token):
+        """Subscribes to the password data, cancellation wakes up the wait."""
+        with self.password_pollers.subscribe(ec2_client, instance_id) as subscription:
+            remove_callback = cancellation_token.add_callback(subscription.notify)
+            try:
+                yield subscription
+            finally:
+                remove_callback()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Callable
+
+from cloudshell.cp.aws.domain.services.waiters.instance_status_poller import (
+    IDLE_TIMEOUT,
+    InstanceStatusPoller,
+    InstanceStatusPollers,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_ec2 import EC2Client  # noqa: I900
+
+
+# seconds between rounds of the polling thread
+POLL_INTERVAL = 1
+# seconds before the second GetPasswordData call for the instance
+INITIAL_DELAY = 5
+# max seconds between GetPasswordData calls for the instance
+MAX_DELAY = 30
+
+
+class PasswordDataPoller(InstanceStatusPoller):
+    def __init__(
+        self,
+        ec2_client: EC2Client,
+        interval: float = POLL_INTERVAL,
+        idle_timeout: float = IDLE_TIMEOUT,
+        on_stop: Callable[[InstanceStatusPoller], None] | None = None,
+        initial_delay: float = INITIAL_DELAY,
+        max_delay: float = MAX_DELAY,
+        multiplier: float = 2,
+    ):
+        """Polls password data of all subscribed instances from one thread.
+
+        There is no batched GetPasswordData, so each round calls it only for the
+        instances that are due. The delay between calls for an instance grows
+        from initial_delay to max_delay, Windows passwords take minutes to be
+        generated and early calls mostly return an empty password.
+        Subscriptions get GetPasswordData responses as statuses.
+        """
+        super().__init__(ec2_client, interval, idle_timeout, on_stop)
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        # next poll time and number of polls by instance id, used by the thread
+        self._schedule: dict[str, tuple[float, int]] = {}
+
+    def get_delay(self, attempt: int) -> float:
+        """Returns seconds between the attempt and the next one, counting from 0."""
+        return min(self.initial_delay * self.multiplier**attempt, self.max_delay)
+
+    def _poll(self, instance_ids: list[str]) -> None:
+        now = time.monotonic()
+        for instance_id in set(self._schedule) - set(instance_ids):
+            del self._schedule[instance_id]
+
+        for instance_id in instance_ids:
+            next_poll_time, attempt = self._schedule.get(instance_id, (now, 0))
+            if next_poll_time > now:
+                continue
+            try:
+                response = self.ec2_client.get_password_data(InstanceId=instance_id)
+            except Exception as e:
+                self._deliver_error([instance_id], e)
+            else:
+                self._deliver_status(instance_id, response)
+            self._schedule[instance_id] = (now + self.get_delay(attempt), attempt + 1)
+
+
+class PasswordDataPollers(InstanceStatusPollers):
+    POLLER_CLASS = PasswordDataPoller
+
+    def __init__(self, interval: float = POLL_INTERVAL, idle_timeout=IDLE_TIMEOUT):
+        """Process-wide password data pollers by EC2 client."""
+        super().__init__(interval, idle_timeout)
+
+
+PASSWORD_DATA_POLLERS = PasswordDataPollers()
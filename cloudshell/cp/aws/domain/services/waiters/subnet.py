@@ -1,22 +1,50 @@
-import time
+from __future__ import annotations
+
+from collections import defaultdict
+from multiprocessing import TimeoutError  # noqa: A004
+from typing import TYPE_CHECKING
+
+from retrying import retry
 
 from cloudshell.cp.aws.common import retry_helper
+from cloudshell.cp.aws.domain.common.cancellation_service import (
+    CancellationToken,
+    check_if_cancelled,
+)
+from cloudshell.cp.aws.domain.common.list_helper import chunks
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter
+
+if TYPE_CHECKING:
+    from mypy_boto3_ec2 import EC2Client  # noqa: I900
+    from mypy_boto3_ec2.service_resource import Subnet  # noqa: I900
+
+    from cloudshell.shell.core.driver_context import CancellationContext
 
 
 class SubnetWaiter:
     PENDING = "pending"
     AVAILABLE = "available"
     INSTANCE_STATES = [PENDING, AVAILABLE]
+    # max number of values in a describe filter
+    FILTER_VALUES_LIMIT = 200
 
-    def __init__(self, delay=10, timeout=10):
+    def __init__(self, delay=10, timeout=10, initial_delay=0.5):
         """# noqa
-        :param delay: the time in seconds between each pull
+        :param delay: the max time in seconds between each pull
         :type delay: int
         :param timeout: timeout in minutes until time out exception will raised
         :type timeout: int
+        :param initial_delay: the time in seconds before the second pull, it grows up to the delay
+        :type initial_delay: float
         """
         self.delay = delay
         self.timeout = timeout * 60
+        self._waiter = BackoffWaiter(
+            name="subnet",
+            initial_delay=initial_delay,
+            max_delay=delay,
+            timeout=self.timeout,
+        )
 
     def wait(self, subnet, state, load=False):
         """# noqa
@@ -31,17 +59,102 @@ class SubnetWaiter:
         if state not in self.INSTANCE_STATES:
             raise ValueError("Unsupported instance state")
 
-        retry_helper.do_with_retry(lambda: subnet.reload())
-
-        start_time = time.time()
-        while subnet.state != state:
+        def is_in_state():
             retry_helper.do_with_retry(lambda: subnet.reload())
+            return subnet.state == state
 
-            if time.time() - start_time >= self.timeout:
-                raise Exception(f"Timeout: Waiting for instance to be {state} from")
-            time.sleep(self.delay)
+        self._waiter.wait(
+            is_in_state, f"Timeout: Waiting for instance to be {state} from"
+        )
 
         if load:
             subnet.reload()
 
         return subnet
+
+    def multi_wait(
+        self,
+        subnets: list[Subnet],
+        state: str,
+        cancellation_context: CancellationContext | None = None,
+    ) -> dict[str, Exception]:
+        """Waits for the subnets with one DescribeSubnets call per poll.
+
+        A subnet that fails or doesn't get to the state doesn't stop waiting
+        for the others, its error is returned instead of being raised.
+        :return: errors by subnet id, empty if all subnets are in the state
+        """
+        if not subnets:
+            raise ValueError("Subnets cannot be empty")
+        if state not in self.INSTANCE_STATES:
+            raise ValueError("Unsupported subnet state")
+
+        pending = {subnet.subnet_id: subnet for subnet in subnets}
+        errors = {}
+        cancellation_token = CancellationToken.from_context(cancellation_context)
+
+        def are_in_state():
+            descriptions, describe_errors = self._describe_subnets(
+                list(pending.values())
+            )
+            for subnet_id, error in describe_errors.items():
+                errors[subnet_id] = error
+                del pending[subnet_id]
+            for subnet_id, subnet in list(pending.items()):
+                subnet_data = descriptions.get(subnet_id)
+                # just created subnets can be missing in the API for a while
+                if subnet_data is None:
+                    continue
+                subnet.meta.data = subnet_data
+                if subnet_data["State"] == state:
+                    del pending[subnet_id]
+            return not pending
+
+        def check_cancelled():
+            check_if_cancelled(cancellation_token, {"subnet_ids": list(pending)})
+
+        try:
+            self._waiter.wait(
+                are_in_state,
+                lambda: f"Timeout: Waiting for subnets {list(pending)} to be {state}",
+                check_cancelled,
+                sleep=cancellation_token.wait,
+            )
+        except TimeoutError as e:
+            errors.update(dict.fromkeys(pending, e))
+        return errors
+
+    @classmethod
+    def _describe_subnets(
+        cls, subnets: list[Subnet]
+    ) -> tuple[dict[str, dict], dict[str, Exception]]:
+        """Describes the subnets with one call per client and API limit.
+
+        :return: DescribeSubnets data by subnet id and errors of failed calls
+            by subnet id
+        """
+        subnet_ids_by_client = defaultdict(list)
+        for subnet in subnets:
+            subnet_ids_by_client[subnet.meta.client].append(subnet.subnet_id)
+
+        descriptions = {}
+        errors = {}
+        for ec2_client, subnet_ids in subnet_ids_by_client.items():
+            for ids in chunks(subnet_ids, cls.FILTER_VALUES_LIMIT):
+                try:
+                    descriptions.update(cls._describe_subnets_chunk(ec2_client, ids))
+                except Exception as e:
+                    errors.update(dict.fromkeys(ids, e))
+        return descriptions, errors
+
+    @staticmethod
+    @retry(stop_max_attempt_number=5, wait_fixed=1000)
+    def _describe_subnets_chunk(
+        ec2_client: EC2Client, subnet_ids: list[str]
+    ) -> dict[str, dict]:
+        # unlike SubnetIds param the filter doesn't fail the whole call when one
+        # of the subnets doesn't exist yet
+        response = ec2_client.describe_subnets(
+            Filters=[{"Name": "subnet-id", "Values": subnet_ids}]
+        )
+        return {subnet["SubnetId"]: subnet for subnet in response["Subnets"]}
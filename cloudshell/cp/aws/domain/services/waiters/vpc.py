@@ -1,6 +1,5 @@
-import time
-
 from cloudshell.cp.aws.common import retry_helper
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter
 
 
 class VPCWaiter:
@@ -8,16 +7,25 @@ class VPCWaiter:
     AVAILABLE = "available"
     INSTANCE_STATES = [PENDING, AVAILABLE]
 
-    def __init__(self, delay=10, timeout=10):
+    def __init__(self, delay=10, timeout=10, initial_delay=0.5):
         """Initialize.
 
-        :param delay: the time in seconds between each pull
+        :param delay: the max time in seconds between each pull
         :type delay: int
         :param timeout: timeout in minutes until time out exception will raised
         :type timeout: int
+        :param initial_delay: the time in seconds before the second pull, it
+            grows up to the delay
+        :type initial_delay: float
         """
         self.delay = delay
         self.timeout = timeout * 60
+        self._waiter = BackoffWaiter(
+            name="vpc",
+            initial_delay=initial_delay,
+            max_delay=delay,
+            timeout=self.timeout,
+        )
 
     def wait(self, vpc, state):
         """Will sync wait for the change of state of the vpc."""
@@ -26,12 +34,13 @@ class VPCWaiter:
         if state not in self.INSTANCE_STATES:
             raise ValueError("Unsupported instance state")
 
-        start_time = time.time()
-        while vpc.state != state:
-            time.sleep(self.delay)
-            if time.time() - start_time >= self.timeout:
-                raise Exception(f"Timeout: Waiting for instance to be {state} from")
-
+        def is_in_state():
+            if vpc.state == state:
+                return True
             retry_helper.do_with_retry(lambda: vpc.reload())
+            return vpc.state == state
 
+        self._waiter.wait(
+            is_in_state, f"Timeout: Waiting for instance to be {state} from"
+        )
         return vpc
@@ -1,7 +1,7 @@
-import time
 from typing import TYPE_CHECKING
 
 from cloudshell.cp.aws.common import retry_helper
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter
 
 if TYPE_CHECKING:
     from mypy_boto3_ec2.service_resource import VpcPeeringConnection
@@ -30,15 +30,23 @@ class VpcPeeringConnectionWaiter:
         DELETING,
     ]
 
-    def __init__(self, delay=10, timeout=10):
+    def __init__(self, delay=10, timeout=10, initial_delay=1):
         """# noqa
-        :param delay: the time in seconds between each pull
+        :param delay: the max time in seconds between each pull
         :type delay: int
         :param timeout: timeout in minutes until time out exception will raised
         :type timeout: int
+        :param initial_delay: the time in seconds before the second pull, it grows up to the delay
+        :type initial_delay: float
         """
         self.delay = delay
         self.timeout = timeout * 60
+        self._waiter = BackoffWaiter(
+            name="vpc_peering",
+            initial_delay=initial_delay,
+            max_delay=delay,
+            timeout=self.timeout,
+        )
 
     def wait(
         self,
@@ -53,13 +61,14 @@ class VpcPeeringConnectionWaiter:
         if state not in self.STATES:
             raise ValueError("Unsupported vpc peering connection state")
 
-        start_time = time.time()
-        while vpc_peering_connection.status["Code"] != state:
+        def is_in_state():
+            if vpc_peering_connection.status["Code"] == state:
+                return True
             retry_helper.do_with_retry(lambda: vpc_peering_connection.reload())
             status_code = vpc_peering_connection.status["Code"]
             status_msg = vpc_peering_connection.status.get("Message")
             if status_code == state:
-                break
+                return True
             if throw_on_error and status_code in [
                 VpcPeeringConnectionWaiter.REJECTED,
                 VpcPeeringConnectionWaiter.FAILED,
@@ -69,13 +78,15 @@ class VpcPeeringConnectionWaiter:
                     msg += f', status message "{status_msg}"'
                 msg += f". Expected state: {state}."
                 raise Exception(msg)
+            return False
 
-            if time.time() - start_time >= self.timeout:
-                raise Exception(
-                    f"Timeout waiting for vpc peering connection to be {state}. "
-                    f"Current state is {status_code}"
-                )
-            time.sleep(self.delay)
+        self._waiter.wait(
+            is_in_state,
+            lambda: (
+                f"Timeout waiting for vpc peering connection to be {state}. "
+                f"Current state is {vpc_peering_connection.status['Code']}"
+            ),
+        )
 
         if load:
             retry_helper.do_with_retry(lambda: vpc_peering_connection.reload())
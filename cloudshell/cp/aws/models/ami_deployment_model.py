@@ -1,3 +1,9 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cloudshell.cp.aws.domain.handlers.ec2 import TagsHandler
+
+
 class AMIDeploymentModel:
     def __init__(self):
         self.aws_ami_id = ""  # type: str
@@ -11,6 +17,8 @@ class AMIDeploymentModel:
         self.network_interfaces = []  # type: list[dict]
         self.aws_key = ""  # type: str
         self.custom_tags = {}  # type: dict
+        # tags set at launch, the Name is set after the instance id is known
+        self.tags = None  # type: TagsHandler
         self.user_data = ""  # type: str
         self.source_dest_check = True  # type: bool
         self.status_check_timeout = 0  # type: int
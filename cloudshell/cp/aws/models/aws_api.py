@@ -1,35 +1,72 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
+
+from cloudshell.cp.aws.common.cached_property import cached_property
 
 if TYPE_CHECKING:
     from mypy_boto3_ec2 import EC2Client, EC2ServiceResource  # noqa: I900
     from mypy_boto3_iam import IAMClient  # noqa: I900
     from mypy_boto3_s3 import S3ServiceResource  # noqa: I900
 
+    from cloudshell.cp.aws.domain.services.session_providers.session_cache import (
+        CachedSession,
+        SessionKey,
+    )
+
 
 class AwsApiClients:
+    EC2 = "ec2"
+    S3 = "s3"
+    IAM = "iam"
+
     def __init__(
         self,
-        ec2_session: "EC2ServiceResource",
-        s3_session: "S3ServiceResource",
-        ec2_client: "EC2Client",
-        default_ec2_session: "EC2ServiceResource",
-        iam_client: "IAMClient",
+        default_session: "CachedSession",
+        get_aws_ec2_session: Callable[[], "CachedSession"],
     ):
         """Api clients.
 
+        Clients are created on the first access, so a command creates only the
+        clients it uses.
         If we work in Shared VPC mode ec2_session and ec2_client would be created
         based on the Shared role and would work with Shared account but S3 would be
         work with management account
 
-        :param ec2_session: could be session created based on the ES role or on
-            the Shared role
-        :param default_ec2_session: always session created based on the ES role
-        :param s3_session: s3 session created based on the ES role
-        :param ec2_client: ec2 client could be created based on the ES role or on
-            the Shared role
+        :param default_session: session created based on the ES role
+        :param get_aws_ec2_session: returns the session created based on the ES
+            role or on the Shared role
         """
-        self.ec2_session = ec2_session
-        self.s3_session = s3_session
-        self.ec2_client = ec2_client
-        self.default_ec2_session = default_ec2_session
-        self.iam_client = iam_client
+        self._default_session = default_session
+        self._get_aws_ec2_session = get_aws_ec2_session
+
+    @cached_property
+    def _aws_ec2_session(self) -> "CachedSession":
+        return self._get_aws_ec2_session()
+
+    @cached_property
+    def ec2_session(self) -> "EC2ServiceResource":
+        """Could be session created based on the ES role or on the Shared role."""
+        return self._aws_ec2_session.resource(self.EC2)
+
+    @property
+    def ec2_session_key(self) -> "SessionKey":
+        """Identifies the region, credentials and role of the EC2 session."""
+        return self._aws_ec2_session.key
+
+    @cached_property
+    def s3_session(self) -> "S3ServiceResource":
+        """S3 session created based on the ES role."""
+        return self._default_session.resource(self.S3)
+
+    @cached_property
+    def ec2_client(self) -> "EC2Client":
+        """Could be created based on the ES role or on the Shared role."""
+        return self._aws_ec2_session.client(self.EC2)
+
+    @cached_property
+    def default_ec2_session(self) -> "EC2ServiceResource":
+        """Always session created based on the ES role."""
+        return self._default_session.resource(self.EC2)
+
+    @cached_property
+    def iam_client(self) -> "IAMClient":
+        return self._aws_ec2_session.client(self.IAM)
@@ -38,6 +38,7 @@ class DeployAWSEc2AMIInstanceResourceModel:
         self.outbound_ports = ""  # type: str
         self.inbound_ports = ""  # type: str
         self.wait_for_credentials = ""  # type: str
+        self.defer_credentials = False  # type: bool
         self.add_public_ip = False  # type: bool
         self.allocate_elastic_ip = False  # type: bool
         self.network_configurations = None  # type: list["NetworkAction"]  # noqa
@@ -66,6 +67,7 @@ class DeployAWSEc2AMIInstanceResourceModel:
         self.autoload = get_attr("Autoload", bool)
         self.inbound_ports = get_attr("Inbound Ports")
         self.wait_for_credentials = get_attr("Wait for Credentials", bool)
+        self.defer_credentials = get_attr("Defer Credentials", bool, False)
         (
             self.add_public_ip,
             self.allocate_elastic_ip,
@@ -36,7 +36,9 @@ class VpcTest:
     def route_tables(self):
         return Mock(all=lambda: self._rts)
 
-    def create_route_table(self) -> "RouteTableTest":
+    def create_route_table(self, TagSpecifications=()) -> "RouteTableTest":
         rt = RouteTableTest()
+        for tag_specification in TagSpecifications:
+            rt.create_tags(Tags=tag_specification["Tags"])
         self._rts.append(rt)
         return rt
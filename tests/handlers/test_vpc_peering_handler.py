@@ -0,0 +1,76 @@
+from unittest.mock import Mock
+
+import pytest
+
+from cloudshell.cp.aws.domain.handlers.ec2.vpc_peering_handler import (
+    Status,
+    VpcPeeringConnectionFailedStatus,
+    VpcPeeringConnectionWaitTimeout,
+    VpcPeeringHandler,
+)
+
+
+@pytest.fixture()
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(
+        "cloudshell.cp.aws.domain.services.waiters.backoff.time.sleep", sleeps.append
+    )
+    return sleeps
+
+
+def create_peering(*status_codes):
+    """Peering connection that gets the next status on every load."""
+    codes = iter(status_codes)
+    peering = Mock(id="pcx-1", status={"Code": next(codes)})
+
+    def load():
+        peering.status = {"Code": next(codes)}
+
+    peering.load.side_effect = load
+    peering.accept.side_effect = load
+    return peering
+
+
+def test_create_waits_with_backoff(sleeps, reservation):
+    peering = create_peering(
+        "initiating-request",
+        "initiating-request",
+        "pending-acceptance",
+        "provisioning",
+        "provisioning",
+        "provisioning",
+        "active",
+    )
+    ec2_session = Mock()
+    ec2_session.create_vpc_peering_connection.return_value = peering
+
+    handler = VpcPeeringHandler.create(
+        ec2_session, "vpc-1", "vpc-2", reservation, Mock()
+    )
+
+    assert handler.is_active
+    peering.accept.assert_called_once()
+    # two sleeps before the pending acceptance and three before the active status
+    assert len(sleeps) == 5
+    assert sleeps[0] < sleeps[1]
+    assert sleeps[2] < sleeps[3] < sleeps[4] <= 10
+
+
+def test_wait_until_status_raises_on_failed_status(sleeps):
+    handler = VpcPeeringHandler(create_peering("provisioning", "failed"))
+
+    with pytest.raises(VpcPeeringConnectionFailedStatus):
+        handler.wait_until_status(Status.ACTIVE)
+
+    assert len(sleeps) == 1
+
+
+def test_wait_until_status_timeout(sleeps):
+    peering = Mock(id="pcx-1", status={"Code": "provisioning"})
+    handler = VpcPeeringHandler(peering)
+
+    with pytest.raises(VpcPeeringConnectionWaitTimeout):
+        handler.wait_until_status(Status.ACTIVE, timeout=0)
+
+    assert sleeps == []
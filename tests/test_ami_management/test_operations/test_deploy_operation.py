@@ -1,5 +1,6 @@
+import unittest.mock
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock, call
+from unittest.mock import ANY, MagicMock, Mock, call
 
 from botocore.exceptions import ClientError
 
@@ -14,13 +15,29 @@ from cloudshell.cp.aws.domain.ami_management.operations.deploy_operation import
     DeployAMIOperation,
 )
 from cloudshell.cp.aws.domain.common.exceptions import CancellationException
+from cloudshell.cp.aws.domain.common.vm_details_provider import VmDetailsProvider
+from cloudshell.cp.aws.domain.services.ec2.image_cache import ImageMetadataCache
 from cloudshell.cp.aws.domain.services.ec2.vpc import (
     VpcNotFoundByReservationId,
     VPCService,
 )
+from cloudshell.cp.aws.domain.services.session_providers.session_cache import SessionKey
+from cloudshell.cp.aws.domain.services.waiters.instance import (
+    InstanceTerminatedException,
+)
 from cloudshell.cp.aws.models.aws_ec2_cloud_provider_resource_model import VpcMode
 from cloudshell.cp.aws.models.network_actions_models import DeployNetworkingResultModel
 
+SESSION_KEY = SessionKey("us-east-1", "fingerprint")
+
+
+class FakeResource:
+    """Boto3 resource created from the client."""
+
+    def __init__(self, client):
+        self.meta = Mock(client=client)
+        self.Vpc = Mock()
+
 
 class TestDeployOperation(TestCase):
     def setUp(self):
@@ -95,6 +112,8 @@ class TestDeployOperation(TestCase):
 
     def test_rollback(self):
         # prepare
+        ec2_client = Mock()
+        self.ec2_session = FakeResource(client=ec2_client)
         self.deploy_operation._extract_instance_id_on_cancellation = Mock()
         inst_id = Mock()
         security_group = Mock()
@@ -118,7 +137,7 @@ class TestDeployOperation(TestCase):
 
         # assert
         self.deploy_operation.instance_service.get_instance_by_id.assert_called_once_with(  # noqa
-            ec2_session=self.ec2_session, id=inst_id
+            ec2_session=ANY, id=inst_id
         )
         self.deploy_operation.instance_service.terminate_instances.assert_called_once_with(  # noqa
             [instance]
@@ -128,11 +147,55 @@ class TestDeployOperation(TestCase):
         )
         self.deploy_operation.elastic_ip_service.find_and_release_elastic_address.assert_has_calls(  # noqa
             [
-                call(ec2_session=self.ec2_session, elastic_ip="pub1"),
-                call(ec2_session=self.ec2_session, elastic_ip="pub2"),
+                call(ec2_session=ANY, elastic_ip="pub1"),
+                call(ec2_session=ANY, elastic_ip="pub2"),
             ],
             any_order=True,
         )
+        # the rollback threads don't share the resource
+        sessions = [
+            c[1]["ec2_session"]
+            for c in [
+                *self.instance_service.get_instance_by_id.call_args_list,
+                *self.elastic_ip_service.find_and_release_elastic_address.call_args_list,  # noqa: E501
+            ]
+        ]
+        self.assertEqual(len({id(s) for s in sessions}), 3)
+        self.assertNotIn(self.ec2_session, sessions)
+        self.assertTrue(all(s.meta.client is ec2_client for s in sessions))
+
+    def test_rollback_terminate_failed(self):
+        self.instance_service.terminate_instances.side_effect = ValueError("failed")
+        self.iam_client.list_attached_role_policies.side_effect = None
+        self.iam_client.list_attached_role_policies.return_value = {
+            "AttachedPolicies": []
+        }
+
+        outcomes = self.deploy_operation._rollback_deploy(
+            ec2_session=self.ec2_session,
+            iam_client=self.iam_client,
+            instance_id="i-1",
+            custom_security_group=Mock(),
+            network_config_results=[Mock(public_ip="pub1"), Mock(public_ip=None)],
+            app_name="vm_name",
+            reservation=Mock(reservation_id="rid"),
+            logger=self.logger,
+        )
+
+        self.assertEqual(
+            outcomes,
+            {
+                "instance": "failed: failed",
+                "security_group": "skipped",
+                "elastic_ip pub1": "ok",
+                "iam_profile": "ok",
+            },
+        )
+        self.security_group_service.delete_security_group.assert_not_called()
+        self.elastic_ip_service.find_and_release_elastic_address.assert_called_once_with(  # noqa
+            ec2_session=ANY, elastic_ip="pub1"
+        )
+        self.iam_client.delete_instance_profile.assert_called_once()
 
     def test_extract_instance_id_on_cancellation(self):
         # prepare
@@ -319,7 +382,508 @@ class TestDeployOperation(TestCase):
             logger=self.logger,
         )
 
+    def test_deploy_defer_credentials(self):
+        ami_datamodel = self._create_ami_datamodel()
+        ami_datamodel.wait_for_credentials = True
+        ami_datamodel.defer_credentials = True
+        ami_deploy_action = self._create_ami_deploy_action(ami_datamodel)
+        instance = self._create_instance()
+        instance.platform = "windows"
+        network_config_results = [
+            Mock(device_index=0, public_ip=instance.public_ip_address)
+        ]
+        self.instance_service.create_instance = Mock(return_value=instance)
+        self.credentials_manager.get_windows_credentials = Mock(return_value=None)
+        self._mock_deploy_operation(Mock(), network_config_results)
+
+        res = self.deploy_operation.deploy(
+            ec2_session=self.ec2_session,
+            s3_session=self.s3_session,
+            iam_client=self.iam_client,
+            name="my name",
+            reservation=Mock(),
+            aws_ec2_cp_resource_model=self.ec2_datamodel,
+            ami_deploy_action=ami_deploy_action,
+            network_actions=None,
+            ec2_client=self.ec2_client,
+            cancellation_context=CancellationContext(),
+            logger=self.logger,
+        )
+
+        self.assertFalse(
+            self.credentials_manager.get_windows_credentials.call_args[1][
+                "wait_for_password"
+            ]
+        )
+        self.assertTrue(res[0].deployedAppAdditionalData["credentials_pending"])
+        attribute_names = [a.attributeName for a in res[0].deployedAppAttributes]
+        self.assertNotIn("Password", attribute_names)
+
+    def _deploy(self, ami_deploy_action):
+        return self.deploy_operation.deploy(
+            ec2_session=self.ec2_session,
+            s3_session=self.s3_session,
+            iam_client=self.iam_client,
+            name="my name",
+            reservation=Mock(),
+            aws_ec2_cp_resource_model=self.ec2_datamodel,
+            ami_deploy_action=ami_deploy_action,
+            network_actions=None,
+            ec2_client=self.ec2_client,
+            cancellation_context=CancellationContext(),
+            logger=self.logger,
+        )
+
+    def test_deploy_passes_pre_launch_results(self):
+        ami_deploy_action = self._create_ami_deploy_action(self._create_ami_datamodel())
+        self.instance_service.create_instance = Mock(
+            return_value=self._create_instance()
+        )
+        security_group = Mock()
+        self.deploy_operation._create_security_group_for_instance = Mock(
+            return_value=security_group
+        )
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        self._deploy(ami_deploy_action)
+
+        kwargs = self.deploy_operation._create_deployment_parameters.call_args[1]
+        self.assertIs(
+            kwargs["image"], self.deploy_operation._get_available_image.return_value
+        )
+        self.assertEqual(kwargs["iam_role"], {})
+        self.assertIs(kwargs["security_group"], security_group)
+
+    def test_deploy_loads_image_with_own_resource(self):
+        ec2_client = Mock()
+        self.ec2_session = FakeResource(client=ec2_client)
+        ami_deploy_action = self._create_ami_deploy_action(self._create_ami_datamodel())
+        self.instance_service.create_instance = Mock(
+            return_value=self._create_instance()
+        )
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        self._deploy(ami_deploy_action)
+
+        image_session = self.deploy_operation._get_available_image.call_args[0][0]
+        self.assertIsNot(image_session, self.ec2_session)
+        self.assertIs(image_session.meta.client, ec2_client)
+
+    def test_deploy_pre_launch_branch_failed(self):
+        ami_deploy_action = self._create_ami_deploy_action(self._create_ami_datamodel())
+        security_group = Mock()
+        self.deploy_operation._create_security_group_for_instance = Mock(
+            return_value=security_group
+        )
+        self.deploy_operation._rollback_deploy = Mock()
+        self._mock_deploy_operation(Mock(), [])
+        self.deploy_operation._get_available_image.side_effect = ValueError("no AMI")
+
+        with self.assertRaisesRegex(ValueError, "no AMI"):
+            self._deploy(ami_deploy_action)
+
+        self.deploy_operation._create_deployment_parameters.assert_not_called()
+        # the security group created in parallel is rolled back
+        rollback_kwargs = self.deploy_operation._rollback_deploy.call_args[1]
+        self.assertIs(rollback_kwargs["custom_security_group"], security_group)
+
+    def test_deploy_vpc_failed_waits_for_branches(self):
+        ami_deploy_action = self._create_ami_deploy_action(self._create_ami_datamodel())
+        self.deploy_operation._get_vpc = Mock(side_effect=ValueError("no VPC"))
+        self.deploy_operation._rollback_deploy = Mock()
+        self._mock_deploy_operation(Mock(), [])
+
+        with self.assertRaisesRegex(ValueError, "no VPC"):
+            self._deploy(ami_deploy_action)
+
+        self.deploy_operation._get_iam_instance_profile_request.assert_called_once()
+        self.deploy_operation._rollback_deploy.assert_called_once()
+
+    def test_deploy_disables_source_dest_check_before_running(self):
+        ami_datamodel = self._create_ami_datamodel()
+        ami_datamodel.enable_source_dest_check = False
+        ami_deploy_action = self._create_ami_deploy_action(ami_datamodel)
+        instance = self._create_instance()
+        self.instance_service.create_instance = Mock(return_value=instance)
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        self._deploy(ami_deploy_action)
+
+        called = [name for name, _, _ in self.instance_service.method_calls]
+        self.assertLess(
+            called.index("disable_source_dest_check"),
+            called.index("wait_for_instance_to_run_in_aws"),
+        )
+        self.instance_service.disable_source_dest_check.assert_called_once_with(
+            self.ec2_client, instance
+        )
+
+    def test_deploy_claims_warm_pool_instance(self):
+        ami_deploy_action = self._create_ami_deploy_action(self._create_ami_datamodel())
+        instance = self._create_instance()
+        warm_pool = Mock()
+        warm_pool.claim.return_value = instance
+        self.deploy_operation.warm_pool_service = warm_pool
+        security_group = Mock(group_id="sg-app")
+        self.deploy_operation._create_security_group_for_instance = Mock(
+            return_value=security_group
+        )
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        res = self._deploy(ami_deploy_action)
+
+        self.instance_service.create_instance.assert_not_called()
+        deployment_info = self.deploy_operation._create_deployment_parameters()
+        pool_key = warm_pool.get_pool_key.return_value
+        warm_pool.claim.assert_called_once_with(self.ec2_session, pool_key, self.logger)
+        warm_pool.apply_claimed.assert_called_once_with(instance, deployment_info)
+        warm_pool.replenish_in_background.assert_called_once_with(
+            ANY, pool_key, deployment_info, ["sg-app"], ANY, self.logger
+        )
+        self.assertEqual(res[0].vmUuid, instance.instance_id)
+
+    def test_deploy_launches_instance_when_warm_pool_empty(self):
+        ami_deploy_action = self._create_ami_deploy_action(self._create_ami_datamodel())
+        instance = self._create_instance()
+        self.instance_service.create_instance = Mock(return_value=instance)
+        warm_pool = Mock()
+        warm_pool.claim.return_value = None
+        self.deploy_operation.warm_pool_service = warm_pool
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        res = self._deploy(ami_deploy_action)
+
+        self.instance_service.create_instance.assert_called_once()
+        warm_pool.apply_claimed.assert_not_called()
+        warm_pool.replenish_in_background.assert_called_once()
+        self.assertEqual(res[0].vmUuid, instance.instance_id)
+
+    def test_deploy_doesnt_use_warm_pool_for_app_not_poolable(self):
+        ami_deploy_action = self._create_ami_deploy_action(self._create_ami_datamodel())
+        self.instance_service.create_instance = Mock(
+            return_value=self._create_instance()
+        )
+        warm_pool = Mock()
+        warm_pool.is_poolable.return_value = False
+        self.deploy_operation.warm_pool_service = warm_pool
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        self._deploy(ami_deploy_action)
+
+        warm_pool.claim.assert_not_called()
+        warm_pool.replenish_in_background.assert_not_called()
+
+    def test_deploy_doesnt_replenish_warm_pool_when_launch_failed(self):
+        ami_deploy_action = self._create_ami_deploy_action(self._create_ami_datamodel())
+        self.instance_service.create_instance = Mock(
+            side_effect=Exception("launch failed")
+        )
+        warm_pool = Mock()
+        warm_pool.claim.return_value = None
+        self.deploy_operation.warm_pool_service = warm_pool
+        self.deploy_operation._rollback_deploy = Mock()
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        with self.assertRaisesRegex(Exception, "launch failed"):
+            self._deploy(ami_deploy_action)
+
+        warm_pool.replenish_in_background.assert_not_called()
+
+    def test_deploy_logs_timings(self):
+        ami_deploy_action = self._create_ami_deploy_action(self._create_ami_datamodel())
+        self.instance_service.create_instance = Mock(
+            return_value=self._create_instance()
+        )
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        with unittest.mock.patch(
+            "cloudshell.cp.aws.domain.ami_management.operations.deploy_operation."
+            "DEPLOY_TIMINGS_IN_RESULT",
+            True,
+        ):
+            res = self._deploy(ami_deploy_action)
+
+        phases = res[0].deployedAppAdditionalData["timings"]["phases"]
+        for name in ("vpc", "image", "iam_profile", "run_instances", "elastic_ips"):
+            self.assertIn(name, phases)
+        messages = [c[0][0] for c in self.logger.info.call_args_list]
+        timings_messages = [m for m in messages if m.startswith("Deploy timings:")]
+        self.assertEqual(len(timings_messages), 1)
+        self.assertIn('"app": "my name"', timings_messages[0])
+
+    def _deploy_batch(self, *ami_deploy_actions, cancellation_context=None):
+        return self.deploy_operation.deploy_batch(
+            ec2_session=self.ec2_session,
+            s3_session=self.s3_session,
+            iam_client=self.iam_client,
+            reservation=Mock(),
+            aws_ec2_cp_resource_model=self.ec2_datamodel,
+            deploy_requests=[
+                (f"app {i}", action, None)
+                for i, action in enumerate(ami_deploy_actions)
+            ],
+            ec2_client=self.ec2_client,
+            cancellation_context=cancellation_context or CancellationContext(),
+            logger=self.logger,
+        )
+
+    def test_deploy_batch_groups_identical_launches(self):
+        ami_datamodel = self._create_ami_datamodel()
+        actions = [self._create_ami_deploy_action(ami_datamodel) for _ in range(2)]
+        instances = [self._create_instance(), self._create_instance()]
+        self.instance_service.create_instances.return_value = instances
+        self.deploy_operation._get_vpc = Mock()
+        ami_deployment_info = Mock()
+        self._mock_deploy_operation(ami_deployment_info, [Mock(device_index=0)])
+        self.deploy_operation._prepare_network_config_results_dto.side_effect = (
+            lambda **kwargs: []
+        )
+
+        res = self._deploy_batch(*actions)
+
+        self.assertEqual(
+            [results[0].actionId for results in res],
+            [action.actionId for action in actions],
+        )
+        self.assertTrue(all(results[0].success for results in res))
+        self.deploy_operation._get_vpc.assert_called_once()
+        self.instance_service.create_instances.assert_called_once_with(
+            self.ec2_session, ami_deployment_info, count=2
+        )
+        self.instance_service.wait_for_instances_to_run_in_aws.assert_called_once_with(
+            instances, unittest.mock.ANY
+        )
+        self.instance_service.wait_for_instance_to_run_in_aws.assert_not_called()
+        self.assertEqual(self.instance_service.set_name_tag.call_count, 2)
+
+    def test_deploy_batch_workers_use_own_resources(self):
+        ec2_client = Mock()
+        self.ec2_session = FakeResource(client=ec2_client)
+        actions = [
+            self._create_ami_deploy_action(self._create_ami_datamodel())
+            for _ in range(2)
+        ]
+        self.instance_service.create_instances.return_value = [
+            self._create_instance(),
+            self._create_instance(),
+        ]
+        self.deploy_operation._get_vpc = Mock()
+        self.deploy_operation._create_security_group_for_instance = Mock()
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        self._deploy_batch(*actions)
+
+        sessions = [
+            c[1]["ec2_session"]
+            for c in self.deploy_operation._create_security_group_for_instance.call_args_list  # noqa: E501
+        ]
+        self.assertEqual(len(sessions), 2)
+        self.assertIsNot(sessions[0], sessions[1])
+        self.assertNotIn(self.ec2_session, sessions)
+        self.assertTrue(all(s.meta.client is ec2_client for s in sessions))
+
+    def test_deploy_batch_rolls_back_failed_app(self):
+        actions = [
+            self._create_ami_deploy_action(self._create_ami_datamodel())
+            for _ in range(2)
+        ]
+        instance = self._create_instance()
+
+        def create_instances(ec2_session, ami_deployment_info, count):
+            if ami_deployment_info.aws_ami_id == "app 1":
+                raise Exception("launch failed")
+            return [instance]
+
+        self.instance_service.create_instances.side_effect = create_instances
+        self.deploy_operation._get_vpc = Mock()
+        self.deploy_operation._rollback_deploy = Mock()
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+        self.deploy_operation._create_deployment_parameters.side_effect = (
+            lambda app_name, **kwargs: Mock(
+                aws_ami_id=app_name, block_device_mappings=[]
+            )
+        )
+
+        res = self._deploy_batch(*actions)
+
+        self.assertTrue(res[0][0].success)
+        self.assertEqual(res[0][0].vmUuid, instance.instance_id)
+        self.assertFalse(res[1][0].success)
+        self.assertIn("launch failed", res[1][0].errorMessage)
+        self.deploy_operation._rollback_deploy.assert_called_once()
+        rollback_kwargs = self.deploy_operation._rollback_deploy.call_args[1]
+        self.assertEqual(rollback_kwargs["app_name"], "app 1")
+        self.instance_service.wait_for_instances_to_run_in_aws.assert_called_once_with(
+            [instance], unittest.mock.ANY
+        )
+
+    def test_deploy_batch_rolls_back_only_terminated_apps(self):
+        actions = [
+            self._create_ami_deploy_action(self._create_ami_datamodel())
+            for _ in range(2)
+        ]
+        running, terminated = self._create_instance(), self._create_instance()
+        terminated.id = "i-terminated"
+        self.instance_service.create_instances.return_value = [running, terminated]
+        self.instance_service.wait_for_instances_to_run_in_aws.side_effect = (
+            InstanceTerminatedException({"i-terminated": "insufficient capacity"})
+        )
+        self.deploy_operation._get_vpc = Mock()
+        self.deploy_operation._rollback_deploy = Mock()
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        res = self._deploy_batch(*actions)
+
+        self.assertTrue(res[0][0].success)
+        self.assertFalse(res[1][0].success)
+        self.assertIn("insufficient capacity", res[1][0].errorMessage)
+        self.deploy_operation._rollback_deploy.assert_called_once()
+        rollback_kwargs = self.deploy_operation._rollback_deploy.call_args[1]
+        self.assertEqual(rollback_kwargs["app_name"], "app 1")
+
+    def test_deploy_batch_replenishes_warm_pool_for_launched_apps(self):
+        actions = [
+            self._create_ami_deploy_action(self._create_ami_datamodel())
+            for _ in range(2)
+        ]
+        instance = self._create_instance()
+
+        def create_instances(ec2_session, ami_deployment_info, count):
+            if ami_deployment_info.aws_ami_id == "app 1":
+                raise Exception("launch failed")
+            return [instance]
+
+        self.instance_service.create_instances.side_effect = create_instances
+        warm_pool = Mock()
+        warm_pool.claim.return_value = None
+        warm_pool.get_pool_key.side_effect = lambda session, vpc_id, info: info
+        self.deploy_operation.warm_pool_service = warm_pool
+        self.deploy_operation._get_vpc = Mock()
+        self.deploy_operation._rollback_deploy = Mock()
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+        self.deploy_operation._create_deployment_parameters.side_effect = (
+            lambda app_name, **kwargs: Mock(
+                aws_ami_id=app_name, block_device_mappings=[]
+            )
+        )
+
+        self._deploy_batch(*actions)
+
+        self.assertEqual(warm_pool.claim.call_count, 2)
+        warm_pool.replenish_in_background.assert_called_once()
+        pool_key = warm_pool.replenish_in_background.call_args[0][1]
+        self.assertEqual(pool_key.aws_ami_id, "app 0")
+
+    def test_deploy_batch_cancelled_after_results(self):
+        cancellation_context = CancellationContext()
+        instance = self._create_instance()
+        self.instance_service.create_instances.return_value = [instance]
+        self.deploy_operation._get_vpc = Mock()
+        self.deploy_operation._rollback_deploy = Mock()
+        self._mock_deploy_operation(Mock(), [Mock(device_index=0)])
+
+        def create_vm_details(*args, **kwargs):
+            cancellation_context.is_cancelled = True
+
+        self.vm_details_provider.create.side_effect = create_vm_details
+
+        res = self._deploy_batch(
+            self._create_ami_deploy_action(self._create_ami_datamodel()),
+            cancellation_context=cancellation_context,
+        )
+
+        # the deployed app isn't lost, its results are returned
+        self.assertTrue(res[0][0].success)
+        self.deploy_operation._rollback_deploy.assert_not_called()
+
+    def test_get_available_image_is_cached(self):
+        self.deploy_operation.image_cache = ImageMetadataCache()
+        ami_datamodel = Mock(aws_ami_id="ami-1")
+        self.ec2_session.Image.return_value = Mock(state="available")
+
+        first = self.deploy_operation._get_available_image(
+            self.ec2_session, SESSION_KEY, ami_datamodel
+        )
+        second = self.deploy_operation._get_available_image(
+            self.ec2_session, SESSION_KEY, ami_datamodel
+        )
+
+        self.assertIs(first, second)
+        self.ec2_session.Image.assert_called_once_with("ami-1")
+
+    def test_get_available_image_by_session(self):
+        self.deploy_operation.image_cache = ImageMetadataCache()
+        ami_datamodel = Mock(aws_ami_id="ami-1")
+        self.ec2_session.Image.return_value = Mock(state="available")
+        role_session_key = SESSION_KEY._replace(role_arn="arn:aws:iam::1:role/shared")
+
+        for session_key in (SESSION_KEY, role_session_key, None):
+            self.deploy_operation._get_available_image(
+                self.ec2_session, session_key, ami_datamodel
+            )
+
+        self.assertEqual(self.ec2_session.Image.call_count, 3)
+
+    def test_get_block_device_mappings_doesnt_change_cached_image(self):
+        self.deploy_operation.image_cache = ImageMetadataCache()
+        self.ec2_session.Image.return_value = Mock(
+            state="available",
+            root_device_name="/dev/sda1",
+            block_device_mappings=[
+                {
+                    "DeviceName": "/dev/sda1",
+                    "Ebs": {"VolumeSize": 8, "VolumeType": "gp3"},
+                },
+                {
+                    "DeviceName": "/dev/sdb",
+                    "Ebs": {"VolumeSize": 20, "VolumeType": "gp3"},
+                },
+            ],
+        )
+        ec_model = Mock(max_storage_size=0, max_storage_iops=0)
+
+        def deploy(storage_encryption_key):
+            ami = Mock(
+                aws_ami_id="ami-1",
+                root_volume_name=None,
+                storage_size=0,
+                storage_type="auto",
+                storage_encryption_key=storage_encryption_key,
+            )
+            image = self.deploy_operation._get_available_image(
+                self.ec2_session, SESSION_KEY, ami
+            )
+            return self.deploy_operation._get_block_device_mappings(
+                image=image, ami_deployment_model=ami, aws_ec2_resource_model=ec_model
+            )
+
+        encrypted = deploy("kms-1")
+        not_encrypted = deploy(None)
+
+        self.assertEqual(encrypted[1]["Ebs"]["KmsKeyId"], "kms-1")
+        self.assertEqual(
+            not_encrypted[1],
+            {"DeviceName": "/dev/sdb", "Ebs": {"VolumeSize": 20, "VolumeType": "gp3"}},
+        )
+        self.ec2_session.Image.assert_called_once_with("ami-1")
+
+    def test_get_available_image_not_available(self):
+        self.deploy_operation.image_cache = ImageMetadataCache()
+        ami_datamodel = Mock(aws_ami_id="ami-1")
+        self.ec2_session.Image.return_value = Mock(state="pending")
+
+        for _ in range(2):
+            with self.assertRaisesRegex(ValueError, "AMI ami-1 not found"):
+                self.deploy_operation._get_available_image(
+                    self.ec2_session, SESSION_KEY, ami_datamodel
+                )
+
+        self.assertEqual(self.ec2_session.Image.call_count, 2)
+
     def _mock_deploy_operation(self, ami_deployment_info, network_config_results):
+        ami_deployment_info.block_device_mappings = []
+        self.deploy_operation._get_available_image = Mock()
+        self.deploy_operation._get_iam_instance_profile_request = Mock(return_value={})
         self.deploy_operation._get_block_device_mappings = Mock()
         self.deploy_operation._create_deployment_parameters = Mock(
             return_value=ami_deployment_info
@@ -357,6 +921,33 @@ class TestDeployOperation(TestCase):
         ami_datamodel.allocate_elastic_ip = True
         return ami_datamodel
 
+    def test_get_launched_root_volume(self):
+        self.deploy_operation.vm_details_provider = VmDetailsProvider()
+        instance = Mock()
+        instance.meta.data = {
+            "RootDeviceName": "/dev/sda1",
+            "BlockDeviceMappings": [
+                {"DeviceName": "/dev/sda1", "Ebs": {"VolumeId": "vol-1"}}
+            ],
+        }
+        block_device_mappings = [
+            {"DeviceName": "/dev/sda1", "Ebs": {"VolumeSize": 30, "VolumeType": "gp3"}}
+        ]
+
+        res = self.deploy_operation._get_launched_root_volume(
+            instance, block_device_mappings
+        )
+
+        self.assertEqual(
+            res, {"vol-1": {"VolumeId": "vol-1", "Size": 30, "VolumeType": "gp3"}}
+        )
+        block_device_mappings[0]["DeviceName"] = "/dev/xvda"
+        self.assertIsNone(
+            self.deploy_operation._get_launched_root_volume(
+                instance, block_device_mappings
+            )
+        )
+
     def test_get_block_device_mappings_throws_max_storage_error(self):
         ec_model = Mock()
         ec_model.max_storage_size = 30
@@ -0,0 +1,73 @@
+from unittest import TestCase
+from unittest.mock import Mock, call
+
+from cloudshell.cp.aws.domain.ami_management.operations.refresh_credentials_operation import (  # noqa: E501
+    RefreshCredentialsOperation,
+)
+
+
+class TestRefreshCredentialsOperation(TestCase):
+    def setUp(self):
+        self.instance_service = Mock()
+        self.credentials_service = Mock()
+        self.key_pair_service = Mock()
+        self.operation = RefreshCredentialsOperation(
+            self.instance_service, self.credentials_service, self.key_pair_service
+        )
+        self.cloudshell_session = Mock()
+        self.ec2_session = Mock()
+        self.s3_session = Mock()
+        self.cancellation_context = Mock()
+
+    def _refresh_credentials(self):
+        return self.operation.refresh_credentials(
+            cloudshell_session=self.cloudshell_session,
+            ec2_session=self.ec2_session,
+            s3_session=self.s3_session,
+            deployed_instance_id="i-1",
+            key_pair_location="bucket",
+            reservation_id="rid",
+            resource_fullname="resource",
+            password_attribute_name="Gen2.Password",
+            user_attribute_name="Gen2.User",
+            logger=Mock(),
+            cancellation_context=self.cancellation_context,
+        )
+
+    def test_refresh_credentials(self):
+        instance = Mock(platform="windows")
+        self.instance_service.get_active_instance_by_id.return_value = instance
+        credentials = self.credentials_service.get_windows_credentials.return_value
+
+        res = self._refresh_credentials()
+
+        self.assertTrue(res)
+        self.instance_service.get_active_instance_by_id.assert_called_once_with(
+            self.ec2_session, "i-1"
+        )
+        self.key_pair_service.load_key_pair_by_name.assert_called_once_with(
+            s3_session=self.s3_session, bucket_name="bucket", reservation_id="rid"
+        )
+        self.credentials_service.get_windows_credentials.assert_called_once_with(
+            instance=instance,
+            key_value=self.key_pair_service.load_key_pair_by_name.return_value,
+            wait_for_password=True,
+            cancellation_context=self.cancellation_context,
+        )
+        self.cloudshell_session.SetAttributeValue.assert_has_calls(
+            [
+                call("resource", "Gen2.User", credentials.user_name),
+                call("resource", "Gen2.Password", credentials.password),
+            ]
+        )
+
+    def test_refresh_credentials_not_windows(self):
+        self.instance_service.get_active_instance_by_id.return_value = Mock(
+            platform=None
+        )
+
+        res = self._refresh_credentials()
+
+        self.assertFalse(res)
+        self.credentials_service.get_windows_credentials.assert_not_called()
+        self.cloudshell_session.SetAttributeValue.assert_not_called()
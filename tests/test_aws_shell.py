@@ -1,11 +1,24 @@
+from collections import Counter
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+import boto3
+from jsonpickle import encode
+
 from cloudshell.cp.core.models import DeployApp
 
 from cloudshell.cp.aws.aws_shell import AWSShell
 from cloudshell.cp.aws.common.deploy_data_holder import DeployDataHolder
 from cloudshell.cp.aws.domain.context.aws_shell import AwsShellContextModel
+from cloudshell.cp.aws.domain.services.session_providers.aws_session_provider import (
+    AWSSessionProvider,
+)
+from cloudshell.cp.aws.domain.services.session_providers.session_cache import (
+    AssumeRoleCredentialsCache,
+    AwsSessionCache,
+    DecryptedPasswordsCache,
+)
+from cloudshell.cp.aws.models.aws_ec2_cloud_provider_resource_model import VpcMode
 from cloudshell.cp.aws.models.reservation_model import ReservationModel
 
 
@@ -85,6 +98,97 @@ class TestAWSShell(TestCase):
             ec2_client=self.expected_shell_context.aws_api.ec2_client,
             cancellation_context=cancellation_context,
             logger=self.expected_shell_context.logger,
+            ec2_session_key=self.expected_shell_context.aws_api.ec2_session_key,
+        )
+
+    def test_deploy_ami_creates_one_client_per_service(self):
+        self.aws_shell.aws_session_manager = AWSSessionProvider(
+            AwsSessionCache(), AssumeRoleCredentialsCache(), DecryptedPasswordsCache()
+        )
+        aws_ec2_resource_model = Mock(
+            region="us-east-1",
+            aws_access_key_id="access key",
+            aws_secret_access_key="secret key",
+            vpc_mode=VpcMode.DYNAMIC,
+        )
+        cloudshell_session = Mock()
+        cloudshell_session.DecryptPassword.side_effect = lambda value: Mock(Value=value)
+        # resources create their clients with Session.client too
+        created_clients = Counter()
+        create_client = boto3.session.Session.client
+
+        def client(session, service_name, *args, **kwargs):
+            created_clients[service_name] += 1
+            return create_client(session, service_name, *args, **kwargs)
+
+        def deploy(ec2_session, s3_session, iam_client, ec2_client, **kwargs):
+            # the operation gives every worker thread its own resource
+            for _ in range(2):
+                type(ec2_session)(client=ec2_session.meta.client).Instance("i-1")
+            s3_session.Bucket("bucket")
+            return Mock()
+
+        self.aws_shell.deploy_ami_operation.deploy = Mock(side_effect=deploy)
+        deploy_app = DeployApp()
+        deploy_app.actionParams = Mock()
+
+        with patch("cloudshell.cp.aws.domain.context.aws_shell.LoggingSessionContext"):
+            with patch(
+                "cloudshell.cp.aws.domain.context.aws_shell.CloudShellSessionContext"
+            ) as cloudshell_session_context:
+                cloudshell_session_context.return_value.__enter__.return_value = (
+                    cloudshell_session
+                )
+                with patch(
+                    "cloudshell.cp.aws.domain.context.aws_shell."
+                    "AwsResourceModelContext"
+                ) as resource_model_context:
+                    resource_model_context.return_value.__enter__.return_value = (
+                        aws_ec2_resource_model
+                    )
+                    with patch.object(boto3.session.Session, "client", client):
+                        for _ in range(2):
+                            self.aws_shell.deploy_ami(
+                                self.command_context, [deploy_app], Mock()
+                            )
+
+        self.assertEqual(self.aws_shell.deploy_ami_operation.deploy.call_count, 2)
+        self.assertEqual(created_clients, {"ec2": 1, "s3": 1, "iam": 1})
+
+    def test_deploy_ami_batch(self):
+        cancellation_context = Mock()
+        first_result, second_result = Mock(), Mock()
+        self.aws_shell.deploy_ami_operation.deploy_batch = Mock(
+            return_value=[[first_result], [second_result]]
+        )
+        deploy_apps = [DeployApp(), DeployApp()]
+        for deploy_app in deploy_apps:
+            deploy_app.actionParams = Mock()
+
+        with patch("cloudshell.cp.aws.aws_shell.AwsShellContext") as shell_context:
+            shell_context.return_value = self.mock_context
+
+            res = self.aws_shell.deploy_ami_batch(
+                self.command_context,
+                [[deploy_app] for deploy_app in deploy_apps],
+                cancellation_context,
+            )
+
+        self.assertEqual(res, [first_result, second_result])
+        self.aws_shell.deploy_ami_operation.deploy_batch.assert_called_once_with(
+            ec2_session=self.expected_shell_context.aws_api.ec2_session,
+            s3_session=self.expected_shell_context.aws_api.s3_session,
+            iam_client=self.expected_shell_context.aws_api.iam_client,
+            reservation=self.reservation_model,
+            aws_ec2_cp_resource_model=self.expected_shell_context.aws_ec2_resource_model,  # noqa: E501
+            deploy_requests=[
+                (deploy_app.actionParams.appName, deploy_app, [])
+                for deploy_app in deploy_apps
+            ],
+            ec2_client=self.expected_shell_context.aws_api.ec2_client,
+            cancellation_context=cancellation_context,
+            logger=self.expected_shell_context.logger,
+            ec2_session_key=self.expected_shell_context.aws_api.ec2_session_key,
         )
 
     def test_cleanup_connectivity(self):
@@ -305,3 +409,65 @@ class TestAWSShell(TestCase):
             public_ip_on_resource="public_ip",
             resource_fullname="resource_name",
         )
+
+    def test_refresh_credentials(self):
+        self.aws_shell.model_parser.try_get_deployed_connected_resource_instance_id = (
+            Mock(return_value="instance_id")
+        )
+        self.aws_shell.model_parser.get_connectd_resource_fullname = Mock(
+            return_value="resource_name"
+        )
+        self.aws_shell.model_parser.get_credentials_attrs_from_connected_resource_details = Mock(  # noqa: E501
+            return_value=("Gen2.User", "Gen2.Password")
+        )
+        self.aws_shell.refresh_credentials_operation.refresh_credentials = Mock()
+        cancellation_context = Mock()
+
+        with patch("cloudshell.cp.aws.aws_shell.AwsShellContext") as shell_context:
+            shell_context.return_value = self.mock_context
+
+            self.aws_shell.refresh_credentials(
+                self.command_context, cancellation_context
+            )
+
+        self.aws_shell.refresh_credentials_operation.refresh_credentials.assert_called_once_with(  # noqa: E501
+            cloudshell_session=self.expected_shell_context.cloudshell_session,
+            ec2_session=self.expected_shell_context.aws_api.ec2_session,
+            s3_session=self.expected_shell_context.aws_api.s3_session,
+            deployed_instance_id="instance_id",
+            key_pair_location=(
+                self.expected_shell_context.aws_ec2_resource_model.key_pairs_location
+            ),
+            reservation_id=self.command_context.reservation.reservation_id,
+            resource_fullname="resource_name",
+            password_attribute_name="Gen2.Password",
+            user_attribute_name="Gen2.User",
+            logger=self.expected_shell_context.logger,
+            cancellation_context=cancellation_context,
+        )
+
+    def test_get_vm_details(self):
+        requests_json = encode(
+            {
+                "items": [
+                    {"deployedAppJson": {"name": f"app {i}", "vmdetails": {"uid": i}}}
+                    for i in range(3)
+                ]
+            }
+        )
+        cancellation_context = Mock(is_cancelled=False)
+        self.aws_shell.vm_details_operation.get_vm_details_list = Mock(return_value=[])
+
+        with patch("cloudshell.cp.aws.aws_shell.AwsShellContext") as shell_context:
+            shell_context.return_value = self.mock_context
+
+            # act
+            self.aws_shell.get_vm_details(
+                self.command_context, cancellation_context, requests_json
+            )
+
+        shell_context.assert_called_once()
+        requests = self.aws_shell.vm_details_operation.get_vm_details_list.call_args[1][
+            "requests"
+        ]
+        self.assertEqual([r.app_name for r in requests], ["app 0", "app 1", "app 2"])
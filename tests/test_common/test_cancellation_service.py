@@ -1,7 +1,10 @@
+import threading
+import time
 from unittest import TestCase
 from unittest.mock import Mock
 
 from cloudshell.cp.aws.domain.common.cancellation_service import (
+    CancellationToken,
     CommandCancellationService,
 )
 from cloudshell.cp.aws.domain.common.exceptions import CancellationException
@@ -33,3 +36,56 @@ class TestCancellationService(TestCase):
             cancellation_service.check_if_cancelled(cancellation_context, data=data)
 
         self.assertEqual(assert_exc.exception.data, data)
+
+
+class TestCancellationToken(TestCase):
+    def test_wait_wakes_up_when_context_is_cancelled(self):
+        cancellation_context = Mock(is_cancelled=False)
+        cancellation_token = CancellationToken.from_context(cancellation_context)
+        threading.Timer(
+            0.1, setattr, (cancellation_context, "is_cancelled", True)
+        ).start()
+
+        start_time = time.monotonic()
+        cancelled = cancellation_token.wait(10)
+
+        self.assertTrue(cancelled)
+        self.assertLess(time.monotonic() - start_time, 2)
+        self.assertTrue(cancellation_token.is_cancelled)
+
+    def test_wait_timeout(self):
+        cancellation_token = CancellationToken(Mock(is_cancelled=False))
+
+        self.assertFalse(cancellation_token.wait(0.01))
+
+    def test_from_context_returns_token(self):
+        cancellation_token = CancellationToken()
+
+        self.assertIs(
+            CancellationToken.from_context(cancellation_token), cancellation_token
+        )
+        self.assertFalse(CancellationToken.from_context(None).is_cancelled)
+
+    def test_callbacks(self):
+        cancellation_token = CancellationToken()
+        callback = Mock()
+        removed_callback = Mock()
+        cancellation_token.add_callback(callback)
+        cancellation_token.add_callback(removed_callback)()
+
+        cancellation_token.cancel()
+        cancellation_token.cancel()
+        late_callback = Mock()
+        cancellation_token.add_callback(late_callback)
+
+        callback.assert_called_once_with()
+        removed_callback.assert_not_called()
+        late_callback.assert_called_once_with()
+
+    def test_raise_if_cancelled(self):
+        cancellation_token = CancellationToken()
+        cancellation_token.raise_if_cancelled()
+        cancellation_token.cancel()
+
+        with self.assertRaisesRegex(CancellationException, "Command was cancelled"):
+            CommandCancellationService.check_if_cancelled(cancellation_token)
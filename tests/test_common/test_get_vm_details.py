@@ -49,42 +49,26 @@ class TestGetVmDetails(TestCase):
 
         self.assertTrue(res_list[0]["appName"] == "something")
 
-    def test_get_volume_when_empty(self):
-        instance = Mock()
-        instance.volumes.all = lambda: []
-        volume = self.vmDetailsProvider._get_volume(instance)
-        self.assertTrue(volume is None)
-
-    def test_get_volume(self):
-        volume1 = "hi"
-        instance = Mock()
-        instance.volumes.all = lambda: [volume1]
-        volume = self.vmDetailsProvider._get_volume(instance)
-        self.assertTrue(volume == volume1)
-
-    def test_get_volume_size(self):
-        volume = Mock()
-        volume.size = 10
-        size = self.vmDetailsProvider._get_volume_size(volume)
-        self.assertTrue(size == "10 GiB")
-        volume = None
-        size = self.vmDetailsProvider._get_volume_size(volume)
-        self.assertTrue(size is None)
+    def test_get_root_volume_id_when_empty(self):
+        volume_id = self.vmDetailsProvider.get_root_volume_id({})
+        self.assertTrue(volume_id is None)
 
-    def test_get_volume_type(self):
-        volume = Mock()
-        volume.volume_type = "hi"
-        volume_type = self.vmDetailsProvider._get_volume_type(volume)
-        self.assertTrue(volume_type == "hi")
-        volume = None
-        volume_type = self.vmDetailsProvider._get_volume_type(volume)
-        self.assertTrue(volume_type is None)
+    def test_get_root_volume_id(self):
+        instance_data = {
+            "RootDeviceName": "/dev/sda1",
+            "BlockDeviceMappings": [
+                {"DeviceName": "/dev/sdb", "Ebs": {"VolumeId": "vol-2"}},
+                {"DeviceName": "/dev/sda1", "Ebs": {"VolumeId": "vol-1"}},
+            ],
+        }
+        volume_id = self.vmDetailsProvider.get_root_volume_id(instance_data)
+        self.assertTrue(volume_id == "vol-1")
 
-    def test_get_volume_id(self):
-        volume = Mock()
-        volume.volume_id = "hi"
-        volume_id = self.vmDetailsProvider._get_volume_id(volume)
-        self.assertTrue(volume_id == "hi")
-        volume = None
-        volume_id = self.vmDetailsProvider._get_volume_id(volume)
-        self.assertTrue(volume_id is None)
+    def test_get_root_volume_id_without_root_device_name(self):
+        instance_data = {
+            "BlockDeviceMappings": [
+                {"DeviceName": "/dev/sdb", "Ebs": {"VolumeId": "vol-2"}},
+            ],
+        }
+        volume_id = self.vmDetailsProvider.get_root_volume_id(instance_data)
+        self.assertTrue(volume_id == "vol-2")
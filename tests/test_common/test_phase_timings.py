@@ -0,0 +1,87 @@
+import threading
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.cp.aws.domain.common.phase_timings import (
+    AWS_CALLS_HANDLER_ID,
+    PhaseTimings,
+)
+
+
+class TestPhaseTimings(TestCase):
+    def setUp(self):
+        self.timings = PhaseTimings()
+        self.client = Mock()
+        PhaseTimings.count_aws_calls(self.client)
+        self.handler = self.client.meta.events.register.call_args[0][1]
+
+    def test_count_aws_calls_registers_handler(self):
+        self.client.meta.events.register.assert_called_once_with(
+            "before-call", self.handler, unique_id=AWS_CALLS_HANDLER_ID
+        )
+
+    def test_phase_counts_aws_calls(self):
+        with self.timings.phase("vpc"):
+            self.handler(model=Mock())
+            self.handler(model=Mock())
+        with self.timings.phase("security_group"):
+            self.handler(model=Mock())
+        # calls outside of phases aren't counted
+        self.handler(model=Mock())
+
+        phases = self.timings.get_phases()
+        self.assertEqual(phases["vpc"].aws_calls, 2)
+        self.assertEqual(phases["security_group"].aws_calls, 1)
+
+    def test_nested_phase_counts_innermost(self):
+        with self.timings.phase("outer"):
+            with self.timings.phase("inner"):
+                self.handler()
+            self.handler()
+
+        phases = self.timings.get_phases()
+        self.assertEqual(phases["inner"].aws_calls, 1)
+        self.assertEqual(phases["outer"].aws_calls, 1)
+
+    def test_timed_runs_in_other_thread(self):
+        func = self.timings.timed("image", lambda: self.handler())
+        thread = threading.Thread(target=func)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(self.timings.get_phases()["image"].aws_calls, 1)
+
+    def test_phase_sums_up_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.timings.phase("tagging"):
+                self.handler()
+                raise ValueError
+        with self.timings.phase("tagging"):
+            self.handler()
+
+        self.assertEqual(self.timings.get_phases()["tagging"].aws_calls, 2)
+
+    def test_merge_and_to_dict(self):
+        shared = PhaseTimings()
+        with shared.phase("run_instances"):
+            self.handler()
+        with self.timings.phase("run_instances"):
+            self.handler()
+
+        self.timings.merge(shared)
+
+        result = self.timings.to_dict()
+        self.assertEqual(result["phases"]["run_instances"]["aws_calls"], 2)
+        self.assertGreaterEqual(result["phases"]["run_instances"]["duration"], 0)
+        self.assertGreaterEqual(result["total"], 0)
+
+    def test_to_dict_marks_polled_phases(self):
+        with self.timings.phase("status_check_wait", polled=True):
+            self.handler()
+        with self.timings.phase("tagging"):
+            self.handler()
+
+        phases = self.timings.to_dict()["phases"]
+        self.assertEqual(phases["status_check_wait"]["aws_calls"], 1)
+        self.assertTrue(phases["status_check_wait"]["polled"])
+        self.assertNotIn("polled", phases["tagging"])
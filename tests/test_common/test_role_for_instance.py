@@ -0,0 +1,117 @@
+from multiprocessing import TimeoutError  # noqa: A004
+from unittest import TestCase
+from unittest.mock import Mock, call
+
+from botocore.exceptions import ClientError
+
+from cloudshell.cp.aws.common.role_for_instance import (
+    create_profile_for_instance,
+    delete_profile_for_instance,
+    wait_for_instance_profile,
+)
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter
+
+NO_SUCH_ENTITY = ClientError(
+    {"Error": {"Code": "NoSuchEntity", "Message": "not found"}}, "GetInstanceProfile"
+)
+
+
+class TestRoleForInstance(TestCase):
+    def setUp(self):
+        self.iam_client = Mock()
+        self.iam_client.get_instance_profile.return_value = {
+            "InstanceProfile": {"Roles": [{"RoleName": "app-rid"}]}
+        }
+        self.reservation = Mock(reservation_id="rid")
+        self.logger = Mock()
+        self.waiter = BackoffWaiter("test", initial_delay=0, max_delay=0, timeout=1)
+
+    def test_create_profile_for_instance(self):
+        deploy_app = Mock(policies_arns_for_new_role=["arn1", "arn2"])
+
+        role_name = create_profile_for_instance(
+            "app", deploy_app, self.iam_client, self.reservation, self.logger
+        )
+
+        self.assertEqual(role_name, "app-rid")
+        self.iam_client.create_role.assert_called_once()
+        self.iam_client.attach_role_policy.assert_has_calls(
+            [
+                call(RoleName="app-rid", PolicyArn="arn1"),
+                call(RoleName="app-rid", PolicyArn="arn2"),
+            ],
+            any_order=True,
+        )
+        self.iam_client.create_instance_profile.assert_called_once()
+        self.iam_client.add_role_to_instance_profile.assert_called_once_with(
+            InstanceProfileName="app-rid", RoleName="app-rid"
+        )
+        self.iam_client.get_instance_profile.assert_called_once_with(
+            InstanceProfileName="app-rid"
+        )
+
+    def test_create_profile_for_instance_policy_failed(self):
+        deploy_app = Mock(policies_arns_for_new_role=["arn1"])
+        self.iam_client.attach_role_policy.side_effect = ValueError("no policy")
+
+        with self.assertRaisesRegex(ValueError, "no policy"):
+            create_profile_for_instance(
+                "app", deploy_app, self.iam_client, self.reservation, self.logger
+            )
+
+        self.iam_client.add_role_to_instance_profile.assert_not_called()
+
+    def test_wait_for_instance_profile(self):
+        profile = {"Roles": [{"RoleName": "app-rid"}]}
+        self.iam_client.get_instance_profile.side_effect = [
+            NO_SUCH_ENTITY,
+            {"InstanceProfile": {"Roles": []}},
+            {"InstanceProfile": profile},
+        ]
+
+        result = wait_for_instance_profile(
+            self.iam_client, "app-rid", self.logger, self.waiter
+        )
+
+        self.assertEqual(result, profile)
+        self.assertEqual(self.iam_client.get_instance_profile.call_count, 3)
+
+    def test_wait_for_instance_profile_timeout(self):
+        self.iam_client.get_instance_profile.side_effect = NO_SUCH_ENTITY
+        waiter = BackoffWaiter("test", initial_delay=0, max_delay=0, timeout=0)
+
+        with self.assertRaises(TimeoutError):
+            wait_for_instance_profile(self.iam_client, "app-rid", self.logger, waiter)
+
+    def test_delete_profile_for_instance(self):
+        self.iam_client.list_attached_role_policies.return_value = {
+            "AttachedPolicies": [{"PolicyArn": "arn1"}, {"PolicyArn": "arn2"}]
+        }
+
+        delete_profile_for_instance(
+            "app", self.iam_client, self.reservation, self.logger
+        )
+
+        self.iam_client.detach_role_policy.assert_has_calls(
+            [
+                call(RoleName="app-rid", PolicyArn="arn1"),
+                call(RoleName="app-rid", PolicyArn="arn2"),
+            ],
+            any_order=True,
+        )
+        self.iam_client.remove_role_from_instance_profile.assert_called_once_with(
+            InstanceProfileName="app-rid", RoleName="app-rid"
+        )
+        self.iam_client.delete_role.assert_called_once_with(RoleName="app-rid")
+        self.iam_client.delete_instance_profile.assert_called_once_with(
+            InstanceProfileName="app-rid"
+        )
+
+    def test_delete_profile_for_instance_without_role(self):
+        self.iam_client.list_attached_role_policies.side_effect = NO_SUCH_ENTITY
+
+        delete_profile_for_instance(
+            "app", self.iam_client, self.reservation, self.logger
+        )
+
+        self.iam_client.delete_role.assert_not_called()
@@ -10,48 +10,87 @@ class TestVmDetailsProvider(TestCase):
 
     def test_prepare_vm_details(self):
         instance = Mock()
-        instance.image_id = "image_id"
-        instance.instance_type = "instance_type"
-        instance.platform = "instance_platform"
-        instance.network_interfaces = []
-        instance.volumes.all = lambda: []
-        instance.iam_instance_profile = {"Arn": "arn:aws:iam::admin_role"}
+        instance.meta.data = {
+            "ImageId": "image_id",
+            "InstanceType": "instance_type",
+            "Platform": "instance_platform",
+            "NetworkInterfaces": [],
+            "BlockDeviceMappings": [],
+            "IamInstanceProfile": {"Arn": "arn:aws:iam::admin_role"},
+        }
 
         vm_instance_data = self.vm_details_provider.create(instance).vmInstanceData
 
-        self.assertTrue(
-            self._get_value(vm_instance_data, "AMI ID") == instance.image_id
+        self.assertEqual(self._get_value(vm_instance_data, "AMI ID"), "image_id")
+        self.assertEqual(
+            self._get_value(vm_instance_data, "instance type"), "instance_type"
         )
-        self.assertTrue(
-            self._get_value(vm_instance_data, "instance type") == instance.instance_type
+        self.assertEqual(
+            self._get_value(vm_instance_data, "platform"), "instance_platform"
         )
-        self.assertTrue(
-            self._get_value(vm_instance_data, "platform") == instance.platform
+        self.assertEqual(
+            self._get_value(vm_instance_data, "IAM Role"), "arn:aws:iam::admin_role"
         )
-        self.assertTrue(
-            self._get_value(vm_instance_data, "IAM Role")
-            == instance.iam_instance_profile["Arn"]
+        self.assertIsNone(self._get_value(vm_instance_data, "Storage Name"))
+
+    def test_create_makes_one_call_per_instance_and_root_volume(self):
+        instance = Mock(spec=["reload", "meta"])
+        instance.meta.data = {
+            "ImageId": "image_id",
+            "RootDeviceName": "/dev/sda1",
+            "BlockDeviceMappings": [
+                {"DeviceName": "/dev/sda1", "Ebs": {"VolumeId": "vol-1"}}
+            ],
+            "NetworkInterfaces": [
+                self._get_network_interface_data("eni-1", 0),
+                self._get_network_interface_data("eni-2", 1),
+            ],
+        }
+        ec2_client = instance.meta.client
+        ec2_client.describe_volumes.return_value = {
+            "Volumes": [{"VolumeId": "vol-1", "Size": 8, "VolumeType": "gp2"}]
+        }
+
+        vm_details = self.vm_details_provider.create(instance)
+
+        instance.reload.assert_called_once_with()
+        ec2_client.describe_volumes.assert_called_once_with(
+            Filters=[{"Name": "volume-id", "Values": ["vol-1"]}]
+        )
+        self.assertEqual(len(ec2_client.method_calls), 1)
+        self.assertEqual(len(vm_details.vmNetworkData), 2)
+        self.assertEqual(
+            self._get_value(vm_details.vmInstanceData, "Storage Size"), "8 GiB"
         )
 
-    def test_prepare_network_interface_objects_with_elastic_ip(self):
-        # elastic_ip
-        network_interface = Mock()
-        network_interface.association_attribute = {
-            "IpOwnerId": "9929230",
-            "PublicIp": "public_ip",
+    def test_create_with_volumes_makes_one_call(self):
+        instance = Mock(spec=["reload", "meta"])
+        instance.meta.data = {
+            "RootDeviceName": "/dev/sda1",
+            "BlockDeviceMappings": [
+                {"DeviceName": "/dev/sda1", "Ebs": {"VolumeId": "vol-1"}}
+            ],
+            "NetworkInterfaces": [self._get_network_interface_data("eni-1", 0)],
         }
+        volumes = {"vol-1": {"VolumeId": "vol-1", "Size": 8, "VolumeType": "gp2"}}
 
-        network_interface.network_interface_id = "interface_id"
-        network_interface.mac_address = "mac_address"
-        network_interface.subnet_id = "subnet_id"
-        network_interface.attachment = {"DeviceIndex": 0}
-        network_interface.private_ip_address = "private_ip"
+        vm_details = self.vm_details_provider.create(instance, volumes=volumes)
 
-        instance = Mock()
-        instance.network_interfaces = [network_interface]
+        instance.reload.assert_called_once_with()
+        self.assertEqual(instance.meta.client.method_calls, [])
+        self.assertEqual(
+            self._get_value(vm_details.vmInstanceData, "Storage Type"), "gp2"
+        )
+
+    def test_prepare_network_interface_objects_with_elastic_ip(self):
+        network_interface = self._get_network_interface_data(
+            "interface_id",
+            0,
+            association={"IpOwnerId": "9929230", "PublicIp": "public_ip"},
+        )
 
         network_interface_objects = self.vm_details_provider._get_vm_network_data(
-            instance
+            {"NetworkInterfaces": [network_interface]}
         )
 
         nio = network_interface_objects[0]
@@ -66,21 +105,12 @@ class TestVmDetailsProvider(TestCase):
         self.assertTrue(self._get_value(nio_data, "Public IP") == "public_ip")
 
     def test_prepare_network_interface_objects_with_public_ip(self):
-        network_interface = Mock()
-        network_interface.association_attribute = {}
-
-        network_interface.network_interface_id = "interface_id"
-        network_interface.mac_address = "mac_address"
-        network_interface.subnet_id = "subnet_id"
-        network_interface.attachment = {"DeviceIndex": 0}
-        network_interface.private_ip_address = "private_ip"
-
-        instance = Mock()
-        instance.public_ip_address = "public_ip"
-        instance.network_interfaces = [network_interface]
+        network_interface = self._get_network_interface_data(
+            "interface_id", 0, association={}
+        )
 
         network_interface_objects = self.vm_details_provider._get_vm_network_data(
-            instance
+            {"NetworkInterfaces": [network_interface]}
         )
 
         nio = network_interface_objects[0]
@@ -96,20 +126,10 @@ class TestVmDetailsProvider(TestCase):
         self.assertTrue(self._get_value(nio_data, "Public IP") == "")
 
     def test_prepare_network_interface_objects_without_public_ip(self):
-        network_interface = Mock()
-        network_interface.association_attribute = {}
-
-        network_interface.network_interface_id = "interface_id"
-        network_interface.mac_address = "mac_address"
-        network_interface.subnet_id = "subnet_id"
-        network_interface.attachment = {"DeviceIndex": 1}
-        network_interface.private_ip_address = "private_ip"
-
-        instance = Mock()
-        instance.network_interfaces = [network_interface]
+        network_interface = self._get_network_interface_data("interface_id", 1)
 
         network_interface_objects = self.vm_details_provider._get_vm_network_data(
-            instance
+            {"NetworkInterfaces": [network_interface]}
         )
 
         nio = network_interface_objects[0]
@@ -124,8 +144,70 @@ class TestVmDetailsProvider(TestCase):
         self.assertTrue(self._get_value(nio_data, "IP") == "private_ip")
         self.assertTrue(self._get_value(nio_data, "Public IP") == "")
 
+    @staticmethod
+    def _get_network_interface_data(interface_id, device_index, association=None):
+        network_interface = {
+            "NetworkInterfaceId": interface_id,
+            "SubnetId": "subnet_id",
+            "PrivateIpAddress": "private_ip",
+            "MacAddress": "mac_address",
+            "Attachment": {"DeviceIndex": device_index},
+        }
+        if association is not None:
+            network_interface["Association"] = association
+        return network_interface
+
     def _get_value(self, data, key):
         for item in data:
             if item.key == key:
                 return item.value
         return None
+
+    def test_create_from_description(self):
+        instance_data = {
+            "ImageId": "image_id",
+            "InstanceType": "instance_type",
+            "VpcId": "vpc_id",
+            "Placement": {"AvailabilityZone": "zone"},
+            "IamInstanceProfile": {"Arn": "arn:aws:iam::1:instance-profile/role"},
+            "RootDeviceName": "/dev/sda1",
+            "BlockDeviceMappings": [
+                {"DeviceName": "/dev/sdb", "Ebs": {"VolumeId": "vol-2"}},
+                {"DeviceName": "/dev/sda1", "Ebs": {"VolumeId": "vol-1"}},
+            ],
+            "NetworkInterfaces": [
+                {
+                    "NetworkInterfaceId": "interface_2",
+                    "SubnetId": "subnet_id",
+                    "PrivateIpAddress": "private_ip_2",
+                    "MacAddress": "mac_address",
+                    "Attachment": {"DeviceIndex": 1},
+                },
+                {
+                    "NetworkInterfaceId": "interface_1",
+                    "SubnetId": "subnet_id",
+                    "PrivateIpAddress": "private_ip",
+                    "MacAddress": "mac_address",
+                    "Attachment": {"DeviceIndex": 0},
+                    "Association": {"IpOwnerId": "9929230", "PublicIp": "public_ip"},
+                },
+            ],
+        }
+        volumes = {"vol-1": {"VolumeId": "vol-1", "Size": 8, "VolumeType": "gp2"}}
+
+        vm_details = self.vm_details_provider.create_from_description(
+            instance_data, volumes
+        )
+
+        vm_instance_data = vm_details.vmInstanceData
+        self.assertEqual(self._get_value(vm_instance_data, "platform"), "linux")
+        self.assertEqual(self._get_value(vm_instance_data, "Storage Name"), "vol-1")
+        self.assertEqual(self._get_value(vm_instance_data, "Storage Type"), "gp2")
+        self.assertEqual(self._get_value(vm_instance_data, "Storage Size"), "8 GiB")
+        self.assertEqual(self._get_value(vm_instance_data, "IAM Role"), "role")
+        nio = vm_details.vmNetworkData[0]
+        self.assertEqual(nio.interfaceId, "interface_1")
+        self.assertTrue(nio.isPrimary)
+        self.assertTrue(self._get_value(nio.networkData, "Elastic IP"))
+        self.assertEqual(nio.publicIpAddress, "public_ip")
+        self.assertFalse(vm_details.vmNetworkData[1].isPrimary)
@@ -60,6 +60,27 @@ class TestCleanupSandboxInfra(TestCase):
         )
         self.vpc_serv.delete_all_blackhole_routes.called_once_with(vpc)
 
+    def test_cleanup_stops_warm_pool_replenishers_first(self):
+        manager = Mock()
+        cleanup_operation = CleanupSandboxInfraOperation(
+            manager.vpc_service, self.key_pair_serv, manager.warm_pool_service
+        )
+
+        cleanup_operation.cleanup(
+            self.aws_api_clients,
+            aws_model=self.aws_model,
+            reservation_id="rid",
+            logger=self.logger,
+            actions=[PrepareCloudInfra()],
+        )
+
+        calls = [name for name, _, _ in manager.mock_calls]
+        self.assertEqual(calls[0], "warm_pool_service.stop_replenishers")
+        manager.warm_pool_service.stop_replenishers.assert_called_once_with(
+            "rid", self.logger
+        )
+        self.assertIn("vpc_service.delete_all_instances", calls)
+
     def test_cleanup_no_vpc(self):
         vpc_serv = Mock()
         vpc_serv.find_vpc_for_reservation = Mock(return_value=None)
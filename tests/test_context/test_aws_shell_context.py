@@ -1,6 +1,8 @@
 from unittest import TestCase, mock
 from unittest.mock import Mock, patch
 
+from botocore.exceptions import ClientError
+
 from cloudshell.cp.aws.domain.context.aws_shell import (
     AwsShellContext,
     AwsShellContextModel,
@@ -57,3 +59,59 @@ class AwsAwsShellContext(TestCase):
                             self.assertEqual(
                                 aws_shell_context.aws_api, expected_context.aws_api
                             )
+
+    def test_aws_shell_context_invalidates_sessions_on_credentials_error(self):
+        aws_session_manager = Mock()
+        error = ClientError({"Error": {"Code": "AuthFailure"}}, "DescribeVpcs")
+        with patch("cloudshell.cp.aws.domain.context.aws_shell.LoggingSessionContext"):
+            with patch(
+                "cloudshell.cp.aws.domain.context.aws_shell.CloudShellSessionContext"
+            ):
+                with patch(
+                    "cloudshell.cp.aws.domain.context.aws_shell."
+                    "AwsResourceModelContext"
+                ):
+                    with patch(
+                        "cloudshell.cp.aws.domain.context.aws_shell."
+                        "AwsApiSessionContext"
+                    ):
+                        with self.assertRaises(ClientError):
+                            with AwsShellContext(
+                                context=Mock(), aws_session_manager=aws_session_manager
+                            ) as aws_shell_context:
+                                raise error
+
+        aws_session_manager.invalidate_sessions.assert_called_once_with(
+            cloudshell_session=aws_shell_context.cloudshell_session,
+            aws_ec2_data_model=aws_shell_context.aws_ec2_resource_model,
+        )
+
+    def test_aws_shell_context_keeps_error_when_invalidation_fails(self):
+        aws_session_manager = Mock()
+        aws_session_manager.invalidate_sessions.side_effect = Exception(
+            "decryption failed"
+        )
+        error = ClientError({"Error": {"Code": "AuthFailure"}}, "DescribeVpcs")
+        with patch(
+            "cloudshell.cp.aws.domain.context.aws_shell.LoggingSessionContext"
+        ) as logging_context:
+            with patch(
+                "cloudshell.cp.aws.domain.context.aws_shell.CloudShellSessionContext"
+            ):
+                with patch(
+                    "cloudshell.cp.aws.domain.context.aws_shell."
+                    "AwsResourceModelContext"
+                ):
+                    with patch(
+                        "cloudshell.cp.aws.domain.context.aws_shell."
+                        "AwsApiSessionContext"
+                    ):
+                        with self.assertRaises(ClientError) as ctx:
+                            with AwsShellContext(
+                                context=Mock(), aws_session_manager=aws_session_manager
+                            ):
+                                raise error
+
+        self.assertIs(ctx.exception, error)
+        logger = logging_context.return_value.__enter__.return_value
+        logger.exception.assert_called_with("Failed to invalidate cached AWS sessions")
@@ -0,0 +1,105 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.cp.aws.domain.common.vm_details_provider import VmDetailsProvider
+from cloudshell.cp.aws.domain.deployed_app.operations.vm_details_operation import (
+    VmDetailsOperation,
+)
+
+
+class TestVmDetailsOperation(TestCase):
+    def setUp(self):
+        self.instance_service = Mock()
+        self.ec2_storage_service = Mock()
+        self.operation = VmDetailsOperation(
+            instance_service=self.instance_service,
+            vm_details_provider=VmDetailsProvider(),
+            ec2_storage_service=self.ec2_storage_service,
+        )
+        self.ec2_client = Mock()
+        self.cancellation_context = Mock(is_cancelled=False)
+        self.instance_service.describe_instances.return_value = {
+            "i-1": self._get_instance_data("i-1", "vol-1"),
+            "i-2": self._get_instance_data("i-2", "vol-2"),
+        }
+        self.ec2_storage_service.describe_volumes.return_value = {
+            "vol-1": {"VolumeId": "vol-1", "Size": 8, "VolumeType": "gp2"},
+            "vol-2": {"VolumeId": "vol-2", "Size": 16, "VolumeType": "gp3"},
+        }
+
+    @staticmethod
+    def _get_instance_data(instance_id, volume_id):
+        return {
+            "InstanceId": instance_id,
+            "State": {"Name": "running"},
+            "ImageId": "ami-1",
+            "InstanceType": "t2.micro",
+            "VpcId": "vpc-1",
+            "Placement": {"AvailabilityZone": "zone"},
+            "RootDeviceName": "/dev/sda1",
+            "BlockDeviceMappings": [
+                {"DeviceName": "/dev/sda1", "Ebs": {"VolumeId": volume_id}}
+            ],
+            "NetworkInterfaces": [
+                {
+                    "NetworkInterfaceId": f"eni-{instance_id}",
+                    "SubnetId": "subnet-1",
+                    "PrivateIpAddress": "10.0.0.1",
+                    "MacAddress": "mac",
+                    "Attachment": {"DeviceIndex": 0},
+                }
+            ],
+        }
+
+    @staticmethod
+    def _get_request(instance_id, app_name):
+        return Mock(uuid=instance_id, app_name=app_name)
+
+    @staticmethod
+    def _get_value(data, key):
+        return next(item.value for item in data if item.key == key)
+
+    def test_get_vm_details_list(self):
+        requests = [
+            self._get_request("i-1", "app 1"),
+            self._get_request("i-2", "app 2"),
+        ]
+
+        results = self.operation.get_vm_details_list(
+            requests, self.ec2_client, self.cancellation_context, Mock()
+        )
+
+        self.instance_service.describe_instances.assert_called_once()
+        self.ec2_storage_service.describe_volumes.assert_called_once()
+        self.assertEqual([r.appName for r in results], ["app 1", "app 2"])
+        self.assertEqual(
+            self._get_value(results[1].vmInstanceData, "Storage Size"), "16 GiB"
+        )
+        self.assertEqual(results[1].vmNetworkData[0].interfaceId, "eni-i-2")
+
+    def test_get_vm_details_list_missing_instance(self):
+        requests = [
+            self._get_request("i-1", "app 1"),
+            self._get_request("i-3", "app 3"),
+        ]
+
+        results = self.operation.get_vm_details_list(
+            requests, self.ec2_client, self.cancellation_context, Mock()
+        )
+
+        self.assertFalse(hasattr(results[0], "error"))
+        self.assertEqual(results[1].appName, "app 3")
+        self.assertEqual(results[1].error, VmDetailsOperation.INSTANCE_NOT_FOUND_MSG)
+
+    def test_get_vm_details_list_cancelled(self):
+        self.cancellation_context.is_cancelled = True
+
+        results = self.operation.get_vm_details_list(
+            [self._get_request("i-1", "app 1")],
+            self.ec2_client,
+            self.cancellation_context,
+            Mock(),
+        )
+
+        self.assertEqual(results, [])
+        self.instance_service.describe_instances.assert_not_called()
@@ -39,7 +39,6 @@ o0t3dj4ca7BPGwvGGMuEB4JPZmsS3AWMGXKSBpEpqMSxHMeTZtxo/ioi4mEGM5SMi0KLSnrWuuYX
 
     def test_get_windows_credentials_wait(self):
         instance = Mock()
-        instance.password_data = Mock(return_value={"PasswordData": ""})
         self.password_waiter.wait = Mock(return_value=self.encrypted)
 
         res = self.credentials_service.get_windows_credentials(instance, self.pem)
@@ -52,6 +51,18 @@ o0t3dj4ca7BPGwvGGMuEB4JPZmsS3AWMGXKSBpEpqMSxHMeTZtxo/ioi4mEGM5SMi0KLSnrWuuYX
             "Administrator", res.user_name, InstanceCredentialsService.DEFAULT_USER_NAME
         )
 
+    def test_get_windows_credentials_without_wait(self):
+        instance = Mock()
+        self.password_waiter.get_password.return_value = ""
+
+        res = self.credentials_service.get_windows_credentials(
+            instance, self.pem, wait_for_password=False
+        )
+
+        self.assertIsNone(res)
+        self.password_waiter.get_password.assert_called_once_with(instance)
+        self.password_waiter.wait.assert_not_called()
+
     def test_get_default_linux_credentials(self):
         cred = self.credentials_service.get_default_linux_credentials()
 
@@ -0,0 +1,89 @@
+from multiprocessing import TimeoutError  # noqa: A004
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cloudshell.cp.aws.domain.services.waiters.backoff import BackoffWaiter, WaitMetrics
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestBackoffWaiter(TestCase):
+    def setUp(self):
+        self.time = FakeTime()
+        patcher = patch(
+            "cloudshell.cp.aws.domain.services.waiters.backoff.time", self.time
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.metrics = WaitMetrics()
+        self.waiter = BackoffWaiter(
+            name="test",
+            initial_delay=0.5,
+            max_delay=4,
+            timeout=60,
+            jitter=0,
+            metrics=self.metrics,
+        )
+
+    def test_get_delay(self):
+        delays = [self.waiter.get_delay(attempt) for attempt in range(6)]
+        self.assertEqual(delays, [0.5, 1, 2, 4, 4, 4])
+
+    def test_get_delay_with_jitter(self):
+        self.waiter.jitter = 0.2
+        for attempt in range(10):
+            delay = self.waiter.get_delay(attempt)
+            expected = min(0.5 * 2**attempt, 4)
+            self.assertGreaterEqual(delay, expected * 0.8)
+            self.assertLessEqual(delay, min(expected * 1.2, 4))
+
+    def test_wait(self):
+        condition = Mock(side_effect=[None, False, "done"])
+
+        res = self.waiter.wait(condition, "timeout")
+
+        self.assertEqual(res, "done")
+        self.assertEqual(self.time.sleeps, [0.5, 1])
+        stats = self.metrics.get("test")
+        self.assertEqual(stats.waits, 1)
+        self.assertEqual(stats.polls, 3)
+        self.assertEqual(stats.total_time, 1.5)
+
+    def test_wait_timeout(self):
+        condition = Mock(return_value=None)
+        cancellation_check = Mock()
+
+        with self.assertRaisesRegex(TimeoutError, "^state is pending$"):
+            self.waiter.wait(
+                condition, lambda: "state is pending", cancellation_check, timeout=10
+            )
+
+        self.assertEqual(sum(self.time.sleeps), 10)
+        self.assertEqual(max(self.time.sleeps), 4)
+        self.assertEqual(cancellation_check.call_count, 2 * len(self.time.sleeps))
+        stats = self.metrics.get("test")
+        self.assertEqual(stats.timeouts, 1)
+        self.assertEqual(stats.max_time, 10)
+
+    def test_wait_cancelled(self):
+        condition = Mock(return_value=None)
+        cancellation_check = Mock(side_effect=[None, Exception("cancelled")])
+
+        with self.assertRaisesRegex(Exception, "cancelled"):
+            self.waiter.wait(condition, "timeout", cancellation_check)
+
+        # the cancellation is checked right after the sleep without another poll
+        self.assertEqual(condition.call_count, 1)
+        self.assertEqual(len(self.time.sleeps), 1)
+        self.assertEqual(self.metrics.get("test").timeouts, 0)
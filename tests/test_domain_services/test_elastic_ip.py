@@ -1,5 +1,7 @@
 from unittest import TestCase
-from unittest.mock import Mock, call
+from unittest.mock import Mock, call, patch
+
+from botocore.exceptions import ClientError
 
 from cloudshell.cp.core.models import ConnectToSubnetParams
 
@@ -11,13 +13,6 @@ class TestElasticIpService(TestCase):
     def setUp(self):
         self.elastic_ip_service = ElasticIpService()
 
-    def test_allocate_elastic_address(self):
-        ec2_client = Mock()
-        result = {"PublicIp": "string"}
-        ec2_client.allocate_address = Mock(return_value=result)
-        self.elastic_ip_service.allocate_elastic_address(ec2_client)
-        self.assertTrue(ec2_client.allocate_address.called)
-
     def test_find_and_release_elastic_address(self):
         # arrange
         ec2_session = Mock()
@@ -34,6 +29,29 @@ class TestElasticIpService(TestCase):
         ec2_session.vpc_addresses.filter.assert_called_once_with(PublicIps=[elastic_ip])
         vpc_address.release.assert_called_once()
 
+    def test_find_and_release_associated_elastic_address(self):
+        ec2_session = Mock()
+        vpc_address = Mock(association_id="eipassoc-1")
+        ec2_session.vpc_addresses.filter = Mock(return_value=[vpc_address])
+
+        self.elastic_ip_service.find_and_release_elastic_address(
+            ec2_session=ec2_session, elastic_ip="xxx"
+        )
+
+        vpc_address.meta.client.disassociate_address.assert_called_once_with(
+            AssociationId="eipassoc-1"
+        )
+        vpc_address.release.assert_called_once()
+
+    def test_disassociate_address_already_disassociated(self):
+        vpc_address = Mock(association_id="eipassoc-1")
+        vpc_address.meta.client.disassociate_address.side_effect = ClientError(
+            {"Error": {"Code": "InvalidAssociationID.NotFound", "Message": ""}},
+            "DisassociateAddress",
+        )
+
+        self.elastic_ip_service.disassociate_address(vpc_address)
+
     def test_find_and_release_elastic_address_failed_to_find_ip(self):
         # arrange
         ec2_session = Mock()
@@ -51,69 +69,6 @@ class TestElasticIpService(TestCase):
         self.elastic_ip_service.release_elastic_address(vpc_address)
         self.assertTrue(vpc_address.release.called)
 
-    def test_associate_elastic_ip_to_network_interface(self):
-        # arrange
-        ec2_session = Mock()
-        ec2_session.vpc_addresses = Mock()
-        vpc_address = Mock()
-        ec2_session.vpc_addresses.filter = Mock(return_value=[vpc_address])
-        interface_id = Mock()
-        elastic_ip = Mock()
-
-        # act
-        self.elastic_ip_service.associate_elastic_ip_to_network_interface(
-            ec2_session=ec2_session, interface_id=interface_id, elastic_ip=elastic_ip
-        )
-
-        # assert
-        vpc_address.associate.assert_called_once_with(
-            NetworkInterfaceId=interface_id, AllowReassociation=False
-        )
-
-    def test_associate_elastic_ip_to_network_interface_raises_when_no_ip_found(self):
-        # arrange
-        ec2_session = Mock()
-        ec2_session.vpc_addresses = Mock()
-        ec2_session.vpc_addresses.filter = Mock(return_value=[])
-        interface_id = Mock()
-        elastic_ip = Mock()
-
-        # act
-        with self.assertRaisesRegex(ValueError, "Failed to find elastic ip"):
-            self.elastic_ip_service.associate_elastic_ip_to_network_interface(
-                ec2_session=ec2_session,
-                interface_id=interface_id,
-                elastic_ip=elastic_ip,
-            )
-
-    def test_associate_elastic_ip_to_instance(self):
-        # arrange
-        ec2_session = Mock()
-        ec2_session.vpc_addresses = Mock()
-        vpc_address = Mock()
-        ec2_session.vpc_addresses.filter = Mock(return_value=[vpc_address])
-        instance = Mock()
-        elastic_ip = Mock()
-
-        # act
-        self.elastic_ip_service.associate_elastic_ip_to_instance(
-            ec2_session=ec2_session, instance=instance, elastic_ip=elastic_ip
-        )
-
-    def test_associate_elastic_ip_to_instance_raises_when_no_ip_found(self):
-        # arrange
-        ec2_session = Mock()
-        ec2_session.vpc_addresses = Mock()
-        ec2_session.vpc_addresses.filter = Mock(return_value=[])
-        instance = Mock()
-        elastic_ip = Mock()
-
-        # act
-        with self.assertRaisesRegex(ValueError, "Failed to find elastic ip"):
-            self.elastic_ip_service.associate_elastic_ip_to_instance(
-                ec2_session=ec2_session, instance=instance, elastic_ip=elastic_ip
-            )
-
     def test_set_elastic_ips_single_subnet(self):
         # arrange
         ec2_session = Mock()
@@ -128,10 +83,10 @@ class TestElasticIpService(TestCase):
 
         elastic_ip_service._is_single_subnet_mode = Mock(return_value=True)
         allocated_elastic_ip = Mock()
-        elastic_ip_service.allocate_elastic_address = Mock(
-            return_value=allocated_elastic_ip
+        elastic_ip_service.allocate_address = Mock(
+            return_value=(allocated_elastic_ip, "eipalloc-1")
         )
-        elastic_ip_service.associate_elastic_ip_to_instance = Mock()
+        elastic_ip_service.associate_address = Mock()
 
         # act
         elastic_ip_service.set_elastic_ips(
@@ -145,12 +100,12 @@ class TestElasticIpService(TestCase):
         )
 
         # assert
-        elastic_ip_service.allocate_elastic_address.assert_called_once_with(
+        elastic_ip_service.allocate_address.assert_called_once_with(
             ec2_client=ec2_client
         )
         self.assertEqual(network_config_result_mock.public_ip, allocated_elastic_ip)
-        elastic_ip_service.associate_elastic_ip_to_instance.assert_called_once_with(
-            ec2_session=ec2_session, instance=instance, elastic_ip=allocated_elastic_ip
+        elastic_ip_service.associate_address.assert_called_once_with(
+            ec2_client=ec2_client, allocation_id="eipalloc-1", instance_id=instance.id
         )
         instance.network_interfaces_attribute.all.assert_not_called()
 
@@ -197,10 +152,10 @@ class TestElasticIpService(TestCase):
         elastic_ip_service = ElasticIpService()
         elastic_ip_service._is_single_subnet_mode = Mock(return_value=False)
         allocated_elastic_ip = Mock()
-        elastic_ip_service.allocate_elastic_address = Mock(
-            return_value=allocated_elastic_ip
+        elastic_ip_service.allocate_address = Mock(
+            return_value=(allocated_elastic_ip, "eipalloc-1")
         )
-        elastic_ip_service.associate_elastic_ip_to_network_interface = Mock()
+        elastic_ip_service.associate_address = Mock()
 
         # act
         elastic_ip_service.set_elastic_ips(
@@ -214,23 +169,22 @@ class TestElasticIpService(TestCase):
         )
 
         # assert
-        self.assertEqual(elastic_ip_service.allocate_elastic_address.call_count, 2)
-        self.assertEqual(
-            elastic_ip_service.associate_elastic_ip_to_network_interface.call_count, 2
-        )
-        elastic_ip_service.associate_elastic_ip_to_network_interface.assert_has_calls(
+        self.assertEqual(elastic_ip_service.allocate_address.call_count, 2)
+        self.assertEqual(elastic_ip_service.associate_address.call_count, 2)
+        elastic_ip_service.associate_address.assert_has_calls(
             [
                 call(
-                    ec2_session=ec2_session,
-                    interface_id="netif0",
-                    elastic_ip=allocated_elastic_ip,
+                    ec2_client=ec2_client,
+                    allocation_id="eipalloc-1",
+                    network_interface_id="netif0",
                 ),
                 call(
-                    ec2_session=ec2_session,
-                    interface_id="netif2",
-                    elastic_ip=allocated_elastic_ip,
+                    ec2_client=ec2_client,
+                    allocation_id="eipalloc-1",
+                    network_interface_id="netif2",
                 ),
-            ]
+            ],
+            any_order=True,
         )
         self.assertEqual(result_mock1.public_ip, allocated_elastic_ip)
         self.assertEqual(result_mock3.public_ip, allocated_elastic_ip)
@@ -238,6 +192,113 @@ class TestElasticIpService(TestCase):
             hasattr(result_mock2, "public_ip")
         )  # to make sure public_ip wasnt set on result_mock2
 
+    def test_set_elastic_ips_multiple_subnets_one_failed(self):
+        instance = Mock()
+        instance.network_interfaces_attribute = [
+            {"Attachment": {"DeviceIndex": 0}, "NetworkInterfaceId": "netif0"},
+            {"Attachment": {"DeviceIndex": 1}, "NetworkInterfaceId": "netif1"},
+        ]
+        actions = [Mock(), Mock()]
+        for action in actions:
+            action.actionParams = Mock(spec=ConnectToSubnetParams, isPublic=True)
+        network_config_results = []
+        for device_index, action in enumerate(actions):
+            result = DeployNetworkingResultModel(action.actionId)
+            result.device_index = device_index
+            network_config_results.append(result)
+        elastic_ip_service = ElasticIpService()
+        elastic_ip_service.allocate_address = Mock(
+            side_effect=[("1.1.1.1", "eipalloc-1"), ("2.2.2.2", "eipalloc-2")]
+        )
+        elastic_ip_service.associate_address = Mock(
+            side_effect=lambda **kwargs: self._fail_for_interface("netif0", **kwargs)
+        )
+
+        with self.assertRaisesRegex(ValueError, "netif0"):
+            elastic_ip_service.set_elastic_ips(
+                ec2_session=Mock(),
+                ec2_client=Mock(),
+                instance=instance,
+                ami_deployment_model=Mock(),
+                network_actions=actions,
+                network_config_results=network_config_results,
+                logger=Mock(),
+            )
+
+        # both allocated ips are in the results for the rollback
+        self.assertEqual(
+            {result.public_ip for result in network_config_results},
+            {"1.1.1.1", "2.2.2.2"},
+        )
+        self.assertEqual(elastic_ip_service.associate_address.call_count, 2)
+
+    @staticmethod
+    def _fail_for_interface(interface_id, network_interface_id, **kwargs):
+        if network_interface_id == interface_id:
+            raise ValueError(f"failed to associate to {interface_id}")
+
+    def test_allocate_address(self):
+        ec2_client = Mock()
+        ec2_client.allocate_address.return_value = {
+            "PublicIp": "1.1.1.1",
+            "AllocationId": "eipalloc-1",
+        }
+
+        result = self.elastic_ip_service.allocate_address(ec2_client)
+
+        self.assertEqual(result, ("1.1.1.1", "eipalloc-1"))
+        ec2_client.allocate_address.assert_called_once_with(Domain="vpc")
+
+    def test_associate_address_to_interface(self):
+        ec2_client = Mock()
+        ec2_client.associate_address.return_value = {"AssociationId": "eipassoc-1"}
+
+        result = self.elastic_ip_service.associate_address(
+            ec2_client, "eipalloc-1", network_interface_id="netif0"
+        )
+
+        self.assertEqual(result, "eipassoc-1")
+        ec2_client.associate_address.assert_called_once_with(
+            AllocationId="eipalloc-1",
+            AllowReassociation=False,
+            NetworkInterfaceId="netif0",
+        )
+
+    def test_associate_address_retries_not_found_errors(self):
+        ec2_client = Mock()
+        ec2_client.associate_address.side_effect = [
+            self._client_error("InvalidAllocationID.NotFound"),
+            {"AssociationId": "eipassoc-1"},
+        ]
+
+        with patch("time.sleep") as sleep:
+            result = self.elastic_ip_service.associate_address(
+                ec2_client, "eipalloc-1", instance_id="i-1"
+            )
+
+        self.assertEqual(result, "eipassoc-1")
+        self.assertEqual(ec2_client.associate_address.call_count, 2)
+        sleep.assert_called_once()
+
+    def test_associate_address_raises_other_errors(self):
+        ec2_client = Mock()
+        ec2_client.associate_address.side_effect = self._client_error(
+            "AddressLimitExceeded"
+        )
+
+        with self.assertRaises(ClientError):
+            self.elastic_ip_service.associate_address(
+                ec2_client, "eipalloc-1", instance_id="i-1"
+            )
+
+        ec2_client.associate_address.assert_called_once()
+
+    @staticmethod
+    def _client_error(code):
+        return ClientError(
+            {"Error": {"Code": code, "Message": code}}, "AssociateAddress"
+        )
+
     def test_is_single_subnet_true(self):
         # arrange
         network_actions = None
@@ -0,0 +1,112 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.cp.aws.domain.services.ec2.image_cache import (
+    ImageKey,
+    ImageMetadata,
+    ImageMetadataCache,
+)
+from cloudshell.cp.aws.domain.services.session_providers.session_cache import SessionKey
+
+
+class TestImageMetadataCache(TestCase):
+    def setUp(self):
+        self.now = 0
+        self.cache = ImageMetadataCache(ttl=1, timer=lambda: self.now)
+        self.key = ImageKey(SessionKey("region", "fingerprint"), "ami-1")
+        self.load = Mock(side_effect=lambda: Mock())
+
+    def test_get_returns_cached_value(self):
+        first = self.cache.get(self.key, self.load)
+        second = self.cache.get(self.key, self.load)
+
+        self.assertIs(first, second)
+        self.load.assert_called_once_with()
+
+    def test_get_loads_value_for_other_key(self):
+        first = self.cache.get(self.key, self.load)
+        other_key = self.key._replace(
+            session_key=SessionKey("region", "fingerprint", "role arn")
+        )
+        second = self.cache.get(other_key, self.load)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_get_expired_value(self):
+        first = self.cache.get(self.key, self.load)
+        self.now = 60
+        second = self.cache.get(self.key, self.load)
+
+        self.assertIsNot(first, second)
+
+    def test_errors_are_not_cached(self):
+        self.load.side_effect = [ValueError("not available"), Mock()]
+
+        with self.assertRaises(ValueError):
+            self.cache.get(self.key, self.load)
+        self.cache.get(self.key, self.load)
+
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_invalidate(self):
+        first = self.cache.get(self.key, self.load)
+        self.cache.invalidate(self.key)
+        second = self.cache.get(self.key, self.load)
+
+        self.assertIsNot(first, second)
+
+    def test_disabled_cache(self):
+        cache = ImageMetadataCache(ttl=0)
+
+        cache.get(self.key, self.load)
+        cache.get(self.key, self.load)
+
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_concurrent_get_loads_once(self):
+        def load():
+            time.sleep(0.05)
+            return Mock()
+
+        load_mock = Mock(side_effect=load)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self.cache.get(self.key, load_mock))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        load_mock.assert_called_once_with()
+        self.assertEqual(len({id(result) for result in results}), 1)
+
+
+class TestImageMetadata(TestCase):
+    def test_from_image(self):
+        image = Mock(
+            image_id="ami-1",
+            state="available",
+            root_device_name="/dev/sda1",
+            block_device_mappings=[{"DeviceName": "/dev/sda1"}],
+            platform="windows",
+        )
+
+        metadata = ImageMetadata.from_image(image)
+
+        self.assertEqual(
+            metadata,
+            ImageMetadata(
+                "ami-1",
+                "available",
+                "/dev/sda1",
+                [{"DeviceName": "/dev/sda1"}],
+                "windows",
+            ),
+        )
@@ -1,5 +1,5 @@
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, call
 
 from cloudshell.cp.aws.domain.services.ec2.instance import InstanceService
 
@@ -49,9 +49,95 @@ class TestInstanceService(TestCase):
             BlockDeviceMappings=ami_dep.block_device_mappings,
             NetworkInterfaces=ami_dep.network_interfaces,
             UserData=ami_dep.user_data,
+            TagSpecifications=ami_dep.tags.get_tag_specifications.return_value,
         )
         self.assertEqual(new_instance, res)
 
+    def test_create_instances_with_count(self):
+        ami_dep = Mock()
+        instances = [Mock(), Mock()]
+        self.ec2_session.create_instances = Mock(return_value=instances)
+
+        res = self.instance_service.create_instances(self.ec2_session, ami_dep, count=2)
+
+        self.ec2_session.create_instances.assert_called_once_with(
+            ImageId=ami_dep.aws_ami_id,
+            MinCount=2,
+            MaxCount=2,
+            InstanceType=ami_dep.instance_type,
+            IamInstanceProfile=ami_dep.iam_role,
+            KeyName=ami_dep.aws_key,
+            BlockDeviceMappings=ami_dep.block_device_mappings,
+            NetworkInterfaces=ami_dep.network_interfaces,
+            UserData=ami_dep.user_data,
+            TagSpecifications=ami_dep.tags.get_tag_specifications.return_value,
+        )
+        self.assertEqual(instances, res)
+        ami_dep.tags.get_tag_specifications.assert_called_once_with(
+            "instance", "volume", "network-interface"
+        )
+
+    def test_set_name_tag(self):
+        instance = Mock(id="i-1", instance_id="i-1")
+        instance.block_device_mappings = [
+            {"DeviceName": "/dev/sda1", "Ebs": {"VolumeId": "vol-1"}},
+            {"DeviceName": "/dev/sdb", "Ebs": {"VolumeId": "vol-2"}},
+        ]
+
+        self.instance_service.set_name_tag(instance, "app")
+
+        instance.meta.client.create_tags.assert_called_once_with(
+            Resources=["i-1", "vol-1", "vol-2"],
+            Tags=[{"Key": "Name", "Value": "app i-1"}],
+        )
+
+    def test_disable_source_dest_check(self):
+        instance = Mock(
+            network_interfaces_attribute=[
+                {"NetworkInterfaceId": "eni-1"},
+                {"NetworkInterfaceId": "eni-2"},
+            ]
+        )
+
+        self.instance_service.disable_source_dest_check(self.ec2_client, instance)
+
+        self.network_interface_service.disable_source_dest_check.assert_has_calls(
+            [call(self.ec2_client, "eni-1"), call(self.ec2_client, "eni-2")],
+            any_order=True,
+        )
+
+    def test_disable_source_dest_check_raises_after_all_nics(self):
+        instance = Mock(
+            network_interfaces_attribute=[
+                {"NetworkInterfaceId": "eni-1"},
+                {"NetworkInterfaceId": "eni-2"},
+            ]
+        )
+
+        def disable(ec2_client, nic_id):
+            if nic_id == "eni-1":
+                raise ValueError("failed")
+
+        self.network_interface_service.disable_source_dest_check.side_effect = disable
+
+        with self.assertRaisesRegex(ValueError, "failed"):
+            self.instance_service.disable_source_dest_check(self.ec2_client, instance)
+        self.assertEqual(
+            self.network_interface_service.disable_source_dest_check.call_count, 2
+        )
+
+    def test_wait_for_instances_to_run_in_aws(self):
+        instances = [Mock(), Mock()]
+        cancellation_context = Mock()
+
+        self.instance_service.wait_for_instances_to_run_in_aws(
+            instances, cancellation_context
+        )
+
+        self.instance_waiter.multi_wait.assert_called_once_with(
+            instances, self.instance_waiter.RUNNING, cancellation_context
+        )
+
     def test_get_instance_by_id(self):
         res = self.instance_service.get_instance_by_id(self.ec2_session, "id")
         self.ec2_session.Instance.assert_called_once_with(id="id")
@@ -122,3 +208,20 @@ class TestInstanceService(TestCase):
             0,
             cancellation_context,
         )
+
+    def test_describe_instances(self):
+        instance_ids = [f"i-{i}" for i in range(250)]
+        paginator = self.ec2_client.get_paginator.return_value
+        paginator.paginate.side_effect = lambda Filters: [
+            {
+                "Reservations": [
+                    {"Instances": [{"InstanceId": id_} for id_ in Filters[0]["Values"]]}
+                ]
+            }
+        ]
+
+        res = self.instance_service.describe_instances(self.ec2_client, instance_ids)
+
+        self.assertEqual(list(res), instance_ids)
+        self.ec2_client.get_paginator.assert_called_once_with("describe_instances")
+        self.assertEqual(paginator.paginate.call_count, 2)
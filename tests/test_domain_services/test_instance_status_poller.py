@@ -0,0 +1,164 @@
+import time
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from botocore.exceptions import ClientError
+
+from cloudshell.cp.aws.domain.services.waiters.instance_status_poller import (
+    InstanceStatusPoller,
+    InstanceStatusPollers,
+)
+
+
+def create_status(instance_id):
+    return {"InstanceId": instance_id, "InstanceState": {"Name": "running"}}
+
+
+def describe_instance_status(InstanceIds, IncludeAllInstances):
+    return {"InstanceStatuses": [create_status(i) for i in InstanceIds]}
+
+
+@patch(
+    "cloudshell.cp.aws.domain.services.waiters.instance_status_poller.threading."
+    "Thread",
+    Mock(),
+)
+class TestInstanceStatusPoller(TestCase):
+    def setUp(self):
+        self.ec2_client = Mock()
+        self.ec2_client.describe_instance_status.side_effect = describe_instance_status
+        self.poller = InstanceStatusPoller(self.ec2_client)
+
+    def test_poll_shares_call_between_subscriptions(self):
+        subscription1 = self.poller.subscribe("i-1")
+        subscription2 = self.poller.subscribe("i-1")
+        subscription3 = self.poller.subscribe("i-2")
+
+        self.poller._poll(["i-1", "i-2"])
+
+        self.ec2_client.describe_instance_status.assert_called_once_with(
+            InstanceIds=["i-1", "i-2"], IncludeAllInstances=True
+        )
+        self.assertEqual(subscription1.get_status(), create_status("i-1"))
+        self.assertEqual(subscription2.get_status(), create_status("i-1"))
+        self.assertEqual(subscription3.get_status(), create_status("i-2"))
+        self.assertTrue(subscription1.wait_for_update(0))
+        self.assertFalse(subscription1.wait_for_update(0))
+
+    def test_poll_chunks_instance_ids(self):
+        instance_ids = [f"i-{i}" for i in range(150)]
+
+        self.poller._poll(instance_ids)
+
+        self.assertEqual(self.ec2_client.describe_instance_status.call_count, 2)
+
+    def test_poll_skips_not_found_instances(self):
+        error = ClientError(
+            {
+                "Error": {
+                    "Code": "InvalidInstanceID.NotFound",
+                    "Message": "The instance ID 'i-2' does not exist",
+                }
+            },
+            "DescribeInstanceStatus",
+        )
+        self.ec2_client.describe_instance_status.side_effect = [
+            error,
+            describe_instance_status(["i-1"], True),
+        ]
+        subscription1 = self.poller.subscribe("i-1")
+        subscription2 = self.poller.subscribe("i-2")
+
+        self.poller._poll(["i-1", "i-2"])
+
+        self.ec2_client.describe_instance_status.assert_called_with(
+            InstanceIds=["i-1"], IncludeAllInstances=True
+        )
+        self.assertEqual(subscription1.get_status(), create_status("i-1"))
+        self.assertIsNone(subscription2.get_status())
+        self.assertTrue(subscription2.is_polled)
+
+    def test_poll_delivers_error(self):
+        error = ClientError(
+            {"Error": {"Code": "UnauthorizedOperation"}}, "DescribeInstanceStatus"
+        )
+        self.ec2_client.describe_instance_status.side_effect = error
+        subscription = self.poller.subscribe("i-1")
+
+        self.poller._poll(["i-1"])
+
+        with self.assertRaises(ClientError):
+            subscription.get_status()
+
+    def test_poll_keeps_status_on_transient_error(self):
+        error = ClientError(
+            {"Error": {"Code": "RequestLimitExceeded"}}, "DescribeInstanceStatus"
+        )
+        self.ec2_client.describe_instance_status.side_effect = [
+            describe_instance_status(["i-1"], True),
+            error,
+            describe_instance_status(["i-1"], True),
+        ]
+        subscription = self.poller.subscribe("i-1")
+
+        self.poller._poll(["i-1"])
+        self.poller._poll(["i-1"])
+
+        self.assertEqual(subscription.get_status(), create_status("i-1"))
+
+        self.poller._poll(["i-1"])
+
+        self.assertEqual(subscription.get_status(), create_status("i-1"))
+        self.assertEqual(self.poller._failures, {})
+
+    def test_poll_delivers_transient_error_after_max_failures(self):
+        error = ClientError(
+            {
+                "Error": {"Code": "InternalError"},
+                "ResponseMetadata": {"HTTPStatusCode": 500},
+            },
+            "DescribeInstanceStatus",
+        )
+        self.ec2_client.describe_instance_status.side_effect = error
+        subscription = self.poller.subscribe("i-1")
+
+        for _ in range(self.poller.max_failures - 1):
+            self.poller._poll(["i-1"])
+            self.assertIsNone(subscription.get_status())
+            self.assertFalse(subscription.is_polled)
+
+        self.poller._poll(["i-1"])
+
+        with self.assertRaises(ClientError):
+            subscription.get_status()
+
+    def test_unsubscribe(self):
+        subscription = self.poller.subscribe("i-1")
+
+        with subscription:
+            pass
+
+        self.poller._poll(["i-1"])
+        self.assertIsNone(subscription.get_status())
+
+
+class TestInstanceStatusPollers(TestCase):
+    def test_poller_stops_when_idle(self):
+        ec2_client = Mock()
+        ec2_client.describe_instance_status.side_effect = describe_instance_status
+        pollers = InstanceStatusPollers(interval=0.01, idle_timeout=0.02)
+
+        with pollers.subscribe(ec2_client, "i-1") as subscription:
+            poller = subscription.poller
+            with pollers.subscribe(ec2_client, "i-2") as subscription2:
+                self.assertIs(subscription2.poller, poller)
+            self.assertTrue(subscription.wait_for_update(1))
+            self.assertEqual(subscription.get_status(), create_status("i-1"))
+            self.assertTrue(poller.is_running)
+
+        for _ in range(100):
+            if not poller.is_running:
+                break
+            time.sleep(0.01)
+        self.assertFalse(poller.is_running)
+        self.assertIsNot(pollers.subscribe(ec2_client, "i-1").poller, poller)
@@ -1,82 +1,201 @@
-import time
 from unittest import TestCase
-from unittest.mock import Mock, PropertyMock, patch
+from unittest.mock import Mock, patch
 
-from cloudshell.cp.aws.domain.services.waiters.instance import InstanceWaiter
+from cloudshell.cp.aws.domain.services.waiters.instance import (
+    InstanceTerminatedException,
+    InstanceWaiter,
+)
 
-instance = Mock()
-instance.state = {"Name": ""}
 
+def create_ec2_client(*rounds):
+    """Client that returns states of the instances by id for each describe call."""
+    ec2_client = Mock()
+
+    def paginate(Filters):
+        states = (
+            ec2_client.rounds.pop(0)
+            if len(ec2_client.rounds) > 1
+            else (ec2_client.rounds[0])
+        )
+        instances = [
+            {"InstanceId": instance_id, "State": {"Name": states[instance_id]}}
+            for instance_id in Filters[0]["Values"]
+            if instance_id in states
+        ]
+        return [{"Reservations": [{"Instances": instances}]}]
+
+    ec2_client.rounds = list(rounds)
+    ec2_client.get_paginator.return_value.paginate.side_effect = paginate
+    return ec2_client
+
+
+def create_instance(instance_id, ec2_client):
+    instance = Mock(id=instance_id)
+    instance.meta.client = ec2_client
+    return instance
 
-class helper:
-    @staticmethod
-    def change_to_terminate(a):
-        instance.state["Name"] = InstanceWaiter.TERMINATED
 
-    @staticmethod
-    def change_to_stopped(a):
-        instance.state["Name"] = InstanceWaiter.STOPPED
+class FakeSubscription:
+    def __init__(self, statuses, is_polled=True):
+        self.statuses = list(statuses)
+        self.is_polled = is_polled
+        self.closed = False
+        self.wait_for_update = Mock()
+        self.notify = Mock()
 
-    @staticmethod
-    def change_to_running(a):
-        instance.state["Name"] = InstanceWaiter.RUNNING
+    def get_status(self):
+        if len(self.statuses) > 1:
+            return self.statuses.pop(0)
+        return self.statuses[0]
 
-    @staticmethod
-    def change_to_stopping(a):
-        instance.state["Name"] = InstanceWaiter.STOPPING
+    def __enter__(self):
+        return self
 
-    @staticmethod
-    def change_to_pending(a):
-        instance.state["Name"] = InstanceWaiter.PENDING
+    def __exit__(self, *args):
+        self.closed = True
 
 
+def create_status(state="running", status="ok"):
+    return {
+        "InstanceState": {"Name": state},
+        "SystemStatus": {"Status": status},
+        "InstanceStatus": {"Status": status},
+    }
+
+
+@patch("cloudshell.cp.aws.domain.services.waiters.backoff.time.sleep", Mock())
 class TestInstanceWaiter(TestCase):
     def setUp(self):
         self.cancellation_service = Mock()
-        self.instance_waiter = InstanceWaiter(self.cancellation_service, 1, 0.02)
+        self.status_pollers = Mock()
+        self.instance_waiter = InstanceWaiter(
+            self.cancellation_service, 1, 0.02, status_pollers=self.status_pollers
+        )
         self.instance = Mock()
         self.logger = Mock()
 
-    @patch("time.sleep", helper.change_to_stopped)
     def test_waiter(self):
-        helper.change_to_running(Mock())
-        inst = self.instance_waiter.wait(instance, InstanceWaiter.STOPPED)
+        subscription = FakeSubscription(
+            [None, create_status(InstanceWaiter.PENDING), create_status()]
+        )
+        self.status_pollers.subscribe.return_value = subscription
+        instance = Mock(id="i-1")
+        instance.meta.data = {"State": {"Name": InstanceWaiter.PENDING}}
+
+        inst = self.instance_waiter.wait(instance, InstanceWaiter.RUNNING)
+
         self.assertEqual(inst, instance)
-        self.assertEqual(inst.reload.call_count, 1)
+        self.assertEqual(inst.meta.data["State"]["Name"], InstanceWaiter.RUNNING)
+        self.status_pollers.subscribe.assert_called_once_with(
+            instance.meta.client, "i-1"
+        )
+        self.assertEqual(subscription.wait_for_update.call_count, 2)
+        self.assertTrue(subscription.closed)
+        instance.reload.assert_not_called()
+
+    def test_waiter_terminated_instance_is_missing(self):
+        subscription = FakeSubscription([create_status("shutting-down"), None])
+        self.status_pollers.subscribe.return_value = subscription
+        instance = Mock(id="i-1")
+        instance.meta.data = {"State": {"Name": "shutting-down"}}
+
+        self.instance_waiter.wait(instance, InstanceWaiter.TERMINATED)
+
+        self.assertEqual(instance.meta.data["State"]["Name"], InstanceWaiter.TERMINATED)
+        self.assertEqual(subscription.wait_for_update.call_count, 1)
+
+    @patch(
+        "cloudshell.cp.aws.domain.services.waiters.backoff.time",
+        Mock(monotonic=Mock(side_effect=[0, 1, 100, 100])),
+    )
+    def test_waiter_terminated_waits_for_first_poll(self):
+        self.status_pollers.subscribe.return_value = FakeSubscription(
+            [None], is_polled=False
+        )
 
-    def test_waiter_timeout(self):
-        helper.change_to_running(Mock())
         self.assertRaises(
-            Exception, self.instance_waiter.wait, instance, InstanceWaiter.STOPPED
+            Exception, self.instance_waiter.wait, Mock(), InstanceWaiter.TERMINATED
         )
 
-    @patch("time.sleep", helper.change_to_stopped)
-    def test_waiter_multi(self):
-        helper.change_to_stopped(Mock())
+    @patch(
+        "cloudshell.cp.aws.domain.services.waiters.backoff.time",
+        Mock(monotonic=Mock(side_effect=[0, 1, 100, 100])),
+    )
+    def test_waiter_timeout(self):
+        subscription = FakeSubscription([create_status(InstanceWaiter.PENDING)])
+        self.status_pollers.subscribe.return_value = subscription
 
-        instance.state["Name"] = InstanceWaiter.RUNNING
+        self.assertRaises(
+            Exception, self.instance_waiter.wait, Mock(), InstanceWaiter.RUNNING
+        )
+        self.assertTrue(subscription.closed)
 
-        inst = Mock()
-        inst.state = {}
-        inst.state["Name"] = InstanceWaiter.STOPPED
+    def test_waiter_multi(self):
+        ec2_client = create_ec2_client(
+            {"i-1": InstanceWaiter.RUNNING, "i-2": InstanceWaiter.STOPPED},
+            {"i-1": InstanceWaiter.STOPPED},
+        )
+        instance = create_instance("i-1", ec2_client)
+        inst = create_instance("i-2", ec2_client)
 
         res = self.instance_waiter.multi_wait([instance, inst], InstanceWaiter.STOPPED)
+
         self.assertEqual(res, [instance, inst])
-        self.assertTrue(instance.reload.call_count, 2)
+        paginate = ec2_client.get_paginator().paginate
+        self.assertEqual(paginate.call_count, 2)
+        paginate.assert_called_with(
+            Filters=[{"Name": "instance-id", "Values": ["i-1"]}]
+        )
+
+    def test_waiter_multi_terminated_instance_is_missing(self):
+        ec2_client = create_ec2_client({"i-1": InstanceWaiter.SHUTTING_DOWN}, {})
+        instance = create_instance("i-1", ec2_client)
+
+        res = self.instance_waiter.multi_wait([instance], InstanceWaiter.TERMINATED)
+
+        self.assertEqual(res, [instance])
+
+    def test_waiter_multi_stops_waiting_for_terminated_instance(self):
+        ec2_client = create_ec2_client(
+            {"i-1": InstanceWaiter.PENDING, "i-2": "shutting-down"},
+            {"i-1": InstanceWaiter.PENDING},
+            {"i-1": InstanceWaiter.RUNNING},
+        )
+        running = create_instance("i-1", ec2_client)
+        terminated = create_instance("i-2", ec2_client)
+
+        with self.assertRaises(InstanceTerminatedException) as ctx:
+            self.instance_waiter.multi_wait(
+                [running, terminated], InstanceWaiter.RUNNING
+            )
+
+        self.assertEqual(ctx.exception.reasons, {"i-2": "shutting-down"})
+        # the running instance is still waited for
+        self.assertEqual(running.meta.data["State"]["Name"], InstanceWaiter.RUNNING)
+        paginate = ec2_client.get_paginator().paginate
+        self.assertEqual(paginate.call_count, 3)
+        paginate.assert_called_with(
+            Filters=[{"Name": "instance-id", "Values": ["i-1"]}]
+        )
+
+    def test_waiter_multi_chunks_instances(self):
+        ec2_client = create_ec2_client(
+            {f"i-{i}": InstanceWaiter.TERMINATED for i in range(450)}
+        )
+        instances = [create_instance(f"i-{i}", ec2_client) for i in range(450)]
+
+        self.instance_waiter.multi_wait(instances, InstanceWaiter.TERMINATED)
+
+        self.assertEqual(ec2_client.get_paginator().paginate.call_count, 3)
 
-    @patch("cloudshell.cp.aws.domain.services.waiters.instance.time.sleep", Mock())
     def test_waiter_multi_with_cancellation(self):
         cancellation_context = Mock()
-        helper.change_to_stopped(Mock())
-        inst1 = Mock()
-        inst2 = Mock(state={"Name": InstanceWaiter.STOPPED})
-        p = PropertyMock(
-            side_effect=[
-                {"Name": InstanceWaiter.RUNNING},
-                {"Name": InstanceWaiter.STOPPED},
-            ]
+        ec2_client = create_ec2_client(
+            {"i-1": InstanceWaiter.RUNNING, "i-2": InstanceWaiter.STOPPED},
+            {"i-1": InstanceWaiter.STOPPED, "i-2": InstanceWaiter.STOPPED},
         )
-        type(inst1).state = p
+        inst1 = create_instance("i-1", ec2_client)
+        inst2 = create_instance("i-2", ec2_client)
         instances = [inst1, inst2]
 
         res = self.instance_waiter.multi_wait(
@@ -84,12 +203,15 @@ class TestInstanceWaiter(TestCase):
         )
 
         self.assertEqual(res, [inst1, inst2])
-        self.assertTrue(inst1.reload.call_count, 2)
-        self.assertTrue(self.cancellation_service.check_if_cancelled.call_count, 2)
+        # before and after the sleep and after the wait
+        self.assertEqual(self.cancellation_service.check_if_cancelled.call_count, 3)
         instance_ids = set(filter(lambda x: str(x.id), instances))
-        self.cancellation_service.check_if_cancelled.assert_called_with(
-            cancellation_context, {"instance_ids": instance_ids}
-        )
+        (
+            cancellation_token,
+            data,
+        ) = self.cancellation_service.check_if_cancelled.call_args.args
+        self.assertIs(cancellation_token.cancellation_context, cancellation_context)
+        self.assertEqual(data, {"instance_ids": instance_ids})
 
     def test_waiter_multi_errors(self):
         self.assertRaises(
@@ -99,97 +221,51 @@ class TestInstanceWaiter(TestCase):
             ValueError, self.instance_waiter.multi_wait, [Mock], "blalala"
         )
 
-    @patch(
-        "cloudshell.cp.aws.domain.services.waiters.instance.time",
-        Mock(time=Mock(return_value=time.time())),
-    )
     def test_wait_status_ok(self):
-        # arrange
-        def describe_instance_status_handler(*args, **kwargs):
-            result = Mock()
-            instance_id_mock = kwargs["InstanceIds"][0]
-            if (
-                hasattr(instance_id_mock, "called_already")
-                and instance_id_mock.called_already is True
-            ):
-                result.InstanceStatuses = [
-                    {
-                        "SystemStatus": {"Status": self.instance_waiter.STATUS_OK},
-                        "InstanceStatus": {"Status": self.instance_waiter.STATUS_OK},
-                    }
-                ]
-            else:
-                instance_id_mock.called_already = True
-                result.InstanceStatuses = [
-                    {
-                        "SystemStatus": {"Status": "initializing"},
-                        "InstanceStatus": {"Status": "initializing"},
-                    }
-                ]
-
-            return result
-
-        ec2_client = Mock()
-        ec2_client.describe_instance_status = Mock(
-            side_effect=describe_instance_status_handler
+        subscription = FakeSubscription(
+            [None, create_status(status="initializing"), create_status()]
         )
+        self.status_pollers.subscribe.return_value = subscription
+        ec2_client = Mock()
         instance = Mock()
 
-        # act
         instance_state = self.instance_waiter.wait_status_ok(
-            ec2_client, instance, self.logger, 0, self.cancellation_service
+            ec2_client, instance, self.logger, 0, Mock()
         )
 
-        # assert
         self.assertEqual(
             instance_state["SystemStatus"]["Status"], self.instance_waiter.STATUS_OK
         )
         self.assertEqual(
             instance_state["InstanceStatus"]["Status"], self.instance_waiter.STATUS_OK
         )
+        self.status_pollers.subscribe.assert_called_once_with(ec2_client, instance.id)
+        self.assertEqual(self.cancellation_service.check_if_cancelled.call_count, 4)
+        self.assertTrue(subscription.closed)
 
-    @patch(
-        "cloudshell.cp.aws.domain.services.waiters.instance.time",
-        Mock(time=Mock(return_value=time.time())),
-    )
     def test_wait_status_ok_raises_impaired_status(self):
-        # arrange
-        def describe_instance_status_handler(*args, **kwargs):
-            result = Mock()
-            instance_id_mock = kwargs["InstanceIds"][0]
-            if (
-                hasattr(instance_id_mock, "called_already")
-                and instance_id_mock.called_already is True
-            ):
-                result.InstanceStatuses = [
-                    {
-                        "SystemStatus": {
-                            "Status": self.instance_waiter.STATUS_IMPAIRED
-                        },
-                        "InstanceStatus": {
-                            "Status": self.instance_waiter.STATUS_IMPAIRED
-                        },
-                    }
-                ]
-            else:
-                instance_id_mock.called_already = True
-                result.InstanceStatuses = [
-                    {
-                        "SystemStatus": {"Status": "initializing"},
-                        "InstanceStatus": {"Status": "initializing"},
-                    }
-                ]
-
-            return result
-
-        ec2_client = Mock()
-        ec2_client.describe_instance_status = Mock(
-            side_effect=describe_instance_status_handler
+        self.status_pollers.subscribe.return_value = FakeSubscription(
+            [
+                create_status(status="initializing"),
+                create_status(status=self.instance_waiter.STATUS_IMPAIRED),
+            ]
         )
-        instance = Mock()
 
-        # act & assert
         with self.assertRaisesRegex(ValueError, "Instance status check is not OK.*"):
-            self.instance_waiter.wait_status_ok(
-                ec2_client, instance, self.logger, 0, self.cancellation_service
-            )
+            self.instance_waiter.wait_status_ok(Mock(), Mock(), self.logger, 0, Mock())
+
+    def test_wait_status_ok_waits_for_impaired_status_with_timeout(self):
+        self.status_pollers.subscribe.return_value = FakeSubscription(
+            [
+                create_status(status=self.instance_waiter.STATUS_IMPAIRED),
+                create_status(),
+            ]
+        )
+
+        instance_state = self.instance_waiter.wait_status_ok(
+            Mock(), Mock(), self.logger, 60, Mock()
+        )
+
+        self.assertEqual(
+            instance_state["InstanceStatus"]["Status"], self.instance_waiter.STATUS_OK
+        )
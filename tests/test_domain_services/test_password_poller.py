@@ -0,0 +1,83 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cloudshell.cp.aws.domain.services.waiters.password_poller import (
+    PasswordDataPoller,
+    PasswordDataPollers,
+)
+
+
+def get_password_data(InstanceId):
+    return {"InstanceId": InstanceId, "PasswordData": ""}
+
+
+@patch(
+    "cloudshell.cp.aws.domain.services.waiters.instance_status_poller.threading."
+    "Thread",
+    Mock(),
+)
+@patch("cloudshell.cp.aws.domain.services.waiters.password_poller.time")
+class TestPasswordDataPoller(TestCase):
+    def setUp(self):
+        self.ec2_client = Mock()
+        self.ec2_client.get_password_data.side_effect = get_password_data
+        self.poller = PasswordDataPoller(self.ec2_client, initial_delay=5, max_delay=10)
+
+    def test_poll_shares_call_between_subscriptions(self, time):
+        time.monotonic.return_value = 0
+        subscription1 = self.poller.subscribe("i-1")
+        subscription2 = self.poller.subscribe("i-1")
+
+        self.poller._poll(["i-1"])
+
+        self.ec2_client.get_password_data.assert_called_once_with(InstanceId="i-1")
+        self.assertEqual(subscription1.get_status(), get_password_data("i-1"))
+        self.assertEqual(subscription2.get_status(), get_password_data("i-1"))
+
+    def test_poll_backs_off_per_instance(self, time):
+        polled_at = []
+        for now in range(30):
+            time.monotonic.return_value = now
+            calls = self.ec2_client.get_password_data.call_count
+            self.poller._poll(["i-1"])
+            if self.ec2_client.get_password_data.call_count > calls:
+                polled_at.append(now)
+
+        self.assertEqual(polled_at, [0, 5, 15, 25])
+
+    def test_new_instance_is_polled_at_once(self, time):
+        time.monotonic.return_value = 0
+        self.poller._poll(["i-1"])
+        time.monotonic.return_value = 1
+
+        self.poller._poll(["i-1", "i-2"])
+
+        self.ec2_client.get_password_data.assert_called_with(InstanceId="i-2")
+        self.assertEqual(self.ec2_client.get_password_data.call_count, 2)
+
+    def test_poll_delivers_error_to_instance(self, time):
+        time.monotonic.return_value = 0
+        self.ec2_client.get_password_data.side_effect = [
+            ValueError("error"),
+            get_password_data("i-2"),
+        ]
+        subscription1 = self.poller.subscribe("i-1")
+        subscription2 = self.poller.subscribe("i-2")
+
+        self.poller._poll(["i-1", "i-2"])
+
+        with self.assertRaises(ValueError):
+            subscription1.get_status()
+        self.assertEqual(subscription2.get_status(), get_password_data("i-2"))
+
+
+class TestPasswordDataPollers(TestCase):
+    def test_creates_password_data_pollers(self):
+        pollers = PasswordDataPollers(interval=0.01, idle_timeout=0)
+        ec2_client = Mock()
+        ec2_client.get_password_data.side_effect = get_password_data
+
+        with pollers.subscribe(ec2_client, "i-1") as subscription:
+            self.assertIsInstance(subscription.poller, PasswordDataPoller)
+            self.assertTrue(subscription.wait_for_update(1))
+            self.assertEqual(subscription.get_status(), get_password_data("i-1"))
@@ -1,34 +1,75 @@
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from cloudshell.cp.aws.domain.services.waiters.password import PasswordWaiter
 
 
+class FakeSubscription:
+    def __init__(self, passwords):
+        self.passwords = list(passwords)
+        self.closed = False
+        self.wait_for_update = Mock()
+        self.notify = Mock()
+
+    def get_status(self):
+        password = (
+            self.passwords.pop(0) if len(self.passwords) > 1 else self.passwords[0]
+        )
+        return password if password is None else {"PasswordData": password}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.closed = True
+
+
 class TestPasswordWaiter(TestCase):
     def setUp(self):
         self.cancellation_service = Mock()
-        self.pass_waiter = PasswordWaiter(self.cancellation_service, 0.5, 0.02)
+        self.password_pollers = Mock()
+        self.pass_waiter = PasswordWaiter(
+            self.cancellation_service, 0.5, 0.02, password_pollers=self.password_pollers
+        )
 
     def test_wait_none(self):
         self.assertRaises(ValueError, self.pass_waiter.wait, None)
 
+    @patch(
+        "cloudshell.cp.aws.domain.services.waiters.backoff.time",
+        Mock(monotonic=Mock(side_effect=[0, 1, 100, 100])),
+    )
     def test_wait_timeout(self):
-        instance = Mock()
-        instance.password_data = Mock(return_value={"PasswordData": ""})
-        cancellation_context = Mock()
+        self.password_pollers.subscribe.return_value = FakeSubscription([""])
+        cancellation_context = Mock(is_cancelled=False)
         self.assertRaises(
-            Exception, self.pass_waiter.wait, instance, cancellation_context
-        )
-        self.cancellation_service.check_if_cancelled.assert_called_with(
-            cancellation_context
+            Exception, self.pass_waiter.wait, Mock(), cancellation_context
         )
+        cancellation_token = self.cancellation_service.check_if_cancelled.call_args[0][
+            0
+        ]
+        self.assertIs(cancellation_token.cancellation_context, cancellation_context)
 
     def test_wait(self):
-        instance = Mock()
-        instance.password_data = Mock()
-        instance.password_data.side_effect = [
-            {"PasswordData": ""},
-            {"PasswordData": "password"},
-        ]
+        subscription = FakeSubscription([None, "", "password"])
+        self.password_pollers.subscribe.return_value = subscription
+        instance = Mock(id="i-1")
+
         res = self.pass_waiter.wait(instance)
+
         self.assertEqual(res, "password")
+        self.password_pollers.subscribe.assert_called_once_with(
+            instance.meta.client, "i-1"
+        )
+        self.assertEqual(subscription.wait_for_update.call_count, 2)
+        self.assertTrue(subscription.closed)
+        instance.meta.client.get_password_data.assert_not_called()
+
+    def test_get_password(self):
+        instance = Mock(id="i-1")
+        instance.meta.client.get_password_data.return_value = {"PasswordData": "pass"}
+
+        res = self.pass_waiter.get_password(instance)
+
+        self.assertEqual(res, "pass")
+        instance.meta.client.get_password_data.assert_called_once_with(InstanceId="i-1")
@@ -1,6 +1,7 @@
 from unittest import TestCase
 from unittest.mock import Mock
 
+from cloudshell.cp.aws.domain.handlers.ec2 import TagsHandler
 from cloudshell.cp.aws.domain.services.ec2.security_group import SecurityGroupService
 from cloudshell.cp.aws.domain.services.parsers.port_group_attribute_parser import (
     PortGroupAttributeParser,
@@ -73,6 +74,24 @@ class TestSecurityGroups(TestCase):
             )
         )
 
+    def test_create_sg_with_tags(self):
+        ec2_session = Mock()
+        tags = TagsHandler({"Name": "name"})
+
+        self.sg_service.create_security_group(ec2_session, "vpc", "name", tags)
+
+        ec2_session.create_security_group.assert_called_once_with(
+            GroupName="name",
+            Description=SecurityGroupService.CLOUDSHELL_SECURITY_GROUP_DESCRIPTION,
+            VpcId="vpc",
+            TagSpecifications=[
+                {
+                    "ResourceType": "security-group",
+                    "Tags": [{"Key": "Name", "Value": "name"}],
+                }
+            ],
+        )
+
     def test_get_default_sg_name(self):
         reservation_id = "res"
         sg_name = self.sg_service.sandbox_default_sg_name(reservation_id=reservation_id)
@@ -0,0 +1,196 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from unittest.mock import Mock
+
+from botocore.exceptions import ClientError, NoCredentialsError
+
+from cloudshell.cp.aws.domain.services.session_providers.botocore_config import (
+    create_botocore_config,
+)
+from cloudshell.cp.aws.domain.services.session_providers.session_cache import (
+    AssumeRoleCredentialsCache,
+    AwsSessionCache,
+    DecryptedPasswordsCache,
+    SessionKey,
+    get_credentials_fingerprint,
+    is_credentials_error,
+)
+
+
+class TestAwsSessionCache(TestCase):
+    def setUp(self):
+        self.now = 0
+        self.config = Mock()
+        self.cache = AwsSessionCache(ttl=1, timer=lambda: self.now, config=self.config)
+        self.key = SessionKey("region", get_credentials_fingerprint("id", "secret"))
+        self.session_factory = Mock(side_effect=lambda: Mock())
+
+    def test_get_returns_cached_session(self):
+        first = self.cache.get(self.key, self.session_factory)
+        second = self.cache.get(self.key, self.session_factory)
+
+        self.assertIs(first, second)
+        self.session_factory.assert_called_once_with()
+
+    def test_get_creates_session_for_other_key(self):
+        first = self.cache.get(self.key, self.session_factory)
+        second = self.cache.get(self.key._replace(role_arn="arn"), self.session_factory)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.session_factory.call_count, 2)
+
+    def test_get_expired_session(self):
+        first = self.cache.get(self.key, self.session_factory)
+        self.now = 60
+        second = self.cache.get(self.key, self.session_factory)
+
+        self.assertIsNot(first, second)
+
+    def test_invalidate(self):
+        first = self.cache.get(self.key, self.session_factory)
+        self.cache.invalidate(self.key)
+        second = self.cache.get(self.key, self.session_factory)
+
+        self.assertIsNot(first, second)
+
+    def test_disabled_cache(self):
+        cache = AwsSessionCache(ttl=0)
+
+        first = cache.get(self.key, self.session_factory)
+        second = cache.get(self.key, self.session_factory)
+
+        self.assertIsNot(first, second)
+
+    def test_cached_session_client(self):
+        cached = self.cache.get(self.key, self.session_factory)
+
+        cached.client("ec2")
+        cached.client("ec2")
+        cached.client("ec2", endpoint_url="url")
+
+        self.assertEqual(cached.session.client.call_count, 2)
+        cached.session.client.assert_any_call("ec2", config=self.config)
+        cached.session.client.assert_any_call(
+            "ec2", config=self.config, endpoint_url="url"
+        )
+
+    def test_fingerprint_hides_credentials(self):
+        fingerprint = get_credentials_fingerprint("id", "secret")
+
+        self.assertNotIn("secret", fingerprint)
+        self.assertNotEqual(fingerprint, get_credentials_fingerprint("id", "other"))
+
+    def test_is_credentials_error(self):
+        auth_error = ClientError({"Error": {"Code": "AuthFailure"}}, "DescribeVpcs")
+        other_error = ClientError({"Error": {"Code": "Throttling"}}, "DescribeVpcs")
+
+        self.assertTrue(is_credentials_error(auth_error))
+        self.assertTrue(is_credentials_error(NoCredentialsError()))
+        self.assertFalse(is_credentials_error(other_error))
+        self.assertFalse(is_credentials_error(ValueError()))
+
+
+class TestBotocoreConfig(TestCase):
+    def test_create_botocore_config(self):
+        config = create_botocore_config(
+            max_pool_connections=100,
+            retry_mode="adaptive",
+            max_attempts=5,
+            connect_timeout=3,
+            read_timeout=30,
+            tcp_keepalive=True,
+        )
+
+        self.assertEqual(config.max_pool_connections, 100)
+        self.assertEqual(config.retries, {"mode": "adaptive", "max_attempts": 5})
+        self.assertEqual(config.connect_timeout, 3)
+        self.assertEqual(config.read_timeout, 30)
+        self.assertTrue(config.tcp_keepalive)
+
+
+class TestAssumeRoleCredentialsCache(TestCase):
+    def setUp(self):
+        self.now = datetime(2021, 1, 1, tzinfo=timezone.utc)
+        self.cache = AssumeRoleCredentialsCache(
+            refresh_margin=15, timer=lambda: self.now
+        )
+        self.key = SessionKey("region", "fingerprint", "role arn")
+        self.assume_role = Mock(
+            side_effect=lambda: {"Expiration": self.now + timedelta(hours=1)}
+        )
+
+    def test_get_returns_cached_credentials(self):
+        first = self.cache.get(self.key, self.assume_role)
+        second = self.cache.get(self.key, self.assume_role)
+
+        self.assertIs(first, second)
+        self.assume_role.assert_called_once_with()
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_get_refreshes_credentials_before_expiration(self):
+        first = self.cache.get(self.key, self.assume_role)
+        self.now += timedelta(minutes=46)
+        second = self.cache.get(self.key, self.assume_role)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_get_assumes_role_once_for_concurrent_calls(self):
+        def assume_role():
+            time.sleep(0.1)
+            return {"Expiration": self.now + timedelta(hours=1)}
+
+        assume_role = Mock(side_effect=assume_role)
+        threads = [
+            threading.Thread(target=self.cache.get, args=(self.key, assume_role))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assume_role.assert_called_once_with()
+        self.assertEqual(self.cache.hits, 4)
+
+    def test_invalidate(self):
+        self.cache.get(self.key, self.assume_role)
+        self.cache.invalidate(self.key)
+        self.cache.get(self.key, self.assume_role)
+
+        self.assertEqual(self.assume_role.call_count, 2)
+
+
+class TestDecryptedPasswordsCache(TestCase):
+    def setUp(self):
+        self.now = 0
+        self.cache = DecryptedPasswordsCache(ttl=1, max_size=2, timer=lambda: self.now)
+        self.decrypt = Mock(return_value="decrypted")
+
+    def test_get_returns_cached_value(self):
+        self.assertEqual(self.cache.get("encrypted", self.decrypt), "decrypted")
+        self.assertEqual(self.cache.get("encrypted", self.decrypt), "decrypted")
+
+        self.decrypt.assert_called_once_with()
+
+    def test_get_expired_value(self):
+        self.cache.get("encrypted", self.decrypt)
+        self.now = 60
+        self.cache.get("encrypted", self.decrypt)
+
+        self.assertEqual(self.decrypt.call_count, 2)
+
+    def test_get_drops_least_recently_used_value(self):
+        self.cache.get("first", self.decrypt)
+        self.cache.get("second", self.decrypt)
+        self.cache.get("first", self.decrypt)
+        self.cache.get("third", self.decrypt)
+        self.decrypt.reset_mock()
+
+        self.cache.get("first", self.decrypt)
+        self.decrypt.assert_not_called()
+        self.cache.get("second", self.decrypt)
+        self.decrypt.assert_called_once_with()
@@ -1,9 +1,19 @@
+from datetime import datetime, timedelta, timezone
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from cloudshell.cp.aws.domain.services.session_providers.aws_session_provider import (
     AWSSessionProvider,
 )
+from cloudshell.cp.aws.domain.services.session_providers.botocore_config import (
+    BOTOCORE_CONFIG,
+)
+from cloudshell.cp.aws.domain.services.session_providers.session_cache import (
+    AssumeRoleCredentialsCache,
+    AwsSessionCache,
+    DecryptedPasswordsCache,
+)
+from cloudshell.cp.aws.models.aws_ec2_cloud_provider_resource_model import VpcMode
 
 DECRYPTED_PREFIX = "decrypted: "
 
@@ -18,7 +28,11 @@ def decrypt_mock(*args):
 
 class TestAWSSessionProvider(TestCase):
     def setUp(self):
-        self.session_provider = AWSSessionProvider()
+        self.session_cache = AwsSessionCache()
+        self.assume_role_cache = AssumeRoleCredentialsCache()
+        self.session_provider = AWSSessionProvider(
+            self.session_cache, self.assume_role_cache, DecryptedPasswordsCache()
+        )
         self.cloudshell_session = Mock()
         self.cloudshell_session.DecryptPassword = Mock(side_effect=decrypt_mock)
 
@@ -26,6 +40,7 @@ class TestAWSSessionProvider(TestCase):
         self.aws_ec2_data_model.aws_access_key_id = "access key"
         self.aws_ec2_data_model.aws_secret_access_key = "secret key"
         self.aws_ec2_data_model.region = "region"
+        self.aws_ec2_data_model.vpc_mode = VpcMode.DYNAMIC
 
     def test_get_clients(self):
         aws_api = self.session_provider.get_clients(
@@ -35,3 +50,127 @@ class TestAWSSessionProvider(TestCase):
         self.assertIsNotNone(aws_api.ec2_session)
         self.assertIsNotNone(aws_api.ec2_client)
         self.assertIsNotNone(aws_api.s3_session)
+
+    def test_get_clients_reuses_cached_clients(self):
+        first = self.session_provider.get_clients(
+            cloudshell_session=self.cloudshell_session,
+            aws_ec2_data_model=self.aws_ec2_data_model,
+        )
+        second = self.session_provider.get_clients(
+            cloudshell_session=self.cloudshell_session,
+            aws_ec2_data_model=self.aws_ec2_data_model,
+        )
+
+        self.assertIs(first.ec2_client, second.ec2_client)
+        self.assertIs(first.iam_client, second.iam_client)
+        self.assertIsNot(first.ec2_session, second.ec2_session)
+        self.assertIs(first.ec2_session.meta.client, second.ec2_session.meta.client)
+
+    def test_get_clients_creates_only_used_clients(self):
+        session = Mock()
+        with patch.object(
+            AWSSessionProvider, "_create_aws_session", return_value=session
+        ):
+            # power_on_ami command uses only EC2 resource
+            aws_api = self.session_provider.get_clients(
+                cloudshell_session=self.cloudshell_session,
+                aws_ec2_data_model=self.aws_ec2_data_model,
+            )
+            aws_api.ec2_session.Instance("instance id")
+            aws_api.ec2_session.Instance("instance id")
+
+        session.resource.assert_called_once_with("ec2", config=BOTOCORE_CONFIG)
+        session.client.assert_not_called()
+
+    def test_get_clients_shares_clients_between_commands(self):
+        session = Mock()
+        with patch.object(
+            AWSSessionProvider, "_create_aws_session", return_value=session
+        ):
+            for _ in range(3):
+                # get_access_key command uses only S3 resource
+                aws_api = self.session_provider.get_clients(
+                    cloudshell_session=self.cloudshell_session,
+                    aws_ec2_data_model=self.aws_ec2_data_model,
+                )
+                aws_api.s3_session.Bucket("bucket")
+
+        session.resource.assert_called_once_with("s3", config=BOTOCORE_CONFIG)
+        session.client.assert_not_called()
+
+    def test_get_clients_doesnt_assume_role_for_s3(self):
+        self.aws_ec2_data_model.vpc_mode = VpcMode.SHARED
+        self.aws_ec2_data_model.shared_vpc_role_arn = "role arn"
+
+        with patch.object(AWSSessionProvider, "_call_assume_role") as assume_role:
+            aws_api = self.session_provider.get_clients(
+                cloudshell_session=self.cloudshell_session,
+                aws_ec2_data_model=self.aws_ec2_data_model,
+            )
+            aws_api.s3_session
+
+        assume_role.assert_not_called()
+
+    def test_get_clients_decrypts_credentials_once(self):
+        for _ in range(2):
+            self.session_provider.get_clients(
+                cloudshell_session=self.cloudshell_session,
+                aws_ec2_data_model=self.aws_ec2_data_model,
+            )
+
+        self.assertEqual(self.cloudshell_session.DecryptPassword.call_count, 2)
+
+    def test_get_clients_for_other_credentials(self):
+        first = self.session_provider.get_clients(
+            cloudshell_session=self.cloudshell_session,
+            aws_ec2_data_model=self.aws_ec2_data_model,
+        )
+        self.aws_ec2_data_model.aws_secret_access_key = "rotated secret key"
+        second = self.session_provider.get_clients(
+            cloudshell_session=self.cloudshell_session,
+            aws_ec2_data_model=self.aws_ec2_data_model,
+        )
+
+        self.assertIsNot(first.ec2_client, second.ec2_client)
+
+    def test_invalidate_sessions(self):
+        first = self.session_provider.get_clients(
+            cloudshell_session=self.cloudshell_session,
+            aws_ec2_data_model=self.aws_ec2_data_model,
+        )
+        self.session_provider.invalidate_sessions(
+            cloudshell_session=self.cloudshell_session,
+            aws_ec2_data_model=self.aws_ec2_data_model,
+        )
+        second = self.session_provider.get_clients(
+            cloudshell_session=self.cloudshell_session,
+            aws_ec2_data_model=self.aws_ec2_data_model,
+        )
+
+        self.assertIsNot(first.ec2_client, second.ec2_client)
+
+    def test_get_clients_reuses_assumed_role_credentials(self):
+        self.aws_ec2_data_model.vpc_mode = VpcMode.SHARED
+        self.aws_ec2_data_model.shared_vpc_role_arn = "role arn"
+        credentials = {
+            "AccessKeyId": "id",
+            "SecretAccessKey": "secret",
+            "SessionToken": "token",
+            "Expiration": datetime.now(timezone.utc) + timedelta(hours=1),
+        }
+
+        with patch.object(
+            AWSSessionProvider, "_call_assume_role", return_value=credentials
+        ) as call_assume_role:
+            for _ in range(2):
+                # new session cache emulates expired sessions
+                AWSSessionProvider(
+                    AwsSessionCache(), self.assume_role_cache
+                ).get_clients(
+                    cloudshell_session=self.cloudshell_session,
+                    aws_ec2_data_model=self.aws_ec2_data_model,
+                ).ec2_client
+
+        call_assume_role.assert_called_once()
+        self.assertEqual(self.assume_role_cache.hits, 1)
+        self.assertEqual(self.assume_role_cache.misses, 1)
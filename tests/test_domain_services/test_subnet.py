@@ -2,6 +2,7 @@ import re
 from unittest import TestCase
 from unittest.mock import Mock
 
+from cloudshell.cp.aws.domain.handlers.ec2 import TagsHandler
 from cloudshell.cp.aws.domain.services.ec2.subnet import SubnetService
 
 
@@ -72,6 +73,19 @@ class TestSubnetService(TestCase):
             CidrBlock="1.2.3.4/24", AvailabilityZone="zoneA"
         )
 
+    def test_create_subnet_nowait_with_tags(self):
+        tags = TagsHandler({"Name": "subnet"})
+
+        self.subnet_srv.create_subnet_nowait(self.vpc, "1.2.3.4/24", "zoneA", tags)
+
+        self.vpc.create_subnet.assert_called_once_with(
+            CidrBlock="1.2.3.4/24",
+            AvailabilityZone="zoneA",
+            TagSpecifications=[
+                {"ResourceType": "subnet", "Tags": [{"Key": "Name", "Value": "subnet"}]}
+            ],
+        )
+
     def test_get_first_or_none_subnet_from_vpc__returns_none(self):
         # Arrange
         self.vpc.subnets.all = Mock(return_value=[])
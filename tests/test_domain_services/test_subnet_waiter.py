@@ -1,6 +1,9 @@
+from multiprocessing import TimeoutError  # noqa: A004
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+from cloudshell.cp.aws.domain.common.cancellation_service import CancellationToken
+from cloudshell.cp.aws.domain.common.exceptions import CancellationException
 from cloudshell.cp.aws.domain.services.waiters.subnet import SubnetWaiter
 
 
@@ -22,3 +25,109 @@ class TestSubnetWaiter(TestCase):
         vpc.reload = reload
         res = self.vpc_waiter.wait(vpc, SubnetWaiter.AVAILABLE)
         self.assertEqual(res.state, SubnetWaiter.AVAILABLE)
+
+
+def create_subnet(subnet_id, ec2_client):
+    subnet = Mock(subnet_id=subnet_id)
+    subnet.meta.client = ec2_client
+    return subnet
+
+
+def create_token(is_cancelled=False):
+    """Token whose wait between polls returns immediately."""
+    return Mock(spec=CancellationToken, is_cancelled=is_cancelled)
+
+
+def create_ec2_client(*rounds):
+    """Client that returns subnet states by subnet id for each DescribeSubnets."""
+    ec2_client = Mock()
+    ec2_client.describe_subnets.side_effect = [
+        {
+            "Subnets": [
+                {"SubnetId": subnet_id, "State": state}
+                for subnet_id, state in states.items()
+            ]
+        }
+        for states in rounds
+    ]
+    return ec2_client
+
+
+class TestSubnetWaiterMultiWait(TestCase):
+    def setUp(self):
+        self.waiter = SubnetWaiter(1, 0.02)
+
+    def test_multi_wait_validation(self):
+        self.assertRaises(ValueError, self.waiter.multi_wait, [], "available")
+        self.assertRaises(ValueError, self.waiter.multi_wait, [Mock()], "bla")
+
+    def test_multi_wait_one_call_per_poll(self):
+        ec2_client = create_ec2_client(
+            {"subnet-1": "pending"},
+            {"subnet-1": "available", "subnet-2": "pending"},
+            {"subnet-2": "available"},
+        )
+        subnet1 = create_subnet("subnet-1", ec2_client)
+        subnet2 = create_subnet("subnet-2", ec2_client)
+        token = create_token()
+
+        errors = self.waiter.multi_wait(
+            [subnet1, subnet2], SubnetWaiter.AVAILABLE, token
+        )
+
+        self.assertEqual(errors, {})
+        self.assertEqual(ec2_client.describe_subnets.call_count, 3)
+        ec2_client.describe_subnets.assert_any_call(
+            Filters=[{"Name": "subnet-id", "Values": ["subnet-1", "subnet-2"]}]
+        )
+        ec2_client.describe_subnets.assert_called_with(
+            Filters=[{"Name": "subnet-id", "Values": ["subnet-2"]}]
+        )
+        self.assertEqual(subnet1.meta.data["State"], SubnetWaiter.AVAILABLE)
+        self.assertEqual(subnet2.meta.data["State"], SubnetWaiter.AVAILABLE)
+
+    def test_multi_wait_returns_errors_of_failed_subnets(self):
+        ec2_client = create_ec2_client({"subnet-1": "available"})
+        failing_client = Mock()
+        failing_client.describe_subnets.side_effect = ValueError("error")
+        subnet1 = create_subnet("subnet-1", ec2_client)
+        subnet2 = create_subnet("subnet-2", failing_client)
+        token = create_token()
+
+        # without retries
+        describe_chunk = SubnetWaiter._describe_subnets_chunk.__wrapped__
+        with patch.object(
+            SubnetWaiter, "_describe_subnets_chunk", staticmethod(describe_chunk)
+        ):
+            errors = self.waiter.multi_wait(
+                [subnet1, subnet2], SubnetWaiter.AVAILABLE, token
+            )
+
+        self.assertEqual(list(errors), ["subnet-2"])
+        self.assertIsInstance(errors["subnet-2"], ValueError)
+
+    def test_multi_wait_timeout(self):
+        ec2_client = Mock()
+        ec2_client.describe_subnets.return_value = {
+            "Subnets": [{"SubnetId": "subnet-1", "State": "pending"}]
+        }
+        subnet = create_subnet("subnet-1", ec2_client)
+        token = create_token()
+        # the deadline passes after the first poll
+        with patch(
+            "cloudshell.cp.aws.domain.services.waiters.backoff.time.monotonic",
+            side_effect=[0, 100, 100],
+        ):
+            errors = self.waiter.multi_wait([subnet], SubnetWaiter.AVAILABLE, token)
+
+        self.assertIsInstance(errors["subnet-1"], TimeoutError)
+        self.assertEqual(ec2_client.describe_subnets.call_count, 1)
+
+    def test_multi_wait_cancelled(self):
+        ec2_client = create_ec2_client({"subnet-1": "pending"})
+        subnet = create_subnet("subnet-1", ec2_client)
+
+        with self.assertRaises(CancellationException):
+            self.waiter.multi_wait(
+                [subnet], SubnetWaiter.AVAILABLE, create_token(is_cancelled=True)
+            )
@@ -66,13 +66,23 @@ class TestVPCService(TestCase):
         vpc = self.vpc_service.create_vpc_for_reservation(
             self.ec2_session, self.reservation, self.cidr
         )
-        self.vpc_service.VPC_RESERVATION.format(self.reservation.reservation_id)
+        vpc_name = self.vpc_service.VPC_RESERVATION.format(
+            self.reservation.reservation_id
+        )
 
         self.vpc_waiter.wait.assert_called_once_with(
             vpc=vpc, state=self.vpc_waiter.AVAILABLE
         )
         self.assertEqual(self.vpc, vpc)
-        self.ec2_session.create_vpc.assert_called_once_with(CidrBlock=self.cidr)
+        self.ec2_session.create_vpc.assert_called_once()
+        kwargs = self.ec2_session.create_vpc.call_args[1]
+        self.assertEqual(kwargs["CidrBlock"], self.cidr)
+        [tag_specification] = kwargs["TagSpecifications"]
+        self.assertEqual(tag_specification["ResourceType"], "vpc")
+        self.assertIn(
+            {"Key": "Name", "Value": vpc_name},
+            tag_specification["Tags"],
+        )
 
     def test_find_vpc_for_reservation(self):
         self.ec2_session.vpcs = Mock()
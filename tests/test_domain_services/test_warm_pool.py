@@ -0,0 +1,308 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from unittest.mock import Mock
+
+from botocore.exceptions import ClientError
+
+from cloudshell.cp.aws.domain.common.exceptions import CancellationException
+from cloudshell.cp.aws.domain.handlers.ec2 import TagsHandler
+from cloudshell.cp.aws.domain.services.ec2.warm_pool import WarmPoolService
+from cloudshell.cp.aws.models.ami_deployment_model import AMIDeploymentModel
+
+
+def start_instances(previous_state):
+    return {"StartingInstances": [{"PreviousState": {"Name": previous_state}}]}
+
+
+class TestWarmPoolService(TestCase):
+    def setUp(self):
+        self.instance_service = Mock()
+        self.ec2_session = Mock()
+        self.ec2_session.meta.client.meta.region_name = "us-east-1"
+        self.logger = Mock()
+        self.warm_pool = WarmPoolService(self.instance_service, size=2, max_age=24)
+        self.deployment_info = AMIDeploymentModel()
+        self.deployment_info.aws_ami_id = "ami-1"
+        self.deployment_info.instance_type = "t3.micro"
+        self.deployment_info.aws_key = "key"
+        self.deployment_info.network_interfaces = [
+            {
+                "SubnetId": "subnet-1",
+                "DeviceIndex": 0,
+                "Groups": ["sg-1", "sg-app"],
+                "AssociatePublicIpAddress": True,
+            }
+        ]
+        self.deployment_info.iam_role = {"Name": "profile"}
+        self.deployment_info.tags = TagsHandler({"ReservationId": "rid"})
+        self.pool_key = WarmPoolService.get_pool_key(
+            self.ec2_session, "vpc-1", self.deployment_info
+        )
+
+    def _create_instance(self, instance_id, previous_state="stopped"):
+        instance = Mock(id=instance_id, launch_time=datetime.now(timezone.utc))
+        instance.network_interfaces_attribute = [
+            {
+                "NetworkInterfaceId": f"eni-{instance_id}",
+                "Attachment": {"DeviceIndex": 0},
+            }
+        ]
+        instance.block_device_mappings = [{"Ebs": {"VolumeId": f"vol-{instance_id}"}}]
+        instance.tags = [
+            {"Key": "ReservationId", "Value": "other"},
+            {"Key": "Owner", "Value": "other"},
+            {"Key": "WarmPool", "Value": self.pool_key},
+        ]
+        instance.meta.client.start_instances.return_value = start_instances(
+            previous_state
+        )
+        return instance
+
+    def test_disabled_by_default_size(self):
+        self.assertFalse(WarmPoolService(self.instance_service, size=0).enabled)
+        self.assertTrue(self.warm_pool.enabled)
+
+    def test_is_poolable(self):
+        self.assertTrue(self.warm_pool.is_poolable(self.deployment_info))
+        self.deployment_info.network_interfaces[0]["PrivateIpAddress"] = "10.0.0.5"
+        self.assertFalse(self.warm_pool.is_poolable(self.deployment_info))
+
+    def test_is_poolable_with_user_data(self):
+        self.deployment_info.user_data = "#!/bin/bash"
+
+        self.assertFalse(self.warm_pool.is_poolable(self.deployment_info))
+
+    def test_pool_key_ignores_settings_set_on_claim(self):
+        self.deployment_info.network_interfaces[0]["Groups"] = ["sg-2"]
+        self.deployment_info.iam_role = {"Name": "other profile"}
+        self.deployment_info.tags = TagsHandler({"ReservationId": "other"})
+
+        self.assertEqual(
+            self.pool_key,
+            WarmPoolService.get_pool_key(
+                self.ec2_session, "vpc-1", self.deployment_info
+            ),
+        )
+        self.assertNotEqual(
+            self.pool_key,
+            WarmPoolService.get_pool_key(
+                self.ec2_session, "vpc-2", self.deployment_info
+            ),
+        )
+        self.deployment_info.aws_key = "other key"
+        self.assertNotEqual(
+            self.pool_key,
+            WarmPoolService.get_pool_key(
+                self.ec2_session, "vpc-1", self.deployment_info
+            ),
+        )
+        self.deployment_info.instance_type = "t3.large"
+        self.assertNotEqual(
+            self.pool_key,
+            WarmPoolService.get_pool_key(
+                self.ec2_session, "vpc-1", self.deployment_info
+            ),
+        )
+
+    def test_claim_starts_instance(self):
+        instance = self._create_instance("i-1")
+        self.ec2_session.instances.filter.return_value = [instance]
+
+        claimed = self.warm_pool.claim(self.ec2_session, self.pool_key, self.logger)
+
+        self.assertIs(claimed, instance)
+        instance.meta.client.start_instances.assert_called_once_with(
+            InstanceIds=["i-1"]
+        )
+        instance.delete_tags.assert_called_once_with(Tags=[{"Key": "WarmPool"}])
+        # the instance isn't claimed twice
+        self.assertIsNone(
+            self.warm_pool.claim(self.ec2_session, self.pool_key, self.logger)
+        )
+
+    def test_claim_skips_instance_started_by_another_process(self):
+        taken = self._create_instance("i-1", previous_state="pending")
+        free = self._create_instance("i-2")
+        self.ec2_session.instances.filter.return_value = [taken, free]
+
+        claimed = self.warm_pool.claim(self.ec2_session, self.pool_key, self.logger)
+
+        self.assertIs(claimed, free)
+        taken.delete_tags.assert_not_called()
+
+    def test_claim_skips_terminated_instance(self):
+        instance = self._create_instance("i-1")
+        instance.meta.client.start_instances.side_effect = ClientError(
+            {"Error": {"Code": "IncorrectInstanceState"}}, "StartInstances"
+        )
+        self.ec2_session.instances.filter.return_value = [instance]
+
+        self.assertIsNone(
+            self.warm_pool.claim(self.ec2_session, self.pool_key, self.logger)
+        )
+
+    def test_apply_claimed(self):
+        instance = self._create_instance("i-1")
+
+        self.warm_pool.apply_claimed(instance, self.deployment_info)
+
+        client = instance.meta.client
+        client.modify_network_interface_attribute.assert_called_once_with(
+            NetworkInterfaceId="eni-i-1", Groups=["sg-1", "sg-app"]
+        )
+        instance.delete_tags.assert_called_once_with(Tags=[{"Key": "Owner"}])
+        client.create_tags.assert_called_once_with(
+            Resources=["i-1", "vol-i-1", "eni-i-1"],
+            Tags=[{"Key": "ReservationId", "Value": "rid"}],
+        )
+        self.instance_service.associate_iam_instance_profile.assert_called_once_with(
+            instance, {"Name": "profile"}
+        )
+
+    def test_replenish_launches_missing_instances(self):
+        self.ec2_session.instances.filter.return_value = [self._create_instance("i-1")]
+        new_instance = self._create_instance("i-2")
+        self.instance_service.create_instances.return_value = [new_instance]
+        self.deployment_info.network_interfaces[0]["PrivateIpAddress"] = "10.0.0.5"
+
+        self.warm_pool.replenish(
+            self.ec2_session,
+            self.pool_key,
+            self.deployment_info,
+            ["sg-app"],
+            self.logger,
+        )
+
+        pool_info = self.instance_service.create_instances.call_args[0][1]
+        self.assertEqual(
+            self.instance_service.create_instances.call_args[1], {"count": 1}
+        )
+        self.assertEqual(
+            pool_info.network_interfaces,
+            [
+                {
+                    "SubnetId": "subnet-1",
+                    "DeviceIndex": 0,
+                    "Groups": ["sg-1"],
+                    "AssociatePublicIpAddress": True,
+                }
+            ],
+        )
+        # EC2 sets the key pair only at launch
+        self.assertEqual(pool_info.aws_key, "key")
+        self.assertEqual(pool_info.iam_role, {})
+        self.assertEqual(pool_info.tags.get("WarmPool"), self.pool_key)
+        # the deployment info of the app isn't changed
+        self.assertEqual(
+            self.deployment_info.network_interfaces[0]["Groups"], ["sg-1", "sg-app"]
+        )
+        self.assertIsNone(self.deployment_info.tags.get("WarmPool"))
+        self.instance_service.wait_for_status_check.assert_called_once()
+        new_instance.stop.assert_called_once_with()
+
+    def test_replenish_full_pool(self):
+        self.ec2_session.instances.filter.return_value = [
+            self._create_instance("i-1"),
+            self._create_instance("i-2"),
+        ]
+
+        self.warm_pool.replenish(
+            self.ec2_session, self.pool_key, self.deployment_info, [], self.logger
+        )
+
+        self.instance_service.create_instances.assert_not_called()
+
+    def test_replenish_terminates_instances_not_ready(self):
+        self.ec2_session.instances.filter.return_value = []
+        new_instance = self._create_instance("i-1")
+        self.instance_service.create_instances.return_value = [new_instance]
+        self.instance_service.wait_for_status_check.side_effect = ValueError("impaired")
+
+        with self.assertRaisesRegex(ValueError, "impaired"):
+            self.warm_pool.replenish(
+                self.ec2_session, self.pool_key, self.deployment_info, [], self.logger
+            )
+
+        new_instance.terminate.assert_called_once_with()
+        new_instance.stop.assert_not_called()
+
+    def test_reap(self):
+        now = datetime.now(timezone.utc)
+        expired = self._create_instance("i-1")
+        expired.launch_time = now - timedelta(hours=25)
+        fresh = self._create_instance("i-2")
+        fresh.launch_time = now - timedelta(hours=1)
+        self.ec2_session.instances.filter.return_value = [expired, fresh]
+
+        self.warm_pool.reap(self.ec2_session, self.logger)
+
+        expired.terminate.assert_called_once_with()
+        fresh.terminate.assert_not_called()
+
+    def test_replenish_in_background_logs_errors(self):
+        self.ec2_session.instances.filter.side_effect = ValueError("failed")
+
+        thread = self.warm_pool.replenish_in_background(
+            self.ec2_session,
+            self.pool_key,
+            self.deployment_info,
+            [],
+            "rid",
+            self.logger,
+        )
+        thread.join()
+
+        self.logger.exception.assert_called_once()
+        self.assertEqual(self.warm_pool._replenishers, {})
+
+    def test_stop_replenishers(self):
+        self.ec2_session.instances.filter.return_value = []
+        new_instance = self._create_instance("i-1")
+        self.instance_service.create_instances.return_value = [new_instance]
+        waiting = threading.Event()
+
+        def wait_for_instances(instances, cancellation_context):
+            waiting.set()
+            cancellation_context.wait(10)
+            raise CancellationException("cancelled", {})
+
+        self.instance_service.wait_for_instances_to_run_in_aws.side_effect = (
+            wait_for_instances
+        )
+        thread = self.warm_pool.replenish_in_background(
+            self.ec2_session,
+            self.pool_key,
+            self.deployment_info,
+            [],
+            "rid",
+            self.logger,
+        )
+        self.assertTrue(waiting.wait(10))
+
+        self.warm_pool.stop_replenishers("rid", self.logger)
+
+        self.assertFalse(thread.is_alive())
+        new_instance.terminate.assert_called_once_with()
+        self.logger.exception.assert_not_called()
+        self.assertEqual(self.warm_pool._replenishers, {})
+
+    def test_stop_replenishers_waits_for_all_within_timeout(self):
+        release = threading.Event()
+        threads = [
+            threading.Thread(target=release.wait, args=(10,), name=f"replenisher-{i}")
+            for i in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        self.warm_pool._replenishers["rid"] = [(thread, Mock()) for thread in threads]
+
+        start = time.monotonic()
+        self.warm_pool.stop_replenishers("rid", self.logger, timeout=0.2)
+        elapsed = time.monotonic() - start
+        release.set()
+
+        self.assertLess(elapsed, 1)
+        self.logger.warning.assert_called_once()
+        self.assertIn("3 warm pool replenisher(s)", self.logger.warning.call_args[0][0])